@@ -0,0 +1,78 @@
+"""
+Замер памяти и времени построения дерева JavaScript.
+
+Запуск из корня проекта: `python -m benchmarks.js_ast_memory [--functions N]`
+"""
+import argparse
+import ast
+import time
+import tracemalloc
+
+from typhon import js_ast
+from typhon.transpiler import convert_ast
+
+
+def generate_source(function_count: int) -> str:
+    lines = []
+    for index in range(function_count):
+        lines.extend([
+            f'def function_{index}(a, b=1):',
+            f'    value = a + b + {index}',
+            f'    if value == {index}:',
+            f"        return call(value, 'x', key=b)",
+            f'    return [value, a, b]',
+            '',
+        ])
+    return '\n'.join(lines)
+
+
+def count_nodes(node) -> int:
+    count = 1
+    for field in node._fields:
+        value = getattr(node, field, None)
+        items = value if isinstance(value, list) else [value]
+        count += sum(count_nodes(item) for item in items if hasattr(item, '_fields'))
+    return count
+
+
+def measure(function_count: int) -> dict:
+    py_tree = ast.parse(generate_source(function_count))
+
+    # Время замеряется без tracemalloc, который замедляет создание объектов
+    start_time = time.perf_counter()
+    convert_ast(py_tree)
+    elapsed_time = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    js_tree = convert_ast(py_tree)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    node_count = count_nodes(js_tree)
+    return {
+        'nodes': node_count,
+        'memory_mb': round(memory / 2 ** 20, 1),
+        'bytes_per_node': round(memory / node_count, 1),
+        'convert_seconds': round(elapsed_time, 3),
+    }
+
+
+def measure_constructors(count: int) -> dict:
+    """Создание `count` выражений `name + 1` из трёх узлов"""
+    start_time = time.perf_counter()
+    for index in range(count):
+        js_ast.JSBinOp(js_ast.JSName('name'), js_ast.JSAdd(), js_ast.JSConstant(index))
+    elapsed_time = time.perf_counter() - start_time
+    return {'nodes': count * 3, 'construct_seconds': round(elapsed_time, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Память и время построения дерева JavaScript')
+    parser.add_argument('--functions', type=int, default=20000, help='количество функций в модуле')
+    args = parser.parse_args()
+    print(measure(args.functions))
+    print(measure_constructors(args.functions * 50))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Бенчмарк транспиляции синтетических проектов по фазам `Project.transpile_file`:
+граф импортов, сбор объектов, разрешение ссылок, преобразование и генерация.
+
+Запуск из корня проекта:
+
+    python -m benchmarks.pipeline --output results.json
+    python -m benchmarks.pipeline --scenario wide --modules 100 --compare results.json
+
+Для каждой фазы сохраняется лучшее время из `--repeat` запусков. Результаты пишутся в JSON вместе с хэшем
+коммита, чтобы их можно было сравнивать между коммитами (`--compare`).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, replace
+from tempfile import TemporaryDirectory
+
+from benchmarks.synthetic_project import ProjectConfig, generate_project
+from typhon.module import Module, get_module_from_file
+from typhon.module_store import ModuleStore
+from typhon.project import Project
+
+PHASES = ('import_graph', 'object_collection', 'reference_resolution', 'transform', 'generation')
+
+SCENARIOS = {
+    'small': ProjectConfig(modules=10, fan_out=2, depth=1, classes=1, methods=2),
+    'medium': ProjectConfig(modules=50, fan_out=3, depth=2, classes=2, methods=4),
+    'wide': ProjectConfig(modules=50, fan_out=10, depth=1, classes=1, methods=2),
+    'deep': ProjectConfig(modules=20, fan_out=2, depth=12, classes=2, methods=8),
+    'classes': ProjectConfig(modules=20, fan_out=2, depth=2, classes=10, methods=10),
+}
+
+
+@contextmanager
+def timer(timings: dict[str, float], phase: str):
+    start_time = time.perf_counter()
+    yield
+    timings[phase] = time.perf_counter() - start_time
+
+
+def run_phases(main_file_name: str) -> dict[str, float]:
+    """Транспиляция главного модуля теми же шагами, что и `Project.transpile_file`, с замером каждой фазы"""
+    timings = {}
+    project = Project(os.path.dirname(main_file_name))
+    main_module = get_module_from_file(main_file_name)
+    project.module_store = ModuleStore(project.source_manager)
+    project.main_source = project.module_store.add_module(main_module).source
+    project.reset_build()
+    project.main_module = main_module
+
+    with timer(timings, 'import_graph'):
+        project.get_sorted_modules_from_source(project.main_source, main_module.module_name)
+
+    modules = [
+        main_module if module_path == main_module.module_path else Module(module_path, project.source_manager)
+        for module_path in project.modules
+    ]
+    with timer(timings, 'object_collection'):
+        module_objects = [project.collect_objects_from_module(module) for module in modules]
+
+    with timer(timings, 'reference_resolution'):
+        for module_object in module_objects:
+            project.replace_references_to_objects(module_object)
+        project.replace_references_to_objects(project.root_object, with_locals=True)
+
+    with timer(timings, 'transform'):
+        transpilers = []
+        for module in modules:
+            transpiler = project.get_module_transpiler(module)
+            transpiler.convert()
+            transpiler.transform()
+            transpilers.append(transpiler)
+
+    with timer(timings, 'generation'):
+        for module, transpiler in zip(modules, transpilers):
+            module.save_js(transpiler.write)
+
+    return timings
+
+
+def run_transpile_file(main_file_name: str) -> float:
+    project = Project(os.path.dirname(main_file_name))
+    start_time = time.perf_counter()
+    project.transpile_file(main_file_name)
+    return time.perf_counter() - start_time
+
+
+def run_benchmark(name: str, config: ProjectConfig, repeat: int = 3) -> dict:
+    """Лучшее время каждой фазы и полной транспиляции из `repeat` запусков"""
+    with TemporaryDirectory() as directory:
+        main_file_name = generate_project(directory, config)
+        source_lines = 0
+        for file_name in os.listdir(directory):
+            with open(os.path.join(directory, file_name)) as f:
+                source_lines += sum(1 for _ in f)
+
+        phases = {phase: float('inf') for phase in PHASES}
+        total = float('inf')
+        for _ in range(repeat):
+            for phase, elapsed_time in run_phases(main_file_name).items():
+                phases[phase] = min(phases[phase], elapsed_time)
+            total = min(total, run_transpile_file(main_file_name))
+
+    return {
+        'scenario': name,
+        'config': asdict(config),
+        'source_lines': source_lines,
+        'phases': {phase: round(elapsed_time, 6) for phase, elapsed_time in phases.items()},
+        'transpile_file': round(total, 6),
+    }
+
+
+def get_commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare_results(results: dict, baseline: dict) -> list[str]:
+    """Строки сравнения с предыдущими результатами: отношение нового времени к старому по фазам"""
+    baseline_scenarios = {item['scenario']: item for item in baseline['benchmarks']}
+    lines = [f"{baseline.get('commit')} -> {results.get('commit')}"]
+    for item in results['benchmarks']:
+        baseline_item = baseline_scenarios.get(item['scenario'])
+        if baseline_item is None:
+            continue
+        times = dict(item['phases'], transpile_file=item['transpile_file'])
+        baseline_times = dict(baseline_item['phases'], transpile_file=baseline_item['transpile_file'])
+        ratios = [
+            f'{phase} x{elapsed_time / baseline_times[phase]:.2f}'
+            for phase, elapsed_time in times.items() if baseline_times.get(phase)
+        ]
+        lines.append(f"{item['scenario']}: {', '.join(ratios)}")
+    return lines
+
+
+def parse_args(args: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бенчмарк транспиляции синтетических проектов')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append',
+                        help='сценарий (можно указать несколько раз), по умолчанию все')
+    parser.add_argument('--modules', type=int, help='количество модулей')
+    parser.add_argument('--fan-out', type=int, help='количество импортов в модуле')
+    parser.add_argument('--depth', type=int, help='глубина вложенности блоков в методах')
+    parser.add_argument('--classes', type=int, help='количество классов в модуле')
+    parser.add_argument('--methods', type=int, help='количество методов в классе')
+    parser.add_argument('--repeat', type=int, default=3, help='количество запусков каждого сценария')
+    parser.add_argument('--output', help='файл для результатов в формате JSON')
+    parser.add_argument('--compare', help='файл с предыдущими результатами для сравнения')
+    return parser.parse_args(args)
+
+
+def main(args: list[str] = None):
+    args = parse_args(args)
+    overrides = {
+        name: value for name in ('modules', 'fan_out', 'depth', 'classes', 'methods')
+        if (value := getattr(args, name)) is not None
+    }
+
+    benchmarks = []
+    for name in args.scenario or SCENARIOS:
+        result = run_benchmark(name, replace(SCENARIOS[name], **overrides), args.repeat)
+        print(f"{name}: {result['transpile_file']:.3f}s", json.dumps(result['phases']))
+        benchmarks.append(result)
+
+    results = {'commit': get_commit(), 'python': platform.python_version(), 'benchmarks': benchmarks}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n'.join(compare_results(results, json.load(f))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Генерация синтетических проектов Python для бенчмарков"""
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class ProjectConfig:
+    """
+    Параметры синтетического проекта:
+        - `modules` — количество модулей, не считая главного
+        - `fan_out` — сколько модулей с меньшими номерами импортирует каждый модуль
+        - `depth` — глубина вложенности блоков `if` в методах
+        - `classes` — количество классов в модуле
+        - `methods` — количество методов в классе
+    """
+    modules: int = 20
+    fan_out: int = 3
+    depth: int = 2
+    classes: int = 2
+    methods: int = 4
+
+
+def get_module_name(index: int) -> str:
+    return f'module_{index}'
+
+
+def generate_method(method_index: int, depth: int) -> list[str]:
+    lines = [
+        f'    def method_{method_index}(self, value, step=1):',
+        f'        result = value + {method_index}',
+    ]
+    indent = '        '
+    for level in range(depth):
+        lines.append(f'{indent}if value == {level}:')
+        indent += '    '
+        lines.append(f"{indent}result = result + step")
+    lines.append('        return result')
+    return lines
+
+
+def generate_module(index: int, config: ProjectConfig) -> str:
+    imported_indexes = [index - offset for offset in range(1, config.fan_out + 1) if index - offset >= 0]
+    lines = [f'import {get_module_name(imported_index)}' for imported_index in imported_indexes]
+    if imported_indexes and config.classes:
+        lines.append(f'from {get_module_name(imported_indexes[0])} import Class_{imported_indexes[0]}_0')
+    lines.extend([
+        '',
+        f"NAME = 'module {index}'",
+        f'LIMIT = {index} + 10',
+        '',
+    ])
+
+    for class_index in range(config.classes):
+        lines.append(f'class Class_{index}_{class_index}:')
+        for method_index in range(config.methods):
+            lines.extend(generate_method(method_index, config.depth))
+        if not config.methods:
+            lines.append('    pass')
+        lines.append('')
+
+    lines.append(f'def function_{index}(value):')
+    lines.append('    total = value + LIMIT')
+    for imported_index in imported_indexes:
+        lines.append(f'    total = total + {get_module_name(imported_index)}.function_{imported_index}(value)')
+    lines.append('    return total')
+    lines.append('')
+
+    if imported_indexes and config.classes:
+        lines.append(f'instance = Class_{imported_indexes[0]}_0()')
+    lines.append(f'print(NAME, function_{index}(1))')
+    return '\n'.join(lines) + '\n'
+
+
+def generate_main_module(config: ProjectConfig) -> str:
+    lines = [f'import {get_module_name(index)}' for index in range(config.modules)]
+    lines.append('')
+    lines.extend(f'print({get_module_name(index)}.function_{index}(0))' for index in range(config.modules))
+    return '\n'.join(lines) + '\n'
+
+
+def generate_project(directory: str, config: ProjectConfig) -> str:
+    """Создание файлов проекта в директории. Возвращает путь к главному модулю"""
+    for index in range(config.modules):
+        with open(os.path.join(directory, f'{get_module_name(index)}.py'), 'w') as f:
+            f.write(generate_module(index, config))
+
+    main_file_name = os.path.join(directory, 'main.py')
+    with open(main_file_name, 'w') as f:
+        f.write(generate_main_module(config))
+    return main_file_name
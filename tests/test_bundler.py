@@ -0,0 +1,72 @@
+import os
+
+from tests.helpers import source_file
+from typhon.bundler import get_module_variable
+from typhon.project import Project
+from typhon.types import ModulePath
+
+
+def test_get_module_variable():
+    assert get_module_variable(ModulePath('pkg', '__init__')) == '__ty$pkg$__init__'
+
+
+class TestBundle:
+    def test_transpile_bundle(self, temp_dir):
+        main_source = 'import lib\nfrom util import helper as h\n\nprint(lib.g(1), h(2))'
+        lib_source = 'import util\n\ndef g(x):\n    return util.helper(x)'
+        util_source = 'def helper(v):\n    return v + 1'
+        js_str = (
+            'const __ty$util = (function () {\n'
+            '    function helper(v) {\n'
+            '        return v + 1;\n'
+            '    }\n'
+            "    return {'helper': helper};\n"
+            '})();\n'
+            'const __ty$lib = (function () {\n'
+            '    let util = __ty$util;\n'
+            '    function g(x) {\n'
+            '        return util.helper(x);\n'
+            '    }\n'
+            "    return {'util': util, 'g': g};\n"
+            '})();\n'
+            'export {lib, h};\n'
+            'let lib = __ty$lib;\n'
+            'let h = __ty$util.helper;\n'
+            'print(lib.g(1), h(2));'
+        )
+
+        with source_file('main.py', main_source, temp_dir), source_file('lib.py', lib_source, temp_dir), \
+                source_file('util.py', util_source, temp_dir):
+            project = Project(temp_dir)
+            bundle_file_name = project.transpile_bundle(os.path.join(temp_dir, 'main.py'))
+
+        assert bundle_file_name == os.path.join(temp_dir, 'main.bundle.js')
+        with open(bundle_file_name) as f:
+            assert f.read() == js_str
+        assert os.path.exists(os.path.join(temp_dir, 'lib.js'))
+
+    def test_transpile_bundle__minify(self, temp_dir):
+        with source_file('main.py', 'import lib\nprint(lib.a)', temp_dir), source_file('lib.py', 'a = 1', temp_dir):
+            project = Project(temp_dir, minify=True)
+            bundle_file_name = project.transpile_bundle(os.path.join(temp_dir, 'main.py'))
+
+        with open(bundle_file_name) as f:
+            assert f.read() == "const __ty$lib=(function(){let a=1;return {'a':a};})();export{lib};let lib=__ty$lib;print(lib.a);"
+
+    def test_transpile_bundle__incremental(self, temp_dir):
+        main_path = os.path.join(temp_dir, 'main.py')
+        with source_file('main.py', 'import lib\nprint(lib.a)', temp_dir), source_file('lib.py', 'a = 1', temp_dir):
+            bundle_file_name = Project(temp_dir, incremental=True).transpile_bundle(main_path)
+            with open(bundle_file_name) as f:
+                js_code = f.read()
+
+            project = Project(temp_dir, incremental=True)
+            project.transpile_file(main_path)
+            # Дерево модуля из кэша распаковывается только при сборке в один файл
+            assert project.reused_modules == [ModulePath('lib')]
+            assert ModulePath('lib') not in project.js_trees
+            project.transpile_bundle(main_path)
+
+        assert project.reused_modules == [ModulePath('lib')]
+        with open(bundle_file_name) as f:
+            assert f.read() == js_code
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from typhon.file_writer import FileWriter
+from typhon.profiler import Profiler
+
+
+class TestFileWriter:
+    def test_write(self, temp_dir):
+        file_name = os.path.join(temp_dir, 'a.js')
+        profiler = Profiler()
+        writer = FileWriter(profiler)
+
+        assert writer.write(file_name, 'print(1);')
+        os.utime(file_name, ns=(0, 0))
+        assert not writer.write(file_name, 'print(1);')
+        assert os.stat(file_name).st_mtime_ns == 0
+        assert writer.write(file_name, 'print(2);')
+
+        with open(file_name) as f:
+            assert f.read() == 'print(2);'
+        assert os.listdir(temp_dir) == ['a.js']
+        assert profiler.counters == {'write_count': 2, 'skipped_write_count': 1}
+
+    def test_write__bytes(self, temp_dir):
+        file_name = os.path.join(temp_dir, 'a.info')
+        writer = FileWriter()
+
+        assert writer.write(file_name, b'\x00\x01')
+        assert not writer.write(file_name, b'\x00\x01')
+
+        with open(file_name, 'rb') as f:
+            assert f.read() == b'\x00\x01'
+
+    def test_write__error(self, temp_dir):
+        writer = FileWriter()
+
+        with pytest.raises(TypeError):
+            writer.write(os.path.join(temp_dir, 'a.js'), object())
+
+        assert os.listdir(temp_dir) == []
+
+    def test_open(self, temp_dir):
+        file_name = os.path.join(temp_dir, 'a.js')
+        profiler = Profiler()
+        writer = FileWriter(profiler)
+
+        with writer.open(file_name) as f:
+            f.write('print(1);')
+        os.utime(file_name, ns=(0, 0))
+        with writer.open(file_name) as f:
+            f.write('print(1);')
+        assert os.stat(file_name).st_mtime_ns == 0
+        with writer.open(file_name) as f:
+            f.write('print(2);')
+
+        with open(file_name) as f:
+            assert f.read() == 'print(2);'
+        assert os.listdir(temp_dir) == ['a.js']
+        assert profiler.counters == {'write_count': 2, 'skipped_write_count': 1}
+
+    def test_open__error(self, temp_dir):
+        file_name = os.path.join(temp_dir, 'a.js')
+        writer = FileWriter()
+        writer.write(file_name, 'print(1);')
+
+        with pytest.raises(ValueError):
+            with writer.open(file_name) as f:
+                f.write('print(2);')
+                raise ValueError
+
+        with open(file_name) as f:
+            assert f.read() == 'print(1);'
+        assert os.listdir(temp_dir) == ['a.js']
+
+    def test_make_directory(self, temp_dir):
+        directory = os.path.join(temp_dir, 'a', '.ty_cache')
+        writer = FileWriter()
+
+        assert writer.make_directory(directory)
+        assert os.path.isdir(directory)
+        assert not writer.make_directory(directory)
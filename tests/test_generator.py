@@ -1,23 +1,31 @@
 import ast
+import io
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from tests.test_transpiler import _create_arguments_node
-from typhon import js_ast, generator
+from typhon import js_ast
 from typhon.exceptions import UnsupportedNode
-from typhon.generator import generate_js_name, generate_js_constant, generate_js_expression, generate_js_bin_op, \
-    generate_js_call, generate_js_code_expression, generate_js_statement, generate_js_arg, generate_js_arguments, \
-    generate_js_return, generate_js_eq, generate_code_block, generate_js_dict, generate_expression_list, \
-    generate_js_assign, generate_js_module, generate_js_body
+from typhon.generator import generate_js_constant, generate_js_eq, generate_js_module, generate_js_body, \
+    write_js_name, write_js_expression, write_js_bin_op, write_js_call, write_js_code_expression, write_js_statement, \
+    write_js_arg, write_js_arguments, write_js_return, write_js_dict, write_js_assign, write_expression_list, \
+    write_js_module, write_code_block, CodeWriter
 from typhon.transpiler import convert_arguments
 
 
+def write(writer_function, node) -> str:
+    writer = CodeWriter()
+    writer_function(writer, node)
+    return writer.getvalue()
+
+
 def test_generate_js_code__expression():
     js_node = js_ast.JSCodeExpression(
         value=js_ast.JSBinOp(left=js_ast.JSConstant(value=1), op=js_ast.JSAdd(), right=js_ast.JSConstant(value=2))
     )
 
-    result = generate_js_code_expression(js_node)
+    result = write(write_js_code_expression, js_node)
 
     js_str = '1 + 2;'
     assert result == js_str
@@ -30,7 +38,7 @@ def test_generate_js_statement__assign():
     )
     js_str = 'v = 2;'
 
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
 
     assert result == js_str
 
@@ -42,7 +50,7 @@ def test_generate_statement__function_def():
         [js_ast.JSReturn(js_ast.JSConstant(5))],
     )
 
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
 
     expected = '''function bar(foo) {
     return 5;
@@ -57,7 +65,7 @@ def test_generate_statement__method_def():
         [js_ast.JSReturn(js_ast.JSConstant(5))],
     )
 
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
 
     expected = '''bar(foo) {
     return 5;
@@ -67,7 +75,7 @@ def test_generate_statement__method_def():
 
 def test_generate_js_statement__while():
     node = js_ast.JSWhile(test=js_ast.JSConstant(value=True), body=[])
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
     assert result == 'while true {\n}'
 
 
@@ -78,7 +86,7 @@ def test_generate_js_statement__while_else():
         orelse=[js_ast.JSCodeExpression(js_ast.JSName('a'))],
     )
 
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
 
     assert result == 'while true {\n} else {\n    a;\n}'
 
@@ -89,7 +97,7 @@ def test_generate_js_statement__if():
         body=[js_ast.JSCodeExpression(js_ast.JSName('a'))],
     )
 
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
 
     expected = '''if (true) {
     a;
@@ -105,7 +113,7 @@ def test_generate_js_statement__indents():
         ]
     )
 
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
 
     expected = '''while true {
     while true {
@@ -117,32 +125,32 @@ def test_generate_js_statement__indents():
 
 def test_generate_js_statement__throw():
     node = js_ast.JSThrow(exc=js_ast.JSName('Exception'))
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
     assert result == 'throw Exception;'
 
 
 def test_generate_js_statement__continue():
     node = js_ast.JSContinue()
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
     assert result == 'continue;'
 
 
 def test_generate_js_statement__break():
     node = js_ast.JSBreak()
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
     assert result == 'break;'
 
 
 def test_generate_js_statement__delete():
     node = js_ast.JSDelete(js_ast.JSName('d'))
-    result = generate_js_statement(node)
+    result = write(write_js_statement, node)
     assert result == 'delete d;'
 
 
 def test_generate_js_name():
     js_node = js_ast.JSName(id='a')
 
-    result = generate_js_name(js_node)
+    result = write(write_js_name, js_node)
 
     assert result == 'a'
 
@@ -181,14 +189,14 @@ def test_generate_constant__true():
 def test_generate_js_expression__name():
     js_node = js_ast.JSName(id='a')
 
-    assert generate_js_expression(js_node) == 'a'
+    assert write(write_js_expression, js_node) == 'a'
 
 
 @pytest.mark.parametrize('value, result', [(25, '25'), ('test', "'test'")])
 def test_generate_js_expression__constant(value, result):
     js_node = js_ast.JSConstant(value=value)
 
-    assert generate_js_expression(js_node) == result
+    assert write(write_js_expression, js_node) == result
 
 
 def test_generate_js_expression__call():
@@ -198,7 +206,7 @@ def test_generate_js_expression__call():
     )
     js_str = 'console.log(1 + 2)'
 
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
 
     assert result == js_str
 
@@ -206,7 +214,7 @@ def test_generate_js_expression__call():
 def test_generate_js_expression__list():
     js_node = js_ast.JSList(elts=[js_ast.JSConstant(1), js_ast.JSConstant(2)])
 
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
 
     expected = '[1, 2]'
     assert result == expected
@@ -218,7 +226,7 @@ def test_generate_js_expression__dict():
         values=[js_ast.JSConstant(1), js_ast.JSConstant(2)]
     )
 
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
 
     expected = "{'a': 1, 'b': 2}"
     assert result == expected
@@ -226,7 +234,7 @@ def test_generate_js_expression__dict():
 
 def test_generate_js_expression__compare():
     js_node = js_ast.JSCompare(left=js_ast.JSName('a'), op=js_ast.JSEq(), right=js_ast.JSConstant(1))
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
     assert result == 'a === 1'
 
 
@@ -237,18 +245,18 @@ def test_generate_js_expression__unsupported_node():
     js_node = NewNode()
 
     with pytest.raises(UnsupportedNode):
-        generate_js_expression(js_node)
+        write(write_js_expression, js_node)
 
 
 def test_generate_js_expression__subscript():
     js_node = js_ast.JSSubscript(js_ast.JSName('a'), js_ast.JSConstant('c'))
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
     assert result == "a['c']"
 
 
 def test_generate_js_expression__attribute():
     js_node = js_ast.JSAttribute(js_ast.JSName('foo'), 'bar')
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
     assert result == 'foo.bar'
 
 
@@ -258,7 +266,7 @@ def test_generate_js_expression__new():
         args=[js_ast.JSBinOp(left=js_ast.JSConstant(value=1), op=js_ast.JSAdd(), right=js_ast.JSConstant(value=2))]
     )
 
-    result = generate_js_expression(js_node)
+    result = write(write_js_expression, js_node)
 
     expected = 'new Foo(1 + 2)'
     assert result == expected
@@ -274,7 +282,7 @@ def test_generate_js_bin_op():
         right=js_ast.JSConstant(value=2)
     )
 
-    result = generate_js_bin_op(js_node)
+    result = write(write_js_bin_op, js_node)
     expected = "a + '123' + 2"
 
     assert result == expected
@@ -291,7 +299,7 @@ def test_generate_js_call():
         ]
     )
 
-    result = generate_js_call(js_node)
+    result = write(write_js_call, js_node)
     expected = "test(1 + 2, name='value')"
 
     assert result == expected
@@ -300,7 +308,7 @@ def test_generate_js_call():
 def test_generate_arg():
     js_node = js_ast.JSArg('arg')
 
-    result = generate_js_arg(js_node)
+    result = write(write_js_arg, js_node)
 
     expected = 'arg'
     assert result == expected
@@ -309,7 +317,7 @@ def test_generate_arg():
 def test_generate_arguments():
     js_node = js_ast.JSArguments([js_ast.JSArg('a'), js_ast.JSArg('b')])
 
-    result = generate_js_arguments(js_node)
+    result = write(write_js_arguments, js_node)
 
     expected = 'a, b'
     assert result == expected
@@ -320,7 +328,7 @@ def test_generate_arguments__universal():
                                      ['c', 'd'], [None, ast.Constant(value=1)], 'kwargs')
     js_node = convert_arguments(py_node)
 
-    result = generate_js_arguments(js_node)
+    result = write(write_js_arguments, js_node)
 
     expected = 'a, b=1, kwargs, ...arg'
     assert result == expected
@@ -328,14 +336,14 @@ def test_generate_arguments__universal():
 
 def test_generate_arguments__none():
     js_node = js_ast.JSArguments(None)
-    result = generate_js_arguments(js_node)
+    result = write(write_js_arguments, js_node)
     assert result == ''
 
 
 def test_generate_return():
     js_node = js_ast.JSReturn(js_ast.JSConstant(100))
 
-    result = generate_js_return(js_node)
+    result = write(write_js_return, js_node)
 
     expected = 'return 100;'
     assert result == expected
@@ -354,7 +362,7 @@ def test_generate_code_block__if_with_else():
         orelse=[js_ast.JSCodeExpression(js_ast.JSConstant(2))],
     )
 
-    result = generate_code_block([node])
+    result = write(write_code_block, [node])
 
     expected = '''{
     if (true) {
@@ -381,7 +389,7 @@ def test_generate_code_block__try_catch_finally():
         finalbody=[js_ast.JSCodeExpression(js_ast.JSName('e'))],
     )
 
-    result = generate_code_block([node])
+    result = write(write_code_block, [node])
 
     expected = '''{
     try {
@@ -406,21 +414,23 @@ def test_generate_code_block__try_catch_finally():
 def test_generate_code_block__with_error():
     node = js_ast.JSCodeExpression(js_ast.JSAdd())
 
+    writer = CodeWriter()
+
     with pytest.raises(UnsupportedNode):
-        generate_code_block([node])
+        write_code_block(writer, [node])
 
-    assert generator.code_block_indent == 0
+    assert writer.indent == 0
 
 
 def test_generate_js_dict__empty():
     js_node = js_ast.JSDict(keys=None, values=None)
-    result = generate_js_dict(js_node)
+    result = write(write_js_dict, js_node)
     assert result == "{}"
 
 
 def test_generate_expression_list__empty():
-    result = generate_expression_list(None)
-    assert result == []
+    result = write(write_expression_list, None)
+    assert result == ''
 
 
 def test_generate_js_assign__to_subscript():
@@ -429,7 +439,7 @@ def test_generate_js_assign__to_subscript():
         value=js_ast.JSConstant(1),
     )
 
-    result = generate_js_assign(js_node)
+    result = write(write_js_assign, js_node)
 
     assert result == "a[c] = 1;"
 
@@ -449,38 +459,93 @@ def test_generate_js_module_with_export():
     assert result == 'export {a};\n\na;'
 
 
+def test_write_js_module__stream():
+    js_node = js_ast.JSModule(body=[
+        js_ast.JSIf(test=js_ast.JSName('a'), body=[
+            js_ast.JSIf(test=js_ast.JSName('b'), body=[js_ast.JSCodeExpression(js_ast.JSName('c'))], orelse=[]),
+        ], orelse=[js_ast.JSNop()]),
+        js_ast.JSCodeExpression(js_ast.JSName('d')),
+    ])
+    stream = io.StringIO()
+
+    write_js_module(CodeWriter(stream), js_node)
+
+    assert stream.getvalue() == 'if (a) {\n    if (b) {\n        c;\n    }\n} else {\n}\nd;'
+    assert stream.getvalue() == generate_js_module(js_node)
+
+
+def test_generate_js_module__threads():
+    def make_module(depth: int) -> js_ast.JSModule:
+        body = [js_ast.JSCodeExpression(js_ast.JSName('a'))]
+        for _ in range(depth):
+            body = [js_ast.JSIf(test=js_ast.JSName('b'), body=body, orelse=[])]
+        return js_ast.JSModule(body=body)
+
+    js_nodes = [make_module(depth) for depth in range(1, 40)] * 4
+    expected = [generate_js_module(js_node) for js_node in js_nodes]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        result = list(executor.map(generate_js_module, js_nodes))
+
+    assert result == expected
+
+
+def test_write_js_module__minify():
+    js_node = js_ast.JSModule(body=[
+        js_ast.JSFunctionDef('foo', js_ast.JSArguments(args=[js_ast.JSArg('alpha')]), body=[
+            js_ast.JSIf(test=js_ast.JSCompare(js_ast.JSName('alpha'), js_ast.JSEq(), js_ast.JSConstant(1)), body=[
+                js_ast.JSReturn(js_ast.JSList([js_ast.JSName('alpha'), js_ast.JSConstant('a b')])),
+            ], orelse=[]),
+            js_ast.JSReturn(js_ast.JSBinOp(js_ast.JSName('alpha'), js_ast.JSAdd(), js_ast.JSName('x'))),
+        ]),
+        js_ast.JSCodeExpression(js_ast.JSCall(js_ast.JSName('foo'), args=[js_ast.JSName('alpha')], keywords=[])),
+    ], export=js_ast.JSExport(['foo', 'alpha']))
+    writer = CodeWriter(minify=True)
+
+    write_js_module(writer, js_node)
+
+    assert writer.getvalue() == \
+           "export{foo,alpha};function foo(a){if(a===1){return [a,'a b'];}return a+x;}foo(alpha);"
+
+
 def test_generate_js_statement__let():
     js_node = js_ast.JSLet(assign=js_ast.JSAssign(
         target=js_ast.JSName(id='v'),
         value=js_ast.JSConstant(value=2)
     ))
 
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
 
     assert result == 'let v = 2;'
 
 
 def test_generate_js_statement__import():
     js_node = js_ast.JSImport('test', names=[js_ast.JSAlias('a', 'var_a'), js_ast.JSAlias('foo')])
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
     assert result == "import {a as var_a, foo} from './test.js';"
 
 
 def test_generate_js_statement__import_all():
     js_node = js_ast.JSImport('test', names=[])
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
     assert result == "import * as test from './test.js';"
 
 
 def test_generate_js_statement__import_all_as():
     js_node = js_ast.JSImport('test2', names=[], alias='bar')
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
     assert result == "import * as bar from './test2.js';"
 
 
+def test_generate_js_statement__import_path():
+    js_node = js_ast.JSImport('pkg.a', names=[js_ast.JSAlias('f')], path='./pkg/a.js')
+    result = write(write_js_statement, js_node)
+    assert result == "import {f} from './pkg/a.js';"
+
+
 def test_generate_js_statement__class_def():
     js_node = js_ast.JSClassDef(name='A', body=[])
-    result = generate_js_statement(js_node)
+    result = write(write_js_statement, js_node)
     assert result == "class A {\n}"
 
 
@@ -2,7 +2,7 @@ import pytest
 
 from tests.helpers import source_file, make_package
 from typhon.exceptions import TyphonImportError
-from typhon.import_graph import ImportGraph
+from typhon.import_graph import ImportGraph, sort_modules
 from typhon.source_manager import SourceManager
 from typhon.types import ModulePath
 
@@ -11,7 +11,7 @@ class TestImportGraph:
     def test_graph__no_imports(self):
         source = 'print("test")'
         import_graph = ImportGraph(source, SourceManager(), '__main__')
-        assert import_graph.get_graph() == {('__main__',): []}
+        assert import_graph.get_graph() == {ModulePath('__main__'): []}
 
     def test_graph__with_import(self, temp_dir):
         source_1 = 'import a\nprint("test")'
@@ -21,7 +21,7 @@ class TestImportGraph:
         with source_file('a.py', source_2, temp_dir):
             graph = import_graph.get_graph()
 
-        assert graph == {('__main__',): [ModulePath('a')], ('a',): []}
+        assert graph == {ModulePath('__main__'): [ModulePath('a')], ModulePath('a'): []}
 
     def test_graph__with_inner_import(self):
         source_1 = 'while True:\n    import a'
@@ -29,7 +29,7 @@ class TestImportGraph:
 
         graph = import_graph.get_graph()
 
-        assert graph == {('__main__',): []}
+        assert graph == {ModulePath('__main__'): []}
 
     def test_graph__loop(self, temp_dir):
         source_1 = 'import a'
@@ -49,7 +49,7 @@ class TestImportGraph:
         with make_package('a', temp_dir) as package_path, source_file('__init__.py', source_2, package_path):
             graph = import_graph.get_graph()
 
-        assert graph == {('__main__',): [ModulePath('a', '__init__')], ('a', '__init__'): []}
+        assert graph == {ModulePath('__main__'): [ModulePath('a', '__init__')], ModulePath('a', '__init__'): []}
 
     def test_get_imports__package(self, temp_dir):
         import_graph = ImportGraph('import pack', SourceManager(temp_dir), '__main__')
@@ -66,3 +66,41 @@ class TestImportGraph:
         ):
             imports = import_graph.get_imports('import pack.module')
         assert imports == [ModulePath('pack', '__init__'), ModulePath('pack', 'module')]
+
+
+class TestSortModules:
+    def test_diamond(self):
+        main, a, b, c = ModulePath('__main__'), ModulePath('a'), ModulePath('b'), ModulePath('c')
+        graph = {main: [a, b], a: [c], b: [c], c: []}
+
+        sorted_modules, cycles = sort_modules(graph, main)
+
+        assert sorted_modules == [c, a, b, main]
+        assert cycles == []
+
+    def test_several_roots(self):
+        a, b, c, d = (ModulePath(name) for name in ('a', 'b', 'c', 'd'))
+        graph = {a: [c], b: [c, d], c: [], d: []}
+
+        sorted_modules, cycles = sort_modules(graph, a, b)
+
+        assert sorted_modules == [c, a, d, b]
+        assert cycles == []
+
+    def test_all_cycles(self):
+        main, a, b, c, d = (ModulePath(name) for name in ('__main__', 'a', 'b', 'c', 'd'))
+        graph = {main: [a, c], a: [b], b: [a], c: [d], d: [c]}
+
+        sorted_modules, cycles = sort_modules(graph, main)
+
+        assert cycles == [[main, a, b, a], [main, c, d, c]]
+
+    def test_all_cycles__error(self, temp_dir):
+        import_graph = ImportGraph('import a\nimport c', SourceManager(temp_dir), '__main__')
+
+        with pytest.raises(TyphonImportError) as exc, \
+                source_file('a.py', 'import b', temp_dir), source_file('b.py', 'import a', temp_dir), \
+                source_file('c.py', 'import c', temp_dir):
+            import_graph.get_graph()
+        assert str(exc.value) == 'There is circular imports detected: .__main__ -> .a -> .b -> .a; .__main__ -> .c -> .c'
+        assert len(import_graph.cycles) == 2
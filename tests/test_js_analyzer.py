@@ -200,3 +200,83 @@ c = a'''
             js_ast.JSNew(class_=js_ast.JSAttribute(js_ast.JSName('B'), 'a')),
         ]
         assert new_body == expected
+
+
+def transpile_module(source: str) -> str:
+    module_transpiler = ModuleTranspiler(source, ObjectModule(ModulePath('m')), ModulePath('m'))
+    module_transpiler.convert()
+    module_transpiler.transform()
+    return generate_js_body(module_transpiler.js_tree.body)
+
+
+class TestConstants:
+    def test_fold_constants(self):
+        assert transpile_module("print(1 + 2 + 3, 'a' + 'b', 1.5 + 1, 'a' + 1, x + 1)") == \
+            "print(6, 'ab', 2.5, 'a' + 1, x + 1);"
+
+    def test_fold_unsafe_integer(self):
+        assert transpile_module('print(9007199254740991 + 1)') == 'print(9007199254740991 + 1);'
+
+    def test_inline_module_constants(self):
+        source = "HOST = 'localhost'\nPORT = 8000 + 80\nURL = HOST + ':'\ndef f():\n    return PORT\nprint(URL, PORT + 1)"
+
+        assert transpile_module(source) == (
+            "let HOST = 'localhost';\nlet PORT = 8080;\nlet URL = 'localhost:';\n"
+            "function f() {\n    return 8080;\n}\nprint('localhost:', 8081);"
+        )
+
+    def test_reassigned_names_are_not_inlined(self):
+        source = 'a = 1\na = 2\nb = 1\nb.c = 2\ndef f(d):\n    e = 1\nd = 1\ne = 1\nprint(a, b, d, e)'
+
+        assert transpile_module(source).endswith('print(a, b, d, e);')
+
+    def test_attribute_base_is_not_inlined(self):
+        source = "S = 'abc'\nprint(S.upper(), S + 'd')"
+
+        assert transpile_module(source).endswith("print(S.upper(), 'abcd');")
+
+    def test_long_strings_are_not_inlined(self):
+        source = f"a = '{'a' * 33}'\nprint(a)"
+
+        assert transpile_module(source).endswith('print(a);')
+
+
+class TestDeadCode:
+    def test_remove_constant_branches(self):
+        source = (
+            'DEBUG = False\n'
+            'if DEBUG:\n    print(1)\n'
+            'if True:\n    a = 1\nelse:\n    a = 2\n'
+            'while False:\n    print(2)\n'
+            'if x:\n    if 0:\n        print(3)\n    print(4)\n'
+            'print(a)'
+        )
+
+        assert transpile_module(source) == (
+            'let DEBUG = false;\nlet a = 1;\nif (x) {\n    print(4);\n}\nprint(a);'
+        )
+
+    def test_remove_statements_after_exit(self):
+        source = (
+            'def f(x):\n'
+            '    while x:\n        break\n        print(1)\n'
+            '    if x:\n        raise Error()\n        print(2)\n'
+            '    return x\n    print(3)\n'
+            'def g():\n    while True:\n        run()\n    print(4)'
+        )
+
+        assert transpile_module(source) == (
+            'function f(x) {\n    while x {\n        break;\n    }\n    if (x) {\n        throw Error();\n    }\n'
+            '    return x;\n}\nfunction g() {\n    while true {\n        run();\n    }\n}'
+        )
+
+    def test_remove_unused_locals(self):
+        source = 'def f():\n    a = 1\n    b = a\n    c = g()\n    d = 2\n    return d'
+
+        assert transpile_module(source) == 'function f() {\n    let c = g();\n    let d = 2;\n    return d;\n}'
+
+
+def test_transform_body__node_without_handler():
+    js_body = [js_ast.JSCodeExpression(js_ast.JSDict(keys=[], values=[]))]
+
+    assert BodyTransformer(js_body, [], ObjectInfo()).transform() is None
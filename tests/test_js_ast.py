@@ -22,3 +22,18 @@ def test_eq__error():
 def test_node_registry():
     assert js_ast.registry['JSNode'] == js_ast.JSNode
     assert js_ast.registry['JSIf'] == js_ast.JSIf
+
+
+def test_nodes_have_no_dict():
+    for node in (js_ast.JSName('a'), js_ast.JSNop(), js_ast.JSMethodDef('f', js_ast.JSArguments(), [])):
+        assert not hasattr(node, '__dict__')
+
+
+def test_generated_constructor():
+    node = js_ast.JSCall(js_ast.JSName('f'))
+
+    assert node.args is None
+    assert node.keywords == []
+    assert node.keywords is not js_ast.JSCall(js_ast.JSName('f')).keywords
+    assert node.lineno is None and node.col_offset is None
+    assert js_ast.JSImport(module='m', alias='x') == js_ast.JSImport('m', None, 'x')
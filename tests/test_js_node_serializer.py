@@ -1,94 +1,58 @@
+import pytest
+
 from typhon import js_ast
-from typhon.js_node_serializer import serialize_js_node, JSNodeDeserializer
+from typhon.js_node_serializer import pack_js_tree, unpack_js_tree
+
 
+class TestPackJSTree:
+    def test_pack(self):
+        node = js_ast.JSAssign(target=js_ast.JSName('a'), value=js_ast.JSName('a'))
 
-class TestSerializeJSNode:
-    def test_node(self):
-        node = js_ast.JSNode()
-        result = serialize_js_node(node)
-        assert result == {'class': 'JSNode', 'id': id(node)}
+        data = pack_js_tree(node)
 
-    def test_name(self):
-        node = js_ast.JSName(id='var_a')
-        result = serialize_js_node(node)
-        assert result == {'id': id(node), 'class': 'JSName', 'fields': {'id': 'var_a'}}
+        assert data['classes'] == [('JSName', 1), ('JSAssign', 2)]
+        assert data['strings'] == ['a']
 
-    def test_list(self):
-        node = js_ast.JSList(
-            elts=[
-                js_ast.JSName(id='a'),
-                js_ast.JSName(id='b'),
+    def test_unpack(self):
+        node = js_ast.JSModule(
+            body=[
+                js_ast.JSLet(js_ast.JSAssign(js_ast.JSName('a'), js_ast.JSConstant(1.5))),
+                js_ast.JSCall(js_ast.JSName('print'), args=[
+                    js_ast.JSConstant('text'), js_ast.JSConstant(None), js_ast.JSConstant(True),
+                    js_ast.JSConstant(2 ** 70), js_ast.JSConstant(-3),
+                ]),
             ],
+            export=js_ast.JSExport(['a']),
         )
 
-        result = serialize_js_node(node)
-
-        expected = {
-            'id': id(node),
-            'class': 'JSList',
-            'fields': {
-                'elts': [
-                    {'id': id(node.elts[0]), 'class': 'JSName', 'fields': {'id': 'a'}},
-                    {'id': id(node.elts[1]), 'class': 'JSName', 'fields': {'id': 'b'}},
-                ]
-            },
-        }
-        assert result == expected
-
-    def test_assign(self):
-        node = js_ast.JSAssign(target=js_ast.JSName('test'), value=js_ast.JSConstant(123))
-
-        result = serialize_js_node(node)
-
-        expected = {
-            'id': id(node),
-            'class': 'JSAssign',
-            'fields': {
-                'target': {'id': id(node.target), 'class': 'JSName', 'fields': {'id': 'test'}},
-                'value': {'id': id(node.value), 'class': 'JSConstant', 'fields': {'value': 123}},
-            },
-        }
-        assert result == expected
-
-
-class TestDeserializeJSNode:
-    def test_node(self):
-        node = js_ast.JSNode()
-        data = serialize_js_node(node)
-
-        deserializer = JSNodeDeserializer(data)
-        result = deserializer.deserialize()
+        result = unpack_js_tree(pack_js_tree(node))
 
         assert result == node
+        assert result.body[1].args[2].value is True
 
-    def test_name(self):
-        node = js_ast.JSName(id='var_a')
-        data = serialize_js_node(node)
+    def test_unpack__shared_node(self):
+        name = js_ast.JSName('a')
+        node = js_ast.JSList(elts=[name, name])
 
-        deserializer = JSNodeDeserializer(data)
-        result = deserializer.deserialize()
+        data = pack_js_tree(node)
+        result = unpack_js_tree(data)
 
-        assert result == node
+        assert len(data['classes']) == 2
+        assert result.elts[0] is result.elts[1]
 
-    def test_list(self):
-        node = js_ast.JSList(
-            elts=[
-                js_ast.JSName(id='a'),
-                js_ast.JSName(id='b'),
-            ],
-        )
-        data = serialize_js_node(node)
+    def test_unpack__deep_tree(self):
+        node = js_ast.JSName('a')
+        for _ in range(5000):
+            node = js_ast.JSBinOp(left=node, op=js_ast.JSAdd(), right=js_ast.JSConstant(1))
 
-        deserializer = JSNodeDeserializer(data)
-        result = deserializer.deserialize()
+        result = unpack_js_tree(pack_js_tree(node))
 
-        assert result == node
-
-    def test_assign(self):
-        node = js_ast.JSAssign(target=js_ast.JSName('test'), value=js_ast.JSConstant(123))
-        data = serialize_js_node(node)
+        assert result.right == js_ast.JSConstant(1)
+        assert result.left.left.right == js_ast.JSConstant(1)
 
-        deserializer = JSNodeDeserializer(data)
-        result = deserializer.deserialize()
+    def test_unpack__changed_fields(self):
+        data = pack_js_tree(js_ast.JSName('a'))
+        data['classes'] = [('JSName', 2)]
 
-        assert result == node
+        with pytest.raises(ValueError):
+            unpack_js_tree(data)
@@ -0,0 +1,20 @@
+from typhon import js_ast
+from typhon.js_visitor import JSNodeVisitor
+
+
+class NameVisitor(JSNodeVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_JSName(self, node: js_ast.JSName):
+        self.names.append(node.id)
+
+
+def test_visit__dispatch_table():
+    visitor = NameVisitor()
+    visitor.visit(js_ast.JSCall(js_ast.JSName('f'), [js_ast.JSName('a'), js_ast.JSConstant(1)]))
+
+    assert visitor.names == ['f', 'a']
+    assert NameVisitor._dispatch_table[js_ast.JSName] is NameVisitor.visit_JSName
+    assert NameVisitor._dispatch_table[js_ast.JSCall] is JSNodeVisitor.generic_visit
+    assert js_ast.JSName not in JSNodeVisitor._dispatch_table
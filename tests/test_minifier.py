@@ -0,0 +1,37 @@
+import ast
+
+from typhon.minifier import get_short_local_names
+from typhon.transpiler import convert_ast
+from typhon.js_analyzer import BodyTransformer
+from typhon.object_collector import ObjectModule
+from typhon.types import ModulePath
+
+
+def _get_function_def(source: str):
+    js_tree = convert_ast(ast.parse(source))
+    root_object = ObjectModule(ModulePath(''))
+    return BodyTransformer(js_tree.body, [''], root_object).transform()[0]
+
+
+def test_get_short_local_names():
+    function_def = _get_function_def('def foo(alpha, beta=1):\n    gamma = alpha + beta\n    return gamma')
+
+    assert get_short_local_names(function_def) == {'alpha': 'a', 'beta': 'b', 'gamma': 'c'}
+
+
+def test_get_short_local_names__skip_used_names():
+    function_def = _get_function_def('def foo(alpha):\n    return a(alpha, b)')
+
+    assert get_short_local_names(function_def) == {'alpha': 'c'}
+
+
+def test_get_short_local_names__keep_short_and_keyword_names():
+    function_def = _get_function_def('def foo(x, value):\n    print(x, value=value)')
+
+    assert get_short_local_names(function_def) == {}
+
+
+def test_get_short_local_names__nested_function():
+    function_def = _get_function_def('def foo(alpha):\n    def bar():\n        return alpha\n    return bar')
+
+    assert get_short_local_names(function_def) == {}
@@ -1,15 +1,15 @@
+import ast
 import datetime
-import json
 import os.path
 from tempfile import TemporaryDirectory
 
 import pytest
 
 from tests.helpers import make_package, source_file
-from typhon.js_node_serializer import serialize_js_node
-from typhon.module_info import ModuleInfo
-from typhon.module import Module
-from typhon.object_collector import ObjectInfo, ObjectModule
+from typhon.module_info import ModuleInfo, serialize_objects, load_module_info, dump_module_info
+from typhon.module import Module, AstDumpOptions
+from typhon import js_ast
+from typhon.object_collector import ObjectInfo, ObjectModule, ObjectConstant
 from typhon.source_manager import SourceManager
 from typhon.types import ModulePath
 from typhon.module_transpiler import ModuleTranspiler
@@ -50,19 +50,71 @@ class TestModule:
         module.save_info(module_info)
 
         cache_directory = os.path.join(temp_dir, '.ty_cache')
-        info_file = os.path.join(cache_directory, 'a.json')
-        with open(info_file, 'r') as f:
-            info_json_data = f.read()
-
-        info_data = json.loads(info_json_data)
-        expected = {
-            'updated': info_data['updated'],
-            'nodes': serialize_js_node(module_info.js_tree),
-        }
+        info_file = os.path.join(cache_directory, 'a.info')
+        with open(info_file, 'rb') as f:
+            info_data = f.read()
+
+        result = load_module_info(info_data)
+        assert result.updated is None
+        assert info_data == dump_module_info(module_info)
         now = datetime.datetime.now()
-        updated = datetime.datetime.fromisoformat(info_data['updated'])
-        assert (now - updated).seconds == 0
-        assert info_data == expected
+        assert (now - module.load_info().updated).seconds == 0
+        assert serialize_objects(result.objects) == serialize_objects(root_object)
+        assert result.get_js_tree() == module_info.js_tree
+        assert (result.source_hash, result.imports, result.dependencies) == ('', [], {})
+
+    def test_load_module_info(self, temp_dir):
+        module = Module(ModulePath('a'), SourceManager(temp_dir))
+        module_object = ObjectModule(ModulePath('a'))
+        module_object.objects['b'] = ObjectConstant(1)
+        module_info = ModuleInfo(objects=module_object, js_tree=js_ast.JSName('b'), source_hash='hash',
+                                 imports=[ModulePath('c')], dependencies={'c': 'signature'})
+        module.save_info(module_info)
+
+        result = module.load_info()
+
+        assert result.objects == module_object
+        assert result.get_js_tree() == js_ast.JSName('b')
+        assert result.source_hash == 'hash'
+        assert result.imports == [ModulePath('c')]
+        assert result.dependencies == {'c': 'signature'}
+
+    def test_load_module_info__corrupted(self, temp_dir):
+        module = Module(ModulePath('a'), SourceManager(temp_dir))
+        module.save_info(ModuleInfo(objects=ObjectModule(ModulePath('a')), js_tree=js_ast.JSName('b')))
+        with open(module.info_file_name, 'rb') as f:
+            data = f.read()
+        with open(module.info_file_name, 'wb') as f:
+            f.write(data[:len(data) // 2])
+
+        assert module.load_info() is None
+
+    def test_load_module_info__no_cache(self, temp_dir):
+        module = Module(ModulePath('a'), SourceManager(temp_dir))
+        assert module.load_info() is None
+
+    def test_dump_ast(self, temp_dir):
+        module = Module(ModulePath('pkg', 'a'), SourceManager(temp_dir))
+        py_tree = ast.parse('a = 1')
+
+        module.dump_ast(py_tree)
+        assert not os.path.exists(os.path.join(temp_dir, 'pkg', '.ty_cache'))
+
+        os.mkdir(os.path.join(temp_dir, 'pkg'))
+        module.dump_ast(py_tree, AstDumpOptions(modules=['other.*']))
+        assert not os.path.exists(module.ast_dump_file_name)
+
+        module.dump_ast(py_tree, AstDumpOptions(modules=['pkg.*']))
+        with open(module.ast_dump_file_name) as f:
+            assert f.read() == ast.dump(py_tree, indent=2)
+
+        module.dump_ast(py_tree, AstDumpOptions(format='compact'))
+        with open(module.ast_dump_file_name) as f:
+            assert f.read() == ast.dump(py_tree)
+
+    def test_ast_dump_options__unknown_format(self):
+        with pytest.raises(ValueError):
+            AstDumpOptions(format='xml')
 
     def test_module_path(self, temp_dir):
         module = Module(ModulePath('', 'a'), SourceManager(temp_dir))
@@ -73,3 +125,14 @@ class TestModule:
         with make_package('a', temp_dir) as package_path, source_file('b.py', 'test file', package_path):
             source = module.get_source()
         assert source == 'test file'
+
+    def test_save_js__stream(self, temp_dir):
+        module = Module(ModulePath('a'), SourceManager(temp_dir))
+        transpiler = ModuleTranspiler('a = 1', ObjectModule(ModulePath('a')), ModulePath('a'))
+        transpiler.convert()
+        transpiler.transform()
+
+        module.save_js(transpiler.write)
+
+        with open(module.target_file_name, 'r') as f:
+            assert f.read() == transpiler.generate()
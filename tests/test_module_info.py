@@ -1,8 +1,14 @@
 import datetime
 
+import pytest
+
 from typhon import js_ast
-from typhon.module_info import ModuleInfo, serialize_module_info
-from typhon.object_collector import ObjectInfo
+from typhon.js_node_serializer import pack_js_tree
+from typhon.module_info import ModuleInfo, serialize_module_info, serialize_objects, deserialize_objects, \
+    deserialize_module_info, dump_module_info, load_module_info
+from typhon.object_collector import ObjectInfo, ObjectModule, ObjectConstant, ObjectFunction, ObjectArgument, \
+    ObjectClass, ObjectReference
+from typhon.types import ModulePath
 
 
 def test_serialize_module_info():
@@ -14,6 +20,81 @@ def test_serialize_module_info():
 
     expected = {
         'updated': datetime.datetime.fromisoformat(result['updated']).isoformat(),
-        'nodes': {'id': id(node), 'class': 'JSName', 'fields': {'id': 'a'}},
+        'source_hash': '',
+        'imports': [],
+        'dependencies': {},
+        'export_signature': '',
+        'build_options': {},
+        'objects': {'class': 'ObjectInfo', 'type': '', 'value': 'a'},
+        'nodes': pack_js_tree(node),
     }
     assert result == expected
+
+
+def test_deserialize_module_info():
+    module_info = ModuleInfo(objects=ObjectModule(ModulePath('a')), js_tree=js_ast.JSName('a'), source_hash='hash',
+                             imports=[ModulePath('b', 'c')], dependencies={'b.c': 'signature'},
+                             export_signature='export')
+
+    result = deserialize_module_info(serialize_module_info(module_info))
+
+    assert result.objects == module_info.objects
+    assert result.get_js_tree() == module_info.js_tree
+    assert result.imports == module_info.imports
+    assert (result.source_hash, result.dependencies, result.export_signature) == ('hash', {'b.c': 'signature'}, 'export')
+
+
+def test_dump_module_info():
+    module_info = ModuleInfo(objects=ObjectModule(ModulePath('a')), js_tree=js_ast.JSName('a'), source_hash='hash',
+                             imports=[ModulePath('b')], dependencies={'b': 'signature'}, export_signature='export')
+
+    data = dump_module_info(module_info)
+    result = load_module_info(data)
+
+    assert isinstance(data, bytes)
+    assert result.objects == module_info.objects
+    assert result.get_js_tree() == module_info.js_tree
+    assert result.imports == module_info.imports
+    assert (result.source_hash, result.dependencies, result.export_signature) == ('hash', {'b': 'signature'}, 'export')
+
+
+def test_load_module_info__lazy_js_tree():
+    module_info = ModuleInfo(objects=ObjectModule(ModulePath('a')), js_tree=js_ast.JSName('a'))
+
+    result = load_module_info(dump_module_info(module_info))
+
+    assert result.js_tree is None
+    assert result.get_js_tree() == js_ast.JSName('a')
+    assert result.packed_js_tree is None
+    assert result.get_js_tree() is result.js_tree
+
+
+def test_load_module_info__unknown_format():
+    with pytest.raises(ValueError):
+        load_module_info(b'{"source_hash": ""}')
+
+
+def test_serialize_objects():
+    function_object = ObjectFunction('foo')
+    function_object.locals.add_object('arg', ObjectArgument())
+    module_object = ObjectModule(ModulePath('a'))
+    module_object.add_object('foo', function_object)
+    module_object.add_object('A', ObjectClass('A'))
+    module_object.add_object('b', ObjectConstant(b'bytes'))
+    module_object.add_object('c', None)
+
+    result = deserialize_objects(serialize_objects(module_object))
+
+    assert result == module_object
+    assert result.module_path == ModulePath('a')
+
+
+def test_serialize_objects__reference_to_other_module():
+    other_object = ObjectClass('B')
+    module_object = ObjectModule(ModulePath('a'))
+    module_object.add_object('B', other_object)
+
+    data = serialize_objects(module_object, {id(other_object): 'b.B'})
+
+    assert data['objects']['B'] == {'reference': 'b.B'}
+    assert deserialize_objects(data).objects['B'] == ObjectReference('b.B')
@@ -0,0 +1,39 @@
+import ast
+
+from tests.helpers import source_file
+from typhon.module_store import ModuleStore
+from typhon.source_manager import SourceManager
+from typhon.types import ModulePath
+
+
+class TestModuleStore:
+    def test_add_source(self, temp_dir):
+        store = ModuleStore(SourceManager(temp_dir))
+
+        store.add_source(ModulePath('__main__'), 'a = 1')
+        assert store.parse_count == 0
+
+        parsed_module = store.get(ModulePath('__main__'))
+
+        assert parsed_module.source == 'a = 1'
+        assert isinstance(parsed_module.py_tree, ast.Module)
+        assert (store.read_count, store.parse_count) == (0, 1)
+
+    def test_get__reads_file_once(self, temp_dir):
+        store = ModuleStore(SourceManager(temp_dir))
+
+        with source_file('a.py', 'print(1)', temp_dir):
+            parsed_module = store.get(ModulePath('a'))
+            assert store.get(ModulePath('a')) is parsed_module
+
+        assert parsed_module.source == 'print(1)'
+        assert (store.read_count, store.parse_count) == (1, 1)
+
+    def test_get_source__without_parse(self, temp_dir):
+        store = ModuleStore(SourceManager(temp_dir))
+
+        with source_file('a.py', 'print(1)', temp_dir):
+            source = store.get_source(ModulePath('a'))
+
+        assert source == 'print(1)'
+        assert (store.read_count, store.parse_count) == (1, 0)
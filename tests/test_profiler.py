@@ -0,0 +1,107 @@
+import ast
+import json
+import os
+
+from tests.helpers import source_file
+from typhon import js_ast
+from typhon.profiler import Profiler, count_js_nodes, count_py_nodes
+from typhon.project import Project
+from typhon.types import ModulePath
+
+
+class TestProfiler:
+    def test_report(self):
+        profiler = Profiler()
+        with profiler.phase('build'):
+            with profiler.phase('transform', ModulePath('a')):
+                pass
+            with profiler.phase('transform', ModulePath('b')):
+                pass
+        profiler.count('write_count')
+        profiler.count('write_count', 2)
+
+        report = profiler.report()
+
+        assert report['phases']['transform']['calls'] == 2
+        assert report['phases']['build']['calls'] == 1
+        assert report['phases']['build']['time'] >= report['phases']['transform']['time']
+        assert list(report['modules']) == ['a', 'b']
+        assert list(report['modules']['a']) == ['transform']
+        assert report['counters'] == {'write_count': 3}
+
+    def test_phase__records_on_error(self):
+        profiler = Profiler()
+        try:
+            with profiler.phase('convert', ModulePath('a')):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert [event.name for event in profiler.events] == ['convert']
+
+    def test_disabled(self):
+        profiler = Profiler(enabled=False)
+        with profiler.phase('build'):
+            profiler.count('write_count')
+
+        assert profiler.report() == {'phases': {}, 'modules': {}, 'counters': {}}
+
+    def test_trace_events(self):
+        profiler = Profiler()
+        with profiler.phase('transform', ModulePath('pkg', 'a')):
+            pass
+        profiler.count('parse_count')
+
+        trace = profiler.trace_events()
+
+        phase_event, counter_event = trace['traceEvents']
+        assert phase_event['name'] == 'transform pkg.a'
+        assert phase_event['ph'] == 'X'
+        assert phase_event['args'] == {'module': 'pkg.a'}
+        assert phase_event['dur'] >= 0
+        assert counter_event['ph'] == 'C'
+        assert counter_event['args'] == {'parse_count': 1}
+        assert counter_event['ts'] >= phase_event['ts']
+
+    def test_count_nodes(self):
+        assert count_py_nodes(ast.parse('a = 1')) == 5
+        assert count_js_nodes(js_ast.JSModule(body=[js_ast.JSReturn(js_ast.JSName('a'))])) == 3
+
+
+class TestProjectProfile:
+    def test_save_profile_report(self, temp_dir):
+        report_path = os.path.join(temp_dir, 'build.json')
+        project = Project(temp_dir, profile=True)
+        with source_file('lib.py', 'def f(x):\n    return x', temp_dir):
+            project.transpile_source('import lib\nprint(lib.f(1))')
+        project.save_profile_report(report_path)
+
+        with open(report_path) as f:
+            report = json.load(f)
+
+        for phase in ('build', 'build_import_graph', 'parse', 'collect_objects', 'resolve_references', 'convert',
+                      'transform', 'generate', 'save_js'):
+            assert phase in report['phases']
+        assert set(report['modules']) == {'__main__', 'lib'}
+        assert report['counters']['read_count'] == 1
+        assert report['counters']['parse_count'] == 2
+        assert report['counters']['py_node_count'] > 0
+        assert report['counters']['js_node_count'] > 0
+        assert report['counters']['write_count'] > 0
+
+    def test_save_profile_report__trace(self, temp_dir):
+        report_path = os.path.join(temp_dir, 'build.json')
+        project = Project(temp_dir, profile=True)
+        project.transpile_source('print(1)')
+        project.save_profile_report(report_path, trace=True)
+
+        with open(report_path) as f:
+            trace = json.load(f)
+
+        assert {event['ph'] for event in trace['traceEvents']} == {'X', 'C'}
+
+    def test_profile_disabled(self, temp_dir):
+        project = Project(temp_dir)
+        project.transpile_source('print(1)')
+
+        assert project.profiler.events == []
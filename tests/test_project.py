@@ -1,10 +1,15 @@
 import ast
+import json
 import os.path
 from tempfile import TemporaryDirectory
 from unittest import mock
 
-from tests.helpers import source_file
+import pytest
+
+from tests.helpers import source_file, make_package
+from typhon.exceptions import TyphonImportError
 from typhon.import_graph import ImportGraph
+from typhon.module import AstDumpOptions
 from typhon.object_collector import ObjectModule, ObjectCollector, ObjectConstant, ObjectClass
 from typhon.types import ModulePath
 from typhon.project import Project
@@ -13,7 +18,7 @@ from typhon.project import Project
 class TestProject:
     def test_transpile_source(self, temp_dir):
         py_str = 'print(1 + 2)'
-        js_str = 'export {};\n\nprint(1 + 2);'
+        js_str = 'export {};\n\nprint(3);'
 
         project = Project(temp_dir)
         result = project.transpile_source(py_str)
@@ -22,7 +27,7 @@ class TestProject:
 
     def test_transpile_file(self):
         py_str = 'print(1 + 2)'
-        js_str = 'export {};\n\nprint(1 + 2);'
+        js_str = 'export {};\n\nprint(3);'
 
         with TemporaryDirectory() as temp_dir_path:
             project = Project(temp_dir_path)
@@ -40,21 +45,21 @@ class TestProject:
 
     def test_get_sorted_modules_from_graph(self, temp_dir):
         graph = {
-            ('__main__',): [
+            ModulePath('__main__'): [
                 ModulePath('a'),
                 ModulePath('b'),
                 ModulePath('c'),
                 ModulePath('e'),
             ],
-            ('a',): [],
-            ('b',): [ModulePath('c')],
-            ('c',): [ModulePath('d')],
-            ('e',): [ModulePath('a')],
+            ModulePath('a'): [],
+            ModulePath('b'): [ModulePath('c')],
+            ModulePath('c'): [ModulePath('d')],
+            ModulePath('e'): [ModulePath('a')],
         }
         project = Project(temp_dir)
 
-        with mock.patch.object(ImportGraph, 'get_graph') as get_graph_mock:
-            get_graph_mock.return_value = graph
+        with mock.patch.object(ImportGraph, 'build_graph') as build_graph_mock:
+            build_graph_mock.return_value = graph
             project.get_sorted_modules_from_source('', '__main__')
 
         assert project.modules == [
@@ -162,3 +167,271 @@ class TestProject:
         object_info = module_object1.objects['A']
         assert isinstance(object_info, ObjectClass)
         assert object_info.object_value == 'A'
+
+    def test_parse_each_module_once(self, temp_dir):
+        source_1 = 'import test\nimport foo\nprint("test")'
+        source_2 = 'import foo\nprint("Hello!")'
+        source_3 = 'print("Foo!")'
+
+        project = Project(temp_dir)
+        with source_file('test.py', source_2, temp_dir), source_file('foo.py', source_3, temp_dir):
+            project.transpile_source(source_1)
+
+        assert project.stats == {'read_count': 2, 'parse_count': 3, 'reused_count': 0}
+
+    def test_replace_references_to_imported_modules_once(self, temp_dir):
+        # Каждый модуль импортирует два предыдущих: число путей к первому модулю растёт экспоненциально
+        for i in range(20):
+            imports = ''.join(f'import module_{j}\n' for j in range(max(0, i - 2), i))
+            with open(os.path.join(temp_dir, f'module_{i}.py'), 'w') as f:
+                f.write(f'{imports}a = {i}')
+        replace_references_to_objects = Project.replace_references_to_objects
+
+        project = Project(temp_dir)
+        with mock.patch.object(Project, 'replace_references_to_objects', autospec=True,
+                               side_effect=replace_references_to_objects) as replace_mock:
+            project.transpile_source('import module_19')
+
+        assert len(project.modules) == 21
+        assert replace_mock.call_count < 200
+
+    def test_dump_ast(self, temp_dir):
+        cache_directory = os.path.join(temp_dir, '.ty_cache')
+        with source_file('lib.py', 'a = 1', temp_dir):
+            Project(temp_dir).transpile_source('import lib')
+            assert not [name for name in os.listdir(cache_directory) if name.endswith('_ast.txt')]
+
+            Project(temp_dir, ast_dump=AstDumpOptions(modules=['lib'])).transpile_source('import lib')
+
+        assert [name for name in os.listdir(cache_directory) if name.endswith('_ast.txt')] == ['lib_ast.txt']
+
+    def test_rebuild_without_changes(self, temp_dir):
+        with source_file('lib.py', 'a = 1', temp_dir):
+            Project(temp_dir, source_maps=True).transpile_source('import lib\nprint(lib.a)')
+            output_files = []
+            for directory, _, file_names in os.walk(temp_dir):
+                output_files.extend(os.path.join(directory, file_name) for file_name in file_names
+                                    if not file_name.endswith('.py'))
+            for file_name in output_files:
+                os.utime(file_name, ns=(0, 0))
+
+            project = Project(temp_dir, source_maps=True, profile=True)
+            project.transpile_source('import lib\nprint(lib.a)')
+
+        assert len(output_files) == 7
+        assert [file_name for file_name in output_files if os.stat(file_name).st_mtime_ns != 0] == []
+        assert project.profiler.counters['skipped_write_count'] == 7
+        assert 'write_count' not in project.profiler.counters
+
+    def test_incremental_build(self, temp_dir):
+        source_1 = 'import test\nimport foo\nprint("test")'
+        source_2 = 'import foo\nprint("Hello!")'
+        source_3 = 'a = 1'
+        test_js_path = os.path.join(temp_dir, 'test.js')
+
+        with source_file('test.py', source_2, temp_dir), source_file('foo.py', source_3, temp_dir):
+            Project(temp_dir, incremental=True).transpile_source(source_1)
+            with open(test_js_path, 'r') as f:
+                test_js_code = f.read()
+
+            project = Project(temp_dir, incremental=True)
+            result = project.transpile_source(source_1)
+
+            assert project.reused_modules == [ModulePath('foo'), ModulePath('test')]
+            assert project.stats == {'read_count': 2, 'parse_count': 1, 'reused_count': 2}
+            assert result == "export {test, foo};\n\nimport * as test from './test.js';\n" \
+                             "import * as foo from './foo.js';\nprint('test');"
+            with open(test_js_path, 'r') as f:
+                assert f.read() == test_js_code
+
+    def test_incremental_build__changed_dependency(self, temp_dir):
+        source_1 = 'import test\nprint("test")'
+        source_2 = 'import foo\nprint("Hello!")'
+        source_3 = 'import bar\ndef foo():\n    print("foo")'
+        source_4 = 'a = 1'
+
+        with (
+            source_file('test.py', source_2, temp_dir),
+            source_file('foo.py', source_3, temp_dir),
+            source_file('bar.py', source_4, temp_dir),
+        ):
+            Project(temp_dir, incremental=True).transpile_source(source_1)
+            with open(os.path.join(temp_dir, 'bar.py'), 'w') as f:
+                f.write('a = 2')
+
+            project = Project(temp_dir, incremental=True)
+            project.transpile_source(source_1)
+            # Изменились объекты модуля bar, поэтому все зависящие от него модули транспилируются заново
+            assert project.reused_modules == []
+
+            with open(os.path.join(temp_dir, 'foo.py'), 'w') as f:
+                f.write('import bar\ndef foo():\n    print("bar")')
+
+            project = Project(temp_dir, incremental=True)
+            project.transpile_source(source_1)
+            # Объекты модуля foo не изменились, поэтому модуль test берётся из кэша
+            assert project.reused_modules == [ModulePath('bar'), ModulePath('test')]
+
+        with open(os.path.join(temp_dir, 'foo.js'), 'r') as f:
+            assert f.read() == "export {bar, foo};\n\nimport * as bar from './bar.js';\n" \
+                               "function foo() {\n    print('bar');\n}"
+
+    def test_incremental_build__changed_options(self, temp_dir):
+        with source_file('main.py', 'import lib\nprint(lib.a)', temp_dir), source_file('lib.py', 'a = [1]', temp_dir):
+            Project(temp_dir, incremental=True).transpile_file('main.py')
+
+            project = Project(temp_dir, incremental=True, minify=True, source_maps=True)
+            project.transpile_file('main.py')
+            assert project.reused_modules == []
+
+            project = Project(temp_dir, incremental=True, minify=True, source_maps=True)
+            project.transpile_file('main.py')
+            assert project.reused_modules == [ModulePath('lib')]
+
+            os.unlink(os.path.join(temp_dir, 'lib.js.map'))
+            project = Project(temp_dir, incremental=True, minify=True, source_maps=True)
+            project.transpile_file('main.py')
+            assert project.reused_modules == []
+
+        with open(os.path.join(temp_dir, 'lib.js'), 'r') as f:
+            assert f.read().startswith('export{a};let a=[1];')
+        assert os.path.exists(os.path.join(temp_dir, 'lib.js.map'))
+
+    def test_transpile_in_parallel(self, temp_dir):
+        source_1 = 'import test\nimport foo\nfrom bar import A\nprint("test")\na = A()'
+        sources = {
+            'test.py': 'import foo\nprint("Hello!")',
+            'foo.py': 'import bar\ndef foo(a, b=1):\n    return a + b',
+            'bar.py': 'class A:\n    def m(self, x):\n        return x',
+        }
+
+        def build(jobs: int) -> dict[str, str]:
+            result = Project(temp_dir, jobs=jobs).transpile_source(source_1)
+            js_codes = {'__main__': result}
+            for file_name in sources:
+                with open(os.path.join(temp_dir, file_name.replace('.py', '.js')), 'r') as f:
+                    js_codes[file_name] = f.read()
+            return js_codes
+
+        with (
+            source_file('test.py', sources['test.py'], temp_dir),
+            source_file('foo.py', sources['foo.py'], temp_dir),
+            source_file('bar.py', sources['bar.py'], temp_dir),
+        ):
+            serial_js_codes = build(jobs=1)
+            parallel_js_codes = build(jobs=4)
+            with mock.patch('typhon.parallel.can_fork', return_value=False):
+                threads_js_codes = build(jobs=4)
+
+        assert parallel_js_codes == serial_js_codes
+        assert threads_js_codes == serial_js_codes
+
+    def test_transpile_files(self, temp_dir):
+        sources = {
+            'app_1.py': 'import lib\nprint(lib.a)',
+            'app_2.py': 'import lib\nimport utils\nprint(utils.b)',
+            'lib.py': 'import utils\na = 1',
+            'utils.py': 'b = 2',
+        }
+
+        with (
+            source_file('app_1.py', sources['app_1.py'], temp_dir),
+            source_file('app_2.py', sources['app_2.py'], temp_dir),
+            source_file('lib.py', sources['lib.py'], temp_dir),
+            source_file('utils.py', sources['utils.py'], temp_dir),
+        ):
+            project = Project(temp_dir)
+            entry_summaries = project.transpile_files(['app_1.py', 'app_2.py'])
+
+        app_1, app_2, lib, utils = (ModulePath(name) for name in ('app_1', 'app_2', 'lib', 'utils'))
+        assert project.modules == [utils, lib, app_1, app_2]
+        assert project.stats == {'read_count': 4, 'parse_count': 4, 'reused_count': 0}
+        assert [entry_summary.module_path for entry_summary in entry_summaries] == [app_1, app_2]
+        assert entry_summaries[0].target_file_name == os.path.join(temp_dir, 'app_1.js')
+        assert entry_summaries[0].modules == [utils, lib, app_1]
+        assert entry_summaries[1].modules == [utils, lib, app_2]
+        with open(os.path.join(temp_dir, 'app_2.js'), 'r') as f:
+            assert f.read() == "export {lib, utils};\n\nimport * as lib from './lib.js';\n" \
+                               "import * as utils from './utils.js';\nprint(utils.b);"
+
+    def test_transpile_files__directory(self, temp_dir):
+        with make_package('scripts', temp_dir) as package_path, \
+                source_file('a.py', 'x = 1', package_path), \
+                source_file('b.py', 'y = 2', package_path), \
+                source_file('notes.txt', '', package_path):
+            entry_summaries = Project(temp_dir).transpile_files(['scripts'])
+
+            assert [entry_summary.module_path for entry_summary in entry_summaries] == \
+                   [ModulePath('scripts', 'a'), ModulePath('scripts', 'b')]
+            assert os.path.exists(os.path.join(package_path, 'a.js'))
+            assert os.path.exists(os.path.join(package_path, 'b.js'))
+
+    def test_transpile_files__empty_directory(self, temp_dir):
+        with make_package('scripts', temp_dir), pytest.raises(TyphonImportError) as exc:
+            Project(temp_dir).transpile_files(['scripts'])
+
+        assert str(exc.value) == 'No source files found in scripts'
+
+    def test_transpile_file__source_maps(self, temp_dir):
+        with source_file('main.py', 'import lib\n\nprint(1)', temp_dir), source_file('lib.py', 'a = 1', temp_dir):
+            Project(temp_dir, source_maps=True).transpile_file('main.py')
+
+        with open(os.path.join(temp_dir, 'main.js'), 'r') as f:
+            assert f.read() == "export {lib};\n\nimport * as lib from './lib.js';\nprint(1);\n" \
+                               "//# sourceMappingURL=main.js.map\n"
+        with open(os.path.join(temp_dir, 'main.js.map'), 'r') as f:
+            assert json.load(f) == {
+                'version': 3,
+                'file': 'main.js',
+                'sources': ['main.py'],
+                'names': [],
+                'mappings': ';;AAAA;AAEA',
+            }
+        assert os.path.exists(os.path.join(temp_dir, 'lib.js.map'))
+
+    def test_transpile_file__out_dir(self, temp_dir):
+        source_path = os.path.join(temp_dir, 'src')
+        out_dir = os.path.join(temp_dir, 'out')
+        cache_dir = os.path.join(temp_dir, 'cache')
+        os.mkdir(source_path)
+        with source_file('main.py', 'from pkg.a import f\nprint(f())', source_path), \
+                source_file('util.py', 'def g():\n    return 1', source_path), \
+                make_package('pkg', source_path) as package_path, \
+                source_file('__init__.py', '', package_path), \
+                source_file('a.py', 'from util import g\ndef f():\n    return g()', package_path):
+            project = Project(source_path, source_maps=True, out_dir=out_dir, cache_dir=cache_dir)
+            target_file_name = project.transpile_file('main.py')
+            source_files = sorted(os.listdir(source_path))
+            package_files = sorted(os.listdir(package_path))
+
+        assert target_file_name == os.path.join(out_dir, 'main.js')
+        assert source_files == ['main.py', 'pkg', 'util.py']
+        assert package_files == ['__init__.py', 'a.py']
+        with open(os.path.join(out_dir, 'main.js'), 'r') as f:
+            assert "import {f} from './pkg/a.js';" in f.read()
+        with open(os.path.join(out_dir, 'pkg', 'a.js'), 'r') as f:
+            assert "import {g} from '../util.js';" in f.read()
+        with open(os.path.join(out_dir, 'pkg', 'a.js.map'), 'r') as f:
+            assert json.load(f)['sources'] == ['../../src/pkg/a.py']
+        assert os.path.exists(os.path.join(cache_dir, 'pkg', 'a.info'))
+        assert os.path.exists(os.path.join(cache_dir, 'main.info'))
+
+    def test_transpile_source__dead_branch_exports(self, temp_dir):
+        source = 'import lib\nDEBUG = False\nif DEBUG:\n    def helper():\n        pass\n    x = 2\nprint(DEBUG)'
+
+        with source_file('lib.py', 'a = 1', temp_dir):
+            result = Project(temp_dir).transpile_source(source)
+
+        assert result == "export {lib, DEBUG};\n\nimport * as lib from './lib.js';\nlet DEBUG = false;\nprint(false);"
+
+    def test_transpile_source__minify(self, temp_dir):
+        source = 'import foo\ndef bar(value, count=2):\n    total = value + count\n    return total\nprint(bar(1))'
+
+        with source_file('foo.py', 'a = [1, 2]', temp_dir):
+            result = Project(temp_dir, minify=True).transpile_source(source)
+            with open(os.path.join(temp_dir, 'foo.js'), 'r') as f:
+                foo_js_code = f.read()
+
+        assert result == "export{foo,bar};import * as foo from'./foo.js';" \
+                         "function bar(a,b=2){let c=a+b;return c;}print(bar(1));"
+        assert foo_js_code == 'export{a};let a=[1,2];'
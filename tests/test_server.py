@@ -0,0 +1,109 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from tests.helpers import source_file
+from typhon.exceptions import TranspileServerError
+from typhon.server import TranspileServer, send_request, transpile_file
+
+
+@pytest.fixture
+def transpile_server(temp_dir):
+    server = TranspileServer(os.path.join(temp_dir, 'typhon.sock'), temp_dir)
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    yield server
+    send_request({'command': 'shutdown'}, server.socket_path)
+    thread.join()
+
+
+class TestTranspileServer:
+    def test_transpile_source(self, transpile_server):
+        response = send_request({'command': 'transpile_source', 'source': 'a = 1'}, transpile_server.socket_path)
+
+        assert response == {'code': 'export {a};\n\nlet a = 1;'}
+
+    def test_transpile_source__reuse_project(self, transpile_server, temp_dir):
+        lib_path = os.path.join(temp_dir, 'lib.py')
+
+        with source_file('lib.py', 'a = 1', temp_dir):
+            send_request({'command': 'transpile_source', 'source': 'import lib\nprint(lib.a)'},
+                         transpile_server.socket_path)
+            response = send_request({'command': 'transpile_source', 'source': 'import lib\nprint(lib.a, 2)'},
+                                    transpile_server.socket_path)
+            project = transpile_server.source_watchers[temp_dir].project
+            assert response['code'].endswith('print(lib.a, 2);')
+            assert project.module_store.read_count == 1
+
+            with open(lib_path, 'w') as f:
+                f.write('b = 1')
+            os.utime(lib_path, ns=(0, 0))
+            response = send_request({'command': 'transpile_source', 'source': 'import lib\nprint(lib.b)'},
+                                    transpile_server.socket_path)
+            assert response['code'].endswith('print(lib.b);')
+            assert project.module_store.read_count == 2
+            with open(os.path.join(temp_dir, 'lib.js'), 'r') as f:
+                assert f.read() == 'export {b};\n\nlet b = 1;'
+
+    def test_transpile_file__rebuild_changed_modules(self, transpile_server, temp_dir):
+        main_path = os.path.join(temp_dir, 'main.py')
+        foo_path = os.path.join(temp_dir, 'foo.py')
+
+        with source_file('main.py', 'import foo\nprint(foo.a)', temp_dir), source_file('foo.py', 'a = 1', temp_dir):
+            response = send_request({'command': 'transpile', 'source': main_path}, transpile_server.socket_path)
+            assert response == {'target_file_name': os.path.join(temp_dir, 'main.js'),
+                                'rebuilt_modules': ['foo', 'main']}
+
+            response = send_request({'command': 'transpile', 'source': main_path}, transpile_server.socket_path)
+            assert response['rebuilt_modules'] == []
+
+            with open(foo_path, 'w') as f:
+                f.write('a = 2')
+            os.utime(foo_path, ns=(0, 0))
+            response = send_request({'command': 'transpile', 'source': main_path}, transpile_server.socket_path)
+            assert response['rebuilt_modules'] == ['foo', 'main']
+            with open(os.path.join(temp_dir, 'foo.js'), 'r') as f:
+                assert f.read() == 'export {a};\n\nlet a = 2;'
+
+    def test_unknown_command(self, transpile_server):
+        with pytest.raises(TranspileServerError) as exc:
+            send_request({'command': 'foo'}, transpile_server.socket_path)
+        assert str(exc.value) == 'TranspileServerError: Unknown command: foo'
+
+    def test_client_without_server(self, temp_dir):
+        with source_file('main.py', 'a = 1', temp_dir):
+            target_file_name = transpile_file(os.path.join(temp_dir, 'main.py'), os.path.join(temp_dir, 'no.sock'))
+
+        assert target_file_name == os.path.join(temp_dir, 'main.js')
+        assert os.path.exists(target_file_name)
+
+
+class TestServerSocket:
+    def test_not_a_socket(self, temp_dir):
+        socket_path = os.path.join(temp_dir, 'typhon.sock')
+        with open(socket_path, 'w') as f:
+            f.write('data')
+
+        with pytest.raises(TranspileServerError):
+            TranspileServer(socket_path, temp_dir)
+
+        assert os.path.isfile(socket_path)
+
+    def test_server_already_running(self, transpile_server, temp_dir):
+        with pytest.raises(TranspileServerError):
+            TranspileServer(transpile_server.socket_path, temp_dir)
+
+        assert send_request({'command': 'ping'}, transpile_server.socket_path) == {}
+
+    def test_stale_socket(self, temp_dir):
+        socket_path = os.path.join(temp_dir, 'typhon.sock')
+        stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale_socket.bind(socket_path)
+        stale_socket.close()
+
+        server = TranspileServer(socket_path, temp_dir)
+        server.server_close()
+
+        assert not os.path.exists(socket_path)
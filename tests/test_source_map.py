@@ -0,0 +1,22 @@
+from typhon.source_map import SourceMap, encode_vlq
+
+
+def test_encode_vlq():
+    assert [encode_vlq(value) for value in (0, 1, -1, 15, 16, -16, 1000)] == \
+           ['A', 'C', 'D', 'e', 'gB', 'hB', 'w+B']
+
+
+def test_source_map_to_dict():
+    source_map = SourceMap('a.js', 'a.py')
+    source_map.add_mapping(0, 0, 0, 0)
+    source_map.add_mapping(0, 10, 0, 6)
+    source_map.add_mapping(2, 4, 3, 4)
+    source_map.add_mapping(3, 0, 1, 0)
+
+    assert source_map.to_dict() == {
+        'version': 3,
+        'file': 'a.js',
+        'sources': ['a.py'],
+        'names': [],
+        'mappings': 'AAAA,UAAM;;IAGF;AAFJ',
+    }
@@ -489,3 +489,13 @@ def test_transpile_module():
     node = ast.Module(body=[ast.Expr(ast.Name(id='a', ctx=ast.Load()))])
     js_node = convert_ast(node)
     assert js_node == js_ast.JSModule(body=[js_ast.JSCodeExpression(js_ast.JSName('a'))])
+
+
+def test_transpile__positions():
+    src = 'def foo(a):\n    del a, b'
+    js_tree = convert_ast(ast.parse(src))
+
+    function_def = js_tree.body[0]
+    assert (function_def.lineno, function_def.col_offset) == (1, 0)
+    assert [(node.lineno, node.col_offset) for node in function_def.body] == [(2, 4), (2, 4)]
+    assert (function_def.body[1].target.lineno, function_def.body[1].target.col_offset) == (2, 11)
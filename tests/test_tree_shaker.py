@@ -0,0 +1,89 @@
+import os
+
+from tests.helpers import source_file
+from typhon.project import Project
+from typhon.types import ModulePath
+
+
+def read_file(file_name: str) -> str:
+    with open(file_name) as f:
+        return f.read()
+
+
+class TestTreeShaking:
+    def test_unused_objects_are_removed(self, temp_dir):
+        main_source = 'import lib\nfrom util import helper as h\n\nprint(lib.g(1), h(2))'
+        lib_source = (
+            'import util\n'
+            'from util import unused\n'
+            'X = 5\n'
+            'def g(x):\n'
+            '    return util.helper(x)\n'
+            'def dead():\n'
+            '    return unused()\n'
+            'class C:\n'
+            '    pass'
+        )
+        util_source = 'def helper(v):\n    return v + 1\n\ndef unused():\n    return 0'
+
+        with source_file('main.py', main_source, temp_dir), source_file('lib.py', lib_source, temp_dir), \
+                source_file('util.py', util_source, temp_dir):
+            project = Project(temp_dir, tree_shaking=True)
+            project.transpile_file(os.path.join(temp_dir, 'main.py'))
+
+        assert read_file(os.path.join(temp_dir, 'main.js')) == (
+            "export {lib, h};\n\nimport * as lib from './lib.js';\nimport {helper as h} from './util.js';\n"
+            'print(lib.g(1), h(2));'
+        )
+        assert read_file(os.path.join(temp_dir, 'lib.js')) == (
+            "export {util, g};\n\nimport * as util from './util.js';\nfunction g(x) {\n    return util.helper(x);\n}"
+        )
+        assert read_file(os.path.join(temp_dir, 'util.js')) == 'export {helper};\n\nfunction helper(v) {\n    return v + 1;\n}'
+
+    def test_side_effects_are_kept(self, temp_dir):
+        lib_source = 'from util import a, b\nc = f()\nd = 1\nprint(a)'
+        util_source = 'a = 1\nb = 2\nprint(b)'
+
+        with source_file('main.py', 'import lib', temp_dir), source_file('lib.py', lib_source, temp_dir), \
+                source_file('util.py', util_source, temp_dir):
+            project = Project(temp_dir, tree_shaking=True)
+            project.transpile_file(os.path.join(temp_dir, 'main.py'))
+
+        assert read_file(os.path.join(temp_dir, 'lib.js')) == (
+            "export {a, c};\n\nimport {a} from './util.js';\nlet c = f();\nprint(a);"
+        )
+        assert read_file(os.path.join(temp_dir, 'util.js')) == 'export {a};\n\nlet a = 1;\nprint(2);'
+
+    def test_effectful_import_keeps_one_name(self, temp_dir):
+        with source_file('main.py', 'import lib', temp_dir), source_file('lib.py', 'from util import a, b', temp_dir), \
+                source_file('util.py', 'a = 1\nb = 2\nprint(0)', temp_dir):
+            project = Project(temp_dir, tree_shaking=True)
+            project.transpile_file(os.path.join(temp_dir, 'main.py'))
+
+        assert read_file(os.path.join(temp_dir, 'lib.js')) == "export {a};\n\nimport {a} from './util.js';"
+        assert read_file(os.path.join(temp_dir, 'util.js')) == 'export {a};\n\nlet a = 1;\nprint(0);'
+
+    def test_transpile_source(self, temp_dir):
+        with source_file('util.py', 'def f():\n    return 1\ndef g():\n    return 2', temp_dir):
+            project = Project(temp_dir, tree_shaking=True)
+            result = project.transpile_source('from util import f\nprint(f())')
+
+            assert result == "export {f};\n\nimport {f} from './util.js';\nprint(f());"
+            assert read_file(os.path.join(temp_dir, 'util.js')) == 'export {f};\n\nfunction f() {\n    return 1;\n}'
+
+    def test_incremental_build_after_tree_shaking(self, temp_dir):
+        with source_file('main.py', 'from util import f\nprint(f())', temp_dir), \
+                source_file('main2.py', 'from util import g\nprint(g())', temp_dir), \
+                source_file('util.py', 'def f():\n    return 1\ndef g():\n    return 2', temp_dir):
+            Project(temp_dir, tree_shaking=True).transpile_file('main.py')
+            project = Project(temp_dir, incremental=True)
+            project.transpile_file('main2.py')
+
+            assert project.reused_modules == []
+            assert read_file(os.path.join(temp_dir, 'util.js')) == (
+                'export {f, g};\n\nfunction f() {\n    return 1;\n}\nfunction g() {\n    return 2;\n}'
+            )
+
+            project = Project(temp_dir, incremental=True)
+            project.transpile_file('main2.py')
+            assert project.reused_modules == [ModulePath('util')]
@@ -0,0 +1,32 @@
+import pickle
+
+import pytest
+
+from typhon.types import ModulePath
+
+
+class TestModulePath:
+    def test_properties(self):
+        module_path = ModulePath('a', 'b', 'c')
+
+        assert module_path.name == 'c'
+        assert module_path.packages == ('a', 'b')
+        assert module_path.package == 'a.b'
+        assert module_path.full_path == 'a.b.c'
+
+    def test_interned(self):
+        assert ModulePath('a', 'b') is ModulePath('a', 'b')
+        assert ModulePath('a') + ['b'] is ModulePath('a', 'b')
+        assert pickle.loads(pickle.dumps(ModulePath('a', 'b'))) is ModulePath('a', 'b')
+
+    def test_hashable(self):
+        modules = {ModulePath('a'): 1, ModulePath('a', 'b'): 2}
+
+        assert modules[ModulePath('a', 'b')] == 2
+        assert ModulePath('a') in set(modules)
+
+    def test_immutable(self):
+        module_path = ModulePath('a')
+
+        with pytest.raises(AttributeError):
+            module_path.name = 'b'
@@ -0,0 +1,79 @@
+import os
+
+from tests.helpers import source_file
+from typhon.project import Project
+from typhon.types import ModulePath
+from typhon.watcher import Watcher
+
+
+def _touch(file_name: str, source: str):
+    mtime = os.stat(file_name).st_mtime_ns
+    with open(file_name, 'w') as f:
+        f.write(source)
+    os.utime(file_name, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+
+class TestWatcher:
+    def test_check__no_changes(self, temp_dir):
+        with source_file('main.py', 'import a', temp_dir), source_file('a.py', 'x = 1', temp_dir):
+            watcher = Watcher(Project(temp_dir), 'main.py')
+            watcher.project.transpile_file('main.py')
+            watcher.update_mtimes()
+
+            assert watcher.check() == []
+
+    def test_check__rebuild_changed_module_and_importers(self, temp_dir):
+        with (
+            source_file('main.py', 'import a\nimport b', temp_dir),
+            source_file('a.py', 'import c\nx = 1', temp_dir),
+            source_file('b.py', 'y = 2', temp_dir),
+            source_file('c.py', 'z = 3', temp_dir),
+        ):
+            watcher = Watcher(Project(temp_dir), 'main.py')
+            watcher.project.transpile_file('main.py')
+            watcher.update_mtimes()
+
+            _touch(os.path.join(temp_dir, 'c.py'), 'z = 4')
+            rebuilt_modules = watcher.check()
+
+            with open(os.path.join(temp_dir, 'c.js'), 'r') as f:
+                c_js_code = f.read()
+
+        assert rebuilt_modules == [ModulePath('c'), ModulePath('a'), ModulePath('main')]
+        assert c_js_code == 'export {z};\n\nlet z = 4;'
+
+    def test_check__new_import(self, temp_dir):
+        with source_file('main.py', 'x = 1', temp_dir), source_file('a.py', 'y = 2', temp_dir):
+            watcher = Watcher(Project(temp_dir), 'main.py')
+            watcher.project.transpile_file('main.py')
+            watcher.update_mtimes()
+
+            _touch(os.path.join(temp_dir, 'main.py'), 'import a')
+            rebuilt_modules = watcher.check()
+
+        assert rebuilt_modules == [ModulePath('a'), ModulePath('main')]
+        assert watcher.project.modules == [ModulePath('a'), ModulePath('main')]
+
+    def test_check__keep_changes_after_error(self, temp_dir):
+        with (
+            source_file('main.py', 'import a\nimport b', temp_dir),
+            source_file('a.py', 'x = 1', temp_dir),
+            source_file('b.py', 'y = 1', temp_dir),
+        ):
+            watcher = Watcher(Project(temp_dir), 'main.py')
+            watcher.project.transpile_file('main.py')
+            watcher.update_mtimes()
+
+            _touch(os.path.join(temp_dir, 'a.py'), 'x = [i for i in range(3)]')
+            _touch(os.path.join(temp_dir, 'b.py'), 'y = 2')
+            assert watcher.check() == []
+
+            _touch(os.path.join(temp_dir, 'a.py'), 'x = 2')
+            rebuilt_modules = watcher.check()
+
+            with open(os.path.join(temp_dir, 'b.js'), 'r') as f:
+                b_js_code = f.read()
+
+        assert rebuilt_modules == [ModulePath('a'), ModulePath('b'), ModulePath('main')]
+        assert b_js_code == 'export {y};\n\nlet y = 2;'
+        assert watcher.pending_module_paths == []
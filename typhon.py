@@ -1,12 +1,126 @@
-import sys
+import argparse
+import os
 
-from typhon.project import Project
+from typhon import server
+from typhon.module import AST_DUMP_FORMATS, AstDumpOptions
+from typhon.project import Project, EntrySummary
+from typhon.types import ModulePath
+from typhon.watcher import Watcher
+
+
+def parse_args(args: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Транспилятор Python в JavaScript')
+    parser.add_argument('source', nargs='*',
+                        help='пути к транспилируемым файлам или директориям с транспилируемыми файлами')
+    parser.add_argument('--incremental', action='store_true',
+                        help='не транспилировать модули, не изменившиеся с прошлой сборки')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='количество процессов для генерации и сохранения модулей')
+    parser.add_argument('--source-maps', action='store_true',
+                        help='сохранять source map (.js.map) для каждого js-файла')
+    parser.add_argument('--minify', action='store_true',
+                        help='генерировать js-код без отступов и лишних пробелов, с короткими именами локальных переменных')
+    parser.add_argument('--tree-shaking', action='store_true',
+                        help='удалять из модулей функции, классы и присваивания, недостижимые из точек входа')
+    parser.add_argument('--bundle', action='store_true',
+                        help='дополнительно объединить все модули в один файл сборки <имя>.bundle.js')
+    parser.add_argument('--out-dir', metavar='DIR',
+                        help='сохранять js-файлы в отдельную директорию, повторяя структуру пакетов, '
+                             'а не рядом с исходными файлами')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='хранить кэш модулей в отдельной директории, повторяя структуру пакетов, '
+                             'а не в .ty_cache пакетов')
+    parser.add_argument('--profile-report', metavar='FILE',
+                        help='сохранить время фаз сборки по модулям и счётчики операций в JSON-файл')
+    parser.add_argument('--profile-format', choices=('report', 'trace'), default='report',
+                        help='формат --profile-report: отчёт по фазам или Chrome trace events (chrome://tracing)')
+    parser.add_argument('--dump-ast', nargs='?', const='text', choices=AST_DUMP_FORMATS, metavar='FORMAT',
+                        help='отладка: сохранять Python AST модулей в кэш в формате text (по умолчанию) '
+                             'или compact')
+    parser.add_argument('--dump-ast-module', action='append', default=[], metavar='PATTERN',
+                        help='отладка: сохранять AST только модулей, полное имя которых подходит под шаблон '
+                             '(например, pkg.*); можно указать несколько раз')
+    parser.add_argument('--watch', action='store_true',
+                        help='отслеживать изменения файлов и транспилировать затронутые модули')
+    parser.add_argument('--serve', action='store_true',
+                        help='запустить сервер транспиляции, принимающий запросы через Unix-сокет')
+    parser.add_argument('--connect', action='store_true',
+                        help='транспилировать файл запущенным сервером, без сервера — в текущем процессе')
+    parser.add_argument('--socket', default=server.DEFAULT_SOCKET_PATH, help='путь к сокету сервера транспиляции')
+    parsed_args = parser.parse_args(args)
+    if not parsed_args.source and not parsed_args.serve:
+        parser.error('не указаны транспилируемые файлы')
+    return parsed_args
 
 
 def main():
-    source_name = sys.argv[1]
-    project = Project()
-    project.transpile_file(source_name)
+    args = parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    project = Project(incremental=args.incremental, jobs=args.jobs, source_maps=args.source_maps,
+                      minify=args.minify, tree_shaking=args.tree_shaking, profile=bool(args.profile_report),
+                      ast_dump=get_ast_dump_options(args), out_dir=args.out_dir, cache_dir=args.cache_dir)
+    is_batch = len(args.source) > 1 or os.path.isdir(args.source[0])
+    if is_batch:
+        for option, is_set in (('--watch', args.watch), ('--bundle', args.bundle), ('--connect', args.connect)):
+            if is_set:
+                raise SystemExit(f'Режим {option} поддерживает только один транспилируемый файл')
+    if args.watch:
+        watch(project, args.source[0])
+    elif is_batch:
+        print_entry_summaries(project.transpile_files(args.source))
+    elif args.bundle:
+        project.transpile_bundle(args.source[0])
+    elif args.connect:
+        server.transpile_file(args.source[0], args.socket, project)
+    else:
+        project.transpile_file(args.source[0])
+
+    if args.profile_report:
+        project.save_profile_report(args.profile_report, trace=args.profile_format == 'trace')
+
+
+def get_ast_dump_options(args: argparse.Namespace) -> AstDumpOptions | None:
+    if args.dump_ast is None:
+        if args.dump_ast_module:
+            raise SystemExit('Параметр --dump-ast-module используется только вместе с --dump-ast')
+        return None
+    return AstDumpOptions(format=args.dump_ast, modules=args.dump_ast_module)
+
+
+def serve(args: argparse.Namespace):
+    if args.profile_report:
+        raise SystemExit('Параметр --profile-report не поддерживается вместе с --serve')
+    transpile_server = server.TranspileServer(args.socket, incremental=args.incremental, jobs=args.jobs,
+                                              source_maps=args.source_maps, minify=args.minify,
+                                              tree_shaking=args.tree_shaking, ast_dump=get_ast_dump_options(args),
+                                              out_dir=args.out_dir, cache_dir=args.cache_dir)
+    print(f'Сервер транспиляции запущен: {args.socket}')
+    try:
+        transpile_server.serve()
+    except KeyboardInterrupt:
+        transpile_server.server_close()
+
+
+def print_entry_summaries(entry_summaries: list[EntrySummary]):
+    for entry_summary in entry_summaries:
+        print(f'{entry_summary.module_path.full_path} -> {entry_summary.target_file_name} '
+              f'(модулей: {len(entry_summary.modules)})')
+
+
+def print_rebuilt_modules(module_paths: list[ModulePath]):
+    if module_paths:
+        print('Транспилированы модули:', ', '.join(module_path.full_path for module_path in module_paths))
+
+
+def watch(project: Project, source: str):
+    watcher = Watcher(project, source, on_rebuild=print_rebuilt_modules)
+    try:
+        watcher.start()
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == '__main__':
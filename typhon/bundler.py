@@ -0,0 +1,97 @@
+from typing import Iterable, TextIO
+
+from typhon import js_ast
+from typhon.exceptions import TyphonImportError
+from typhon.generator import CodeWriter, write_code_block, write_js_body, write_js_export
+from typhon.types import ModulePath
+
+
+def find_module_path(module_name: str, module_paths: Iterable[ModulePath]) -> ModulePath | None:
+    """Путь к модулю проекта по имени модуля в инструкции импорта"""
+    module_parts = module_name.split('.')
+    for module_path in (
+        ModulePath(*module_parts),
+        ModulePath(*module_parts, '__init__'),
+        ModulePath(module_parts[-1], '__init__'),
+    ):
+        if module_path in module_paths:
+            return module_path
+    return None
+
+
+def get_module_variable(module_path: ModulePath) -> str:
+    """Имя переменной, в которой хранятся экспортируемые объекты модуля в сборке"""
+    return '__ty$' + '$'.join(module_path.module_path)
+
+
+class Bundler:
+    """Класс `Bundler` объединяет модули проекта в один ES-модуль:
+        - Модули записываются в порядке зависимостей, каждый в собственной области видимости
+        - Экспортируемые объекты модуля возвращаются из его области видимости и сохраняются в переменной модуля
+        - Импорты заменяются обращениями к переменным импортируемых модулей
+        - Главный модуль записывается последним, без собственной области видимости, и сохраняет свой экспорт
+    """
+    def __init__(self, modules: list[ModulePath], js_trees: dict[ModulePath, js_ast.JSModule],
+                 main_module_path: ModulePath):
+        self.modules = modules
+        self.js_trees = js_trees
+        self.main_module_path = main_module_path
+
+    def write(self, stream: TextIO = None, minify: bool = False) -> CodeWriter:
+        writer = CodeWriter(stream, minify=minify)
+        for module_path in self.modules:
+            if module_path != self.main_module_path:
+                self.write_module(writer, module_path)
+                writer.write(writer.newline)
+
+        main_tree = self.js_trees[self.main_module_path]
+        if main_tree.export:
+            write_js_export(writer, main_tree.export)
+            writer.write(writer.newline)
+        write_js_body(writer, self.get_body(main_tree))
+        return writer
+
+    def write_module(self, writer: CodeWriter, module_path: ModulePath):
+        js_tree = self.js_trees[module_path]
+        exported_names = js_tree.export.ids if js_tree.export else []
+        body = self.get_body(js_tree) + [js_ast.JSReturn(js_ast.JSDict(
+            keys=[js_ast.JSConstant(name) for name in exported_names],
+            values=[js_ast.JSName(name) for name in exported_names],
+        ))]
+
+        space = writer.space
+        writer.write(f'const {get_module_variable(module_path)}{space}={space}(function{space}(){space}')
+        write_code_block(writer, body)
+        writer.write(')();')
+
+    def get_body(self, js_tree: js_ast.JSModule) -> list[js_ast.JSStatement]:
+        """Тело модуля, в котором импорты заменены присваиваниями объектов импортируемых модулей"""
+        body = []
+        for node in js_tree.body:
+            if isinstance(node, js_ast.JSImport):
+                body.extend(self.convert_import(node))
+            else:
+                body.append(node)
+        return body
+
+    def convert_import(self, node: js_ast.JSImport) -> list[js_ast.JSStatement]:
+        module_variable = js_ast.JSName(get_module_variable(self.find_module(node.module)))
+        if not node.names:
+            return [js_ast.copy_position(self.create_let(node.alias or node.module, module_variable), node)]
+
+        return [
+            js_ast.copy_position(
+                self.create_let(alias.asname or alias.name, js_ast.JSAttribute(module_variable, alias.name)), node
+            )
+            for alias in node.names
+        ]
+
+    @staticmethod
+    def create_let(name: str, value: js_ast.JSExpression) -> js_ast.JSLet:
+        return js_ast.JSLet(js_ast.JSAssign(js_ast.JSName(name), value))
+
+    def find_module(self, module_name: str) -> ModulePath:
+        module_path = find_module_path(module_name, self.js_trees)
+        if module_path is None:
+            raise TyphonImportError(f'Module {module_name} is not found in the bundle')
+        return module_path
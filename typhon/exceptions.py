@@ -31,3 +31,7 @@ class UnsupportedNode(Exception):
 
 class TyphonImportError(Exception):
     pass
+
+
+class TranspileServerError(Exception):
+    pass
@@ -0,0 +1,102 @@
+import os
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+from typhon.profiler import Profiler
+
+# Размер блока, которыми временный файл сравнивается с целевым
+COMPARE_CHUNK_SIZE = 64 * 1024
+
+
+class FileWriter:
+    """Класс `FileWriter` сохраняет выходные файлы сборки:
+        - Файл записывается, только если его содержимое изменилось, поэтому время изменения файлов,
+          которые сборка не меняет, сохраняется
+        - Запись атомарная: содержимое пишется во временный файл в той же директории, который затем
+          переименовывается в целевой
+        - Генерируемый код записывается потоком (`open`) сразу во временный файл, без сборки в памяти,
+          и сравнивается с целевым файлом после записи
+        - Директории, созданные или проверенные за сборку, запоминаются и повторно не проверяются
+
+    Количество записанных и пропущенных файлов учитывается в `profiler`.
+    """
+    def __init__(self, profiler: Profiler = None):
+        self.profiler = profiler or Profiler(enabled=False)
+        self.directories: set[str] = set()
+
+    def make_directory(self, directory: str) -> bool:
+        """Создание директории. Возвращает `True` при первом обращении к директории за сборку"""
+        if directory in self.directories:
+            return False
+        os.makedirs(directory, exist_ok=True)
+        self.directories.add(directory)
+        return True
+
+    def write(self, file_name: str, content: str | bytes) -> bool:
+        """Запись файла, если его содержимое отличается от `content`. Возвращает признак записи"""
+        mode = 'b' if isinstance(content, bytes) else ''
+        if self.read(file_name, mode) == content:
+            self.profiler.count('skipped_write_count')
+            return False
+
+        temp_file_name = self.get_temp_file_name(file_name)
+        try:
+            with open(temp_file_name, 'w' + mode) as f:
+                f.write(content)
+            os.replace(temp_file_name, file_name)
+        except BaseException:
+            self.remove(temp_file_name)
+            raise
+        self.profiler.count('write_count')
+        return True
+
+    @contextmanager
+    def open(self, file_name: str) -> Iterator[TextIO]:
+        """
+        Текстовый поток для записи файла. Содержимое пишется во временный файл, который после закрытия потока
+        заменяет целевой файл, только если отличается от него, иначе удаляется
+        """
+        temp_file_name = self.get_temp_file_name(file_name)
+        try:
+            with open(temp_file_name, 'w') as f:
+                yield f
+            is_changed = not self.is_same_file_content(temp_file_name, file_name)
+            if is_changed:
+                os.replace(temp_file_name, file_name)
+        finally:
+            self.remove(temp_file_name)
+        self.profiler.count('write_count' if is_changed else 'skipped_write_count')
+
+    @staticmethod
+    def get_temp_file_name(file_name: str) -> str:
+        directory, base_name = os.path.split(file_name)
+        return os.path.join(directory, f'.{base_name}.{os.getpid()}.tmp')
+
+    @staticmethod
+    def is_same_file_content(file_name_1: str, file_name_2: str) -> bool:
+        """Сравнение содержимого файлов: сначала по размеру, затем по блокам"""
+        try:
+            if os.path.getsize(file_name_1) != os.path.getsize(file_name_2):
+                return False
+            with open(file_name_1, 'rb') as f1, open(file_name_2, 'rb') as f2:
+                while True:
+                    chunk = f1.read(COMPARE_CHUNK_SIZE)
+                    if chunk != f2.read(COMPARE_CHUNK_SIZE):
+                        return False
+                    if not chunk:
+                        return True
+        except (FileNotFoundError, IsADirectoryError):
+            return False
+
+    @staticmethod
+    def remove(file_name: str):
+        if os.path.exists(file_name):
+            os.unlink(file_name)
+
+    @staticmethod
+    def read(file_name: str, mode: str) -> str | bytes | None:
+        try:
+            with open(file_name, 'r' + mode) as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError, UnicodeDecodeError):
+            return None
@@ -1,34 +1,113 @@
+import io
 from itertools import chain, repeat
-from typing import Iterable, Callable, Type, Dict
+from typing import Iterable, Callable, Type, Dict, TextIO, Any
 
 from typhon import js_ast
 from typhon.exceptions import UnsupportedNode
 from typhon.js_ast import JSExpression
-
-
-def generate_js_bin_op(node: js_ast.JSExpression) -> str:
+from typhon.minifier import get_short_local_names
+from typhon.source_map import SourceMap
+
+
+class CodeWriter:
+    """Класс `CodeWriter` — контекст генерации кода:
+        - Фрагменты дописываются в поток (`io.StringIO` или открытый файл) без повторного копирования
+          вложенных блоков, поэтому время генерации линейно зависит от размера кода
+        - При записи в файл в памяти не накапливается весь сгенерированный код
+        - Хранит текущий отступ и параметры генерации
+
+    Всё состояние генерации находится в контексте, поэтому модули можно генерировать одновременно в разных потоках.
+
+    При `minify=True` код генерируется без отступов, переводов строк и необязательных пробелов,
+    а локальные переменные функций получают короткие имена (`names`).
+    """
+    def __init__(self, stream: TextIO = None, indent_size: int = 4, minify: bool = False):
+        self.stream = stream if stream is not None else io.StringIO()
+        self.write = self.stream.write
+        self.indent = 0
+        self.indent_size = 0 if minify else indent_size
+        self.minify = minify
+        self.space = '' if minify else ' '
+        self.comma = ',' if minify else ', '
+        self.newline = '' if minify else '\n'
+        self.names: dict[str, str] = {}
+        self.source_map: SourceMap | None = None
+
+    def write_indent(self):
+        if self.indent and self.indent_size:
+            self.write(self.get_indent_str())
+
+    def get_indent_str(self) -> str:
+        return self.indent * self.indent_size * ' '
+
+    def getvalue(self) -> str:
+        return self.stream.getvalue()
+
+
+class SourceMapWriter(CodeWriter):
+    """Контекст генерации, который отслеживает текущую позицию в js-коде и записывает в `source_map`
+    соответствие позиции каждого оператора его позиции в исходном коде Python"""
+    def __init__(self, source_map: SourceMap, stream: TextIO = None, indent_size: int = 4, minify: bool = False):
+        super().__init__(stream, indent_size, minify)
+        self.source_map = source_map
+        self.write = self.write_tracking_position
+        self.line = 0
+        self.column = 0
+
+    def write_tracking_position(self, code: str):
+        self.stream.write(code)
+        line_count = code.count('\n')
+        if line_count:
+            self.line += line_count
+            self.column = len(code) - code.rfind('\n') - 1
+        else:
+            self.column += len(code)
+
+    def add_mapping(self, node: js_ast.JSNode):
+        self.source_map.add_mapping(self.line, self.column, node.lineno - 1, node.col_offset)
+
+
+def generate_with_writer(writer_function: Callable[[CodeWriter, Any], Any], node: Any) -> str:
+    """Генерация кода узла в строку"""
+    writer = CodeWriter()
+    writer_function(writer, node)
+    return writer.getvalue()
+
+
+def write_js_bin_op(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSBinOp)
-    left = generate_js_expression(node.left)
-    right = generate_js_expression(node.right)
     op = '+' if isinstance(node.op, js_ast.JSAdd) else ''
-    return f'{left} {op} {right}'
+    write_js_expression(writer, node.left)
+    writer.write(f'{writer.space}{op}{writer.space}')
+    write_js_expression(writer, node.right)
 
 
-def generate_js_keyword(node: js_ast.JSKeyWord) -> str:
-    return f'{node.arg}={generate_js_expression(node.value)}'
+def write_js_keyword(writer: CodeWriter, node: js_ast.JSKeyWord):
+    writer.write(f'{node.arg}=')
+    write_js_expression(writer, node.value)
 
 
-def generate_js_call(node: js_ast.JSExpression) -> str:
-    assert isinstance(node, js_ast.JSCall)
-    args_str = generate_expression_list(node.args)
-    args_str += [generate_js_keyword(keyword) for keyword in node.keywords]
+def write_call_arguments(writer: CodeWriter, args: list[js_ast.JSExpression] | None,
+                         keywords: list[js_ast.JSKeyWord] | None):
+    writer.write('(')
+    is_written = write_expression_list(writer, args)
+    for keyword in keywords or []:
+        if is_written:
+            writer.write(writer.comma)
+        write_js_keyword(writer, keyword)
+        is_written = True
+    writer.write(')')
 
-    return f'{generate_js_expression(node.func)}({", ".join(args_str)})'
 
+def write_js_call(writer: CodeWriter, node: js_ast.JSExpression):
+    assert isinstance(node, js_ast.JSCall)
+    write_js_expression(writer, node.func)
+    write_call_arguments(writer, node.args, node.keywords)
 
-def generate_js_name(node: js_ast.JSExpression):
+
+def write_js_name(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSName)
-    return node.id
+    writer.write(writer.names.get(node.id, node.id) if writer.names else node.id)
 
 
 def generate_js_constant(node: js_ast.JSExpression):
@@ -40,174 +119,220 @@ def generate_js_constant(node: js_ast.JSExpression):
         return 'null'
     elif node.value is True:
         return 'true'
+    elif node.value is False:
+        return 'false'
     return str(node.value)
 
 
-def generate_js_list(node: js_ast.JSExpression) -> str:
+def write_js_constant(writer: CodeWriter, node: js_ast.JSExpression):
+    writer.write(generate_js_constant(node))
+
+
+def write_js_list(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSList)
-    elements = ', '.join(generate_expression_list(node.elts))
-    return f'[{elements}]'
+    writer.write('[')
+    write_expression_list(writer, node.elts)
+    writer.write(']')
 
 
-def generate_expression_list(expr_list: Iterable[js_ast.JSExpression]) -> Iterable[str]:
-    if expr_list is None:
-        return []
-    return [generate_js_expression(element) for element in expr_list]
+def write_expression_list(writer: CodeWriter, expr_list: Iterable[js_ast.JSExpression] | None) -> bool:
+    """Запись выражений через запятую. Возвращает True, если записано хотя бы одно выражение"""
+    is_written = False
+    for element in expr_list or []:
+        if is_written:
+            writer.write(writer.comma)
+        write_js_expression(writer, element)
+        is_written = True
+    return is_written
 
 
-def generate_js_dict(node: js_ast.JSExpression) -> str:
+def write_js_dict(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSDict)
+    writer.write('{')
     if node.keys:
-        named_args_list = [
-            f'{generate_js_expression(key)}: {generate_js_expression(value)}'
-            for key, value in zip(node.keys, node.values)
-        ]
-    else:
-        named_args_list = []
-    named_args_str = ', '.join(named_args_list)
-    return f'{{{named_args_str}}}'
+        for index, (key, value) in enumerate(zip(node.keys, node.values)):
+            if index:
+                writer.write(writer.comma)
+            write_js_expression(writer, key)
+            writer.write(f':{writer.space}')
+            write_js_expression(writer, value)
+    writer.write('}')
 
 
-def generate_js_compare(node: js_ast.JSExpression) -> str:
+def write_js_compare(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSCompare)
-    return f'{generate_js_expression(node.left)} {generate_js_eq(node.op)} {generate_js_expression(node.right)}'
+    write_js_expression(writer, node.left)
+    writer.write(f'{writer.space}{generate_js_eq(node.op)}{writer.space}')
+    write_js_expression(writer, node.right)
 
 
-def generate_js_subscript(node: js_ast.JSExpression) -> str:
+def write_js_subscript(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSSubscript)
-    return f'{generate_js_expression(node.value)}[{generate_js_expression(node.slice)}]'
+    write_js_expression(writer, node.value)
+    writer.write('[')
+    write_js_expression(writer, node.slice)
+    writer.write(']')
 
 
-def generate_js_attribute(node: js_ast.JSExpression) -> str:
+def write_js_attribute(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSAttribute)
-    return f'{generate_js_name(node.value)}.{node.attr}'
+    write_js_name(writer, node.value)
+    writer.write(f'.{node.attr}')
 
 
-def generate_js_new(node: js_ast.JSExpression) -> str:
+def write_js_new(writer: CodeWriter, node: js_ast.JSExpression):
     assert isinstance(node, js_ast.JSNew)
-    args_str = generate_expression_list(node.args)
-    args_str += [generate_js_keyword(keyword) for keyword in node.keywords]
-
-    return f'new {generate_js_expression(node.class_)}({", ".join(args_str)})'
-
-
-EXPRESSION_GENERATOR_FUNCTIONS: Dict[Type[JSExpression], Callable[[JSExpression], str]] = {
-    js_ast.JSBinOp: generate_js_bin_op,
-    js_ast.JSCall: generate_js_call,
-    js_ast.JSName: generate_js_name,
-    js_ast.JSConstant: generate_js_constant,
-    js_ast.JSList: generate_js_list,
-    js_ast.JSDict: generate_js_dict,
-    js_ast.JSCompare: generate_js_compare,
-    js_ast.JSSubscript: generate_js_subscript,
-    js_ast.JSAttribute: generate_js_attribute,
-    js_ast.JSNew: generate_js_new,
+    writer.write('new ')
+    write_js_expression(writer, node.class_)
+    write_call_arguments(writer, node.args, node.keywords)
+
+
+EXPRESSION_WRITER_FUNCTIONS: Dict[Type[JSExpression], Callable[[CodeWriter, JSExpression], None]] = {
+    js_ast.JSBinOp: write_js_bin_op,
+    js_ast.JSCall: write_js_call,
+    js_ast.JSName: write_js_name,
+    js_ast.JSConstant: write_js_constant,
+    js_ast.JSList: write_js_list,
+    js_ast.JSDict: write_js_dict,
+    js_ast.JSCompare: write_js_compare,
+    js_ast.JSSubscript: write_js_subscript,
+    js_ast.JSAttribute: write_js_attribute,
+    js_ast.JSNew: write_js_new,
 }
 
 
-def generate_js_expression(node: js_ast.JSExpression) -> str:
+def write_js_expression(writer: CodeWriter, node: js_ast.JSExpression):
     """Генерация выражений"""
     node_type: Type[JSExpression] = type(node)
-    generator_function: Callable | None = EXPRESSION_GENERATOR_FUNCTIONS.get(node_type)
-    if not generator_function:
+    writer_function: Callable | None = EXPRESSION_WRITER_FUNCTIONS.get(node_type)
+    if not writer_function:
         raise UnsupportedNode(f'Node {type(node).__name__} not supported yet')
 
-    return generator_function(node)
+    writer_function(writer, node)
 
 
-def generate_js_assign(node: js_ast.JSStatement) -> str:
+def write_js_assign(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSAssign)
-    return f'{generate_js_expression(node.target)} = {generate_js_expression(node.value)};'
+    write_js_expression(writer, node.target)
+    writer.write(f'{writer.space}={writer.space}')
+    write_js_expression(writer, node.value)
+    writer.write(';')
 
 
-def generate_js_code_expression(node: js_ast.JSStatement) -> str:
+def write_js_code_expression(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSCodeExpression)
-    return generate_js_expression(node.value) + ';'
+    write_js_expression(writer, node.value)
+    writer.write(';')
 
 
-def generate_js_return(node: js_ast.JSStatement) -> str:
+def write_js_return(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSReturn)
-    return f'return {generate_js_expression(node.value)};'
+    writer.write('return ')
+    write_js_expression(writer, node.value)
+    writer.write(';')
 
 
-def generate_js_function_def(node: js_ast.JSStatement) -> str:
+def write_js_function_def(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSFunctionDef)
-    code_block = generate_code_block(node.body)
-    return f'function {node.name}({generate_js_arguments(node.args)}) {code_block}'
+    writer.write(f'function {node.name}')
+    write_function(writer, node)
 
 
-def generate_js_method_def(node: js_ast.JSStatement) -> str:
+def write_js_method_def(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSFunctionDef)
-    code_block = generate_code_block(node.body)
-    return f'{node.name}({generate_js_arguments(node.args)}) {code_block}'
-
+    writer.write(node.name)
+    write_function(writer, node)
 
-def generate_js_while(node: js_ast.JSStatement) -> str:
-    assert isinstance(node, js_ast.JSWhile)
-    test_str = generate_js_expression(node.test)
-    while_body = generate_code_block(node.body)
-    else_body = ''
-    if node.orelse:
-        else_body = ' else ' + generate_code_block(node.orelse)
-    return f'while {test_str} {while_body}{else_body}'
 
+def write_function(writer: CodeWriter, node: js_ast.JSFunctionDef):
+    """Запись аргументов и тела функции. При минификации локальные переменные функции переименовываются"""
+    names = writer.names
+    if writer.minify:
+        writer.names = get_short_local_names(node)
+    try:
+        writer.write('(')
+        write_js_arguments(writer, node.args)
+        writer.write(f'){writer.space}')
+        write_code_block(writer, node.body)
+    finally:
+        writer.names = names
 
-code_block_indent = 0
 
+def write_js_while(writer: CodeWriter, node: js_ast.JSStatement):
+    assert isinstance(node, js_ast.JSWhile)
+    writer.write('while ')
+    write_js_expression(writer, node.test)
+    writer.write(writer.space)
+    write_code_block(writer, node.body)
+    if node.orelse:
+        writer.write(f'{writer.space}else{writer.space}')
+        write_code_block(writer, node.orelse)
 
-def generate_code_block(body: Iterable[js_ast.JSStatement]) -> str:
-    global code_block_indent
 
-    code_block_indent += 1
+def write_code_block(writer: CodeWriter, body: Iterable[js_ast.JSStatement]):
+    writer.write('{' + writer.newline)
+    writer.indent += 1
     try:
-        js_body_str = generate_js_body(body)
+        is_written = write_js_body(writer, body)
     finally:
-        code_block_indent -= 1
-    if js_body_str:
-        js_body_str += '\n'
-    return '{\n' + js_body_str + get_indent_str() + '}'
+        writer.indent -= 1
+    if is_written:
+        writer.write(writer.newline)
+    writer.write_indent()
+    writer.write('}')
 
 
-def generate_js_if(node: js_ast.JSStatement) -> str:
+def write_js_if(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSIf)
-    if_str = f'if ({generate_js_expression(node.test)}) {generate_code_block(node.body)}'
-    else_str = f' else {generate_code_block(node.orelse)}' if node.orelse else ''
-    return if_str + else_str
+    writer.write(f'if{writer.space}(')
+    write_js_expression(writer, node.test)
+    writer.write(f'){writer.space}')
+    write_code_block(writer, node.body)
+    if node.orelse:
+        writer.write(f'{writer.space}else{writer.space}')
+        write_code_block(writer, node.orelse)
 
 
-def generate_js_throw(node: js_ast.JSStatement) -> str:
+def write_js_throw(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSThrow)
-    return f'throw {generate_js_expression(node.exc)};'
+    writer.write('throw ')
+    write_js_expression(writer, node.exc)
+    writer.write(';')
 
 
-def generate_js_try(node: js_ast.JSStatement) -> str:
+def write_js_try(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSTry)
-    try_str = f'try {generate_code_block(node.body)}'
-    catch_str = f' catch (e) {generate_code_block(node.catch)}'
-    finally_str = ''
+    space = writer.space
+    writer.write(f'try{space}')
+    write_code_block(writer, node.body)
+    writer.write(f'{space}catch{space}(e){space}')
+    write_code_block(writer, node.catch)
     if node.finalbody:
-        finally_str = f' finally {generate_code_block(node.finalbody)}'
-    return try_str + catch_str + finally_str
+        writer.write(f'{space}finally{space}')
+        write_code_block(writer, node.finalbody)
 
 
-def generate_js_continue(node: js_ast.JSStatement) -> str:
+def write_js_continue(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSContinue)
-    return 'continue;'
+    writer.write('continue;')
 
 
-def generate_js_break(node: js_ast.JSStatement) -> str:
+def write_js_break(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSBreak)
-    return 'break;'
+    writer.write('break;')
 
 
-def generate_js_delete(node: js_ast.JSStatement) -> str:
+def write_js_delete(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSDelete)
-    return f'delete {generate_js_expression(node.target)};'
+    writer.write('delete ')
+    write_js_expression(writer, node.target)
+    writer.write(';')
 
 
-def generate_js_let(node: js_ast.JSStatement) -> str:
+def write_js_let(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSLet)
-    return f'let {generate_js_assign(node.assign)}'
+    writer.write('let ')
+    write_js_assign(writer, node.assign)
 
 
 def generate_alias(node: js_ast.JSAlias) -> str:
@@ -217,98 +342,122 @@ def generate_alias(node: js_ast.JSAlias) -> str:
     return f'{node.name} as {node.asname}'
 
 
-def generate_js_import(node: js_ast.JSStatement) -> str:
+def write_js_import(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSImport)
+    space = writer.space
     if node.names:
         import_names = [generate_alias(alias) for alias in node.names]
-        import_names_str = '{' + ', '.join(import_names) + '}'
+        import_names_str = f'import{space}{{{writer.comma.join(import_names)}}}{space}'
     else:
         asname = node.alias or node.module
-        import_names_str = f'* as {asname}'
-    return f"import {import_names_str} from './{node.module}.js';"
+        import_names_str = f'import * as {asname} '
+    import_path = node.path or f'./{node.module}.js'
+    writer.write(f"{import_names_str}from{space}'{import_path}';")
 
 
-def generate_js_class_def(node: js_ast.JSStatement) -> str:
+def write_js_class_def(writer: CodeWriter, node: js_ast.JSStatement):
     assert isinstance(node, js_ast.JSClassDef)
-    return f'class {node.name} {generate_code_block(node.body)}'
-
-
-STATEMENT_GENERATOR_FUNCTIONS: dict[type[js_ast.JSStatement], Callable[[js_ast.JSStatement], str]] = {
-    js_ast.JSAssign: generate_js_assign,
-    js_ast.JSCodeExpression: generate_js_code_expression,
-    js_ast.JSReturn: generate_js_return,
-    js_ast.JSFunctionDef: generate_js_function_def,
-    js_ast.JSMethodDef: generate_js_method_def,
-    js_ast.JSWhile: generate_js_while,
-    js_ast.JSIf: generate_js_if,
-    js_ast.JSThrow: generate_js_throw,
-    js_ast.JSTry: generate_js_try,
-    js_ast.JSContinue: generate_js_continue,
-    js_ast.JSBreak: generate_js_break,
-    js_ast.JSDelete: generate_js_delete,
-    js_ast.JSLet: generate_js_let,
-    js_ast.JSImport: generate_js_import,
-    js_ast.JSClassDef: generate_js_class_def,
+    writer.write(f'class {node.name}{writer.space}')
+    write_code_block(writer, node.body)
+
+
+STATEMENT_WRITER_FUNCTIONS: dict[type[js_ast.JSStatement], Callable[[CodeWriter, js_ast.JSStatement], None]] = {
+    js_ast.JSAssign: write_js_assign,
+    js_ast.JSCodeExpression: write_js_code_expression,
+    js_ast.JSReturn: write_js_return,
+    js_ast.JSFunctionDef: write_js_function_def,
+    js_ast.JSMethodDef: write_js_method_def,
+    js_ast.JSWhile: write_js_while,
+    js_ast.JSIf: write_js_if,
+    js_ast.JSThrow: write_js_throw,
+    js_ast.JSTry: write_js_try,
+    js_ast.JSContinue: write_js_continue,
+    js_ast.JSBreak: write_js_break,
+    js_ast.JSDelete: write_js_delete,
+    js_ast.JSLet: write_js_let,
+    js_ast.JSImport: write_js_import,
+    js_ast.JSClassDef: write_js_class_def,
 }
 
 
-def get_indent_str() -> str:
-    return code_block_indent * 4 * ' '
-
-
-def generate_js_statement(node: js_ast.JSStatement) -> str:
+def write_js_statement(writer: CodeWriter, node: js_ast.JSStatement):
     """Генерация операторов"""
-    generator_function = STATEMENT_GENERATOR_FUNCTIONS.get(type(node), None)
-    if not generator_function:
+    writer_function = STATEMENT_WRITER_FUNCTIONS.get(type(node), None)
+    if not writer_function:
         raise UnsupportedNode(f'Node {type(node).__name__} not supported yet')
 
-    return get_indent_str() + generator_function(node)
+    writer.write_indent()
+    if writer.source_map is not None and node.lineno is not None:
+        writer.add_mapping(node)
+    writer_function(writer, node)
 
 
-def generate_js_arg(node: js_ast.JSArg) -> str:
-    return node.arg
+def write_js_arg(writer: CodeWriter, node: js_ast.JSArg):
+    writer.write(writer.names.get(node.arg, node.arg) if writer.names else node.arg)
 
 
-def generate_js_arguments(node: js_ast.JSArguments) -> str:
+def write_js_arguments(writer: CodeWriter, node: js_ast.JSArguments):
     """Генерация аргументов функций"""
     class Empty:
         pass
 
-    args = []
     node_args = node.args or []
     defaults = node.defaults or []
     args_without_values = len(node_args) - len(defaults)
+    is_written = False
 
     for arg, value in zip(node_args, chain(repeat(Empty, args_without_values), defaults)):
-        arg_str = generate_js_arg(arg)
+        if is_written:
+            writer.write(writer.comma)
+        write_js_arg(writer, arg)
         if value != Empty:
-            arg_str = f'{arg_str}={generate_js_expression(value)}'
-        args.append(arg_str)
+            writer.write('=')
+            write_js_expression(writer, value)
+        is_written = True
     if node.kwarg:
-        args.append(generate_js_arg(node.kwarg))
+        if is_written:
+            writer.write(writer.comma)
+        write_js_arg(writer, node.kwarg)
+        is_written = True
     if node.vararg:
-        args.append('...' + generate_js_arg(node.vararg))
+        if is_written:
+            writer.write(writer.comma)
+        writer.write('...')
+        write_js_arg(writer, node.vararg)
 
-    return ', '.join(args)
 
-
-def generate_js_body(nodes: Iterable[js_ast.JSStatement]) -> str:
-    result = [generate_js_statement(node) for node in nodes if not isinstance(node, js_ast.JSNop)]
-    return '\n'.join(result)
+def write_js_body(writer: CodeWriter, nodes: Iterable[js_ast.JSStatement]) -> bool:
+    """Запись операторов, разделённых переводом строки. Возвращает True, если записан хотя бы один оператор"""
+    is_written = False
+    for node in nodes:
+        if isinstance(node, js_ast.JSNop):
+            continue
+        if is_written:
+            writer.write(writer.newline)
+        write_js_statement(writer, node)
+        is_written = True
+    return is_written
 
 
 def generate_js_eq(node: js_ast.JSEq) -> str:
     return '==='
 
 
-def generate_js_module(node: js_ast.JSModule) -> str:
+def write_js_module(writer: CodeWriter, node: js_ast.JSModule):
     """Генерация модуля"""
-    result = ''
     if node.export:
-        result = generate_js_export(node.export) + '\n\n'
-    return result + generate_js_body(node.body)
+        write_js_export(writer, node.export)
+        writer.write(writer.newline * 2)
+    write_js_body(writer, node.body)
 
 
-def generate_js_export(node: js_ast.JSExport) -> str:
-    ids_str = ', '.join(node.ids)
-    return f'export {{{ids_str}}};'
+def write_js_export(writer: CodeWriter, node: js_ast.JSExport):
+    writer.write(f'export{writer.space}{{{writer.comma.join(node.ids)}}};')
+
+
+def generate_js_body(nodes: Iterable[js_ast.JSStatement]) -> str:
+    return generate_with_writer(write_js_body, nodes)
+
+
+def generate_js_module(node: js_ast.JSModule) -> str:
+    return generate_with_writer(write_js_module, node)
@@ -1,9 +1,12 @@
 import ast
 from _ast import Import, AST, ImportFrom
+from collections import deque
 from typing import Any
 
 from typhon.exceptions import TyphonImportError
-from typhon.module import Module
+from typhon.module_cache import ModuleCache
+from typhon.module_store import ModuleStore
+from typhon.profiler import Profiler
 from typhon.source_manager import SourceManager
 from typhon.types import ModulePath
 
@@ -48,42 +51,76 @@ class ImportGraph:
         - Сбор импортов из исходного кода
         - Построение графа зависимостей
         - Обнаружение циклических импортов
+        - Сортировка модулей в порядке зависимостей
     """
-    def __init__(self, source: str, source_manager: SourceManager, main_module_name: str):
+    def __init__(self, source: str | None, source_manager: SourceManager, main_module_name: str | None,
+                 module_store: ModuleStore = None, module_cache: ModuleCache = None,
+                 entry_module_paths: list[ModulePath] = None, profiler: Profiler = None):
+        """
+        Граф строится от главного модуля `main_module_name` с исходным кодом `source`
+        либо, если переданы `entry_module_paths`, от нескольких модулей проекта сразу.
+        Время построения графа и сортировки модулей учитывается в `profiler`.
+        """
         self.source = source
-        self.graph = {}
-        self.queue = []
+        self.graph: dict[ModulePath, list[ModulePath]] = {}
+        self.queue = deque()
+        self.sorted_modules: list[ModulePath] = []
+        self.cycles: list[list[ModulePath]] = []
         self.source_manager = source_manager
         self.main_module_name = main_module_name
+        self.module_store = module_store or ModuleStore(source_manager)
+        self.module_cache = module_cache
+        if entry_module_paths is None:
+            entry_module_paths = [ModulePath(main_module_name)]
+        self.entry_module_paths = entry_module_paths
+        self.profiler = profiler or Profiler(enabled=False)
+
+    def get_graph(self) -> dict[ModulePath, list[ModulePath]]:
+        with self.profiler.phase('build_import_graph'):
+            self.graph = self.build_graph()
+        with self.profiler.phase('sort_modules'):
+            self.sorted_modules, self.cycles = sort_modules(self.graph, *self.entry_module_paths)
+        self.detect_loop()
+
+        return self.graph
 
-    def get_graph(self) -> dict:
+    def build_graph(self) -> dict[ModulePath, list[ModulePath]]:
         self.graph = {}
-        self.queue = []
-        self.get_imports_and_add_to_queue(ModulePath(self.main_module_name), self.source)
+        self.queue = deque(self.entry_module_paths)
+        if self.source is not None and self.main_module_name:
+            main_module_path = ModulePath(self.main_module_name)
+            if main_module_path not in self.module_store.modules:
+                self.module_store.add_source(main_module_path, self.source)
 
         while self.queue:
-            module_path = self.queue.pop(0)
-            if module_path.module_path in self.graph:
+            module_path = self.queue.popleft()
+            if module_path in self.graph:
                 continue
 
-            source = self.get_module_source(module_path)
-            self.get_imports_and_add_to_queue(module_path, source)
-
-        self.detect_loop()
+            self.get_imports_and_add_to_queue(module_path)
 
         return self.graph
 
     def get_module_source(self, module_path: ModulePath):
-        module = Module(module_path, self.source_manager)
-        return module.get_source()
-
-    def get_imports_and_add_to_queue(self, module_path: ModulePath, source):
-        imports = self.get_imports(source)
-        self.graph[module_path.module_path] = imports
+        return self.module_store.get(module_path).source
+
+    def get_imports_and_add_to_queue(self, module_path: ModulePath):
+        module_info = self.module_cache.get_info(module_path) if self.module_cache else None
+        if module_info:
+            imports = module_info.imports
+        else:
+            # Модули разбираются при первом обращении, поэтому здесь же учитывается и чтение исходного кода
+            with self.profiler.phase('parse', module_path):
+                py_tree = self.module_store.get(module_path).py_tree
+            with self.profiler.phase('collect_imports', module_path):
+                imports = self.get_tree_imports(py_tree)
+        self.graph[module_path] = imports
         self.queue.extend(imports)
 
-    def get_imports(self, source) -> list[str]:
-        py_ast = ast.parse(source)
+    def get_imports(self, source) -> list[ModulePath]:
+        return self.get_tree_imports(ast.parse(source))
+
+    def get_tree_imports(self, py_ast: ast.Module) -> list[ModulePath]:
         import_collector = ImportCollector()
         import_collector.visit(py_ast)
         imports = []
@@ -95,23 +132,56 @@ class ImportGraph:
         return imports
 
     def detect_loop(self):
-        graph_stack = []
-        checked_modules = []
-
-        def check_loop(module_path: ModulePath):
-            if module_path in checked_modules:
-                return
-
-            if module_path in graph_stack:
-                modules_chain = [f'{module.package}.{module.name}' for module in graph_stack + [module_path]]
-                raise TyphonImportError(
-                    f'There is circular imports detected: {" -> ".join(modules_chain)}'
-                )
-
-            graph_stack.append(module_path)
-            modules = self.graph[module_path.module_path]
-            for imported_module_path in modules:
-                check_loop(imported_module_path)
-            graph_stack.pop()
-
-        check_loop(ModulePath(self.main_module_name))
+        if self.cycles:
+            cycles_str = '; '.join(
+                ' -> '.join(f'{module.package}.{module.name}' for module in cycle) for cycle in self.cycles
+            )
+            raise TyphonImportError(f'There is circular imports detected: {cycles_str}')
+
+
+def sort_modules(graph: dict[ModulePath, list[ModulePath]], *root_module_paths: ModulePath) \
+        -> tuple[list[ModulePath], list[list[ModulePath]]]:
+    """
+    Топологическая сортировка графа импортов и поиск циклов за один обход в глубину (O(V+E)).
+    Возвращает модули, достижимые из корневых модулей, в порядке зависимостей (импортируемые модули
+    перед импортирующими) и все найденные циклы. Каждый цикл представлен цепочкой импортов от корневого модуля.
+    """
+    sorted_modules = []
+    cycles = []
+    checked_modules = set()
+    graph_stack = []
+    stack_modules = set()
+    imports_stack = []
+    root_module_paths = iter(root_module_paths)
+
+    while True:
+        if not imports_stack:
+            root_module_path = next(root_module_paths, None)
+            if root_module_path is None:
+                break
+            if root_module_path not in checked_modules:
+                graph_stack.append(root_module_path)
+                stack_modules.add(root_module_path)
+                imports_stack.append(iter(graph.get(root_module_path, [])))
+            continue
+
+        imported_module_path = next(imports_stack[-1], None)
+        if imported_module_path is None:
+            imports_stack.pop()
+            module_path = graph_stack.pop()
+            stack_modules.remove(module_path)
+            checked_modules.add(module_path)
+            sorted_modules.append(module_path)
+            continue
+
+        if imported_module_path in checked_modules:
+            continue
+        if imported_module_path in stack_modules:
+            cycles.append(graph_stack + [imported_module_path])
+            continue
+
+        graph_stack.append(imported_module_path)
+        stack_modules.add(imported_module_path)
+        imports_stack.append(iter(graph.get(imported_module_path, [])))
+
+    return sorted_modules, cycles
@@ -1,8 +1,16 @@
+import math
+from collections import Counter
 from typing import Optional, List, Union, Any
 
 from typhon import js_ast
+from typhon.js_visitor import JSNodeVisitor, NodeDispatcher
 from typhon.object_collector import ObjectInfo, ObjectConstant, get_object_by_path, ObjectClass
 
+# Наибольшее целое число, которое представимо в JavaScript без потери точности
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+# Более длинные строковые константы не подставляются вместо имени, чтобы не увеличивать размер кода
+MAX_INLINED_STRING_LENGTH = 32
+
 
 def get_attribute_target(from_object: ObjectInfo, node: js_ast.JSAttribute) -> ObjectInfo:
     if isinstance(node.value, js_ast.JSName):
@@ -136,6 +144,123 @@ def get_object_from_node(
 #         # return object_info
 
 
+def fold_bin_op(left: js_ast.JSExpression, op: js_ast.JSOperator,
+                right: js_ast.JSExpression) -> Optional[js_ast.JSConstant]:
+    """Вычисление сложения констант: чисел или строк. Если результат не вычисляется, возвращается None"""
+    if not (isinstance(op, js_ast.JSAdd) and isinstance(left, js_ast.JSConstant)
+            and isinstance(right, js_ast.JSConstant)):
+        return None
+
+    left_value, right_value = left.value, right.value
+    if type(left_value) in (int, float) and type(right_value) in (int, float):
+        value = left_value + right_value
+        if isinstance(value, int) and abs(value) > MAX_SAFE_INTEGER or isinstance(value, float) and not math.isfinite(value):
+            return None
+    elif isinstance(left_value, str) and isinstance(right_value, str):
+        value = left_value + right_value
+    else:
+        return None
+    return js_ast.JSConstant(value)
+
+
+def is_pure_expression(node: js_ast.JSExpression) -> bool:
+    """Вычисление выражения не имеет побочных эффектов"""
+    if isinstance(node, (js_ast.JSConstant, js_ast.JSName)):
+        return True
+    if isinstance(node, js_ast.JSList):
+        return all(is_pure_expression(item) for item in node.elts)
+    if isinstance(node, js_ast.JSDict):
+        return all(is_pure_expression(item) for item in node.keys + node.values)
+    return False
+
+
+def is_inlinable_constant(node: js_ast.JSExpression) -> bool:
+    if not isinstance(node, js_ast.JSConstant):
+        return False
+    if isinstance(node.value, str):
+        return len(node.value) <= MAX_INLINED_STRING_LENGTH
+    return node.value is None or type(node.value) in (bool, int, float)
+
+
+class BoundNamesCollector(JSNodeVisitor):
+    """Класс `BoundNamesCollector` считает, сколько раз каждое имя связывается в модуле:
+    присваивания, аргументы, объявления функций и классов, импорты. Имена, атрибутам которых
+    присваиваются значения, считаются изменяемыми.
+    """
+    def __init__(self):
+        self.bound_names: Counter[str] = Counter()
+        self.mutated_names: set[str] = set()
+
+    def visit_JSAssign(self, node: js_ast.JSAssign):
+        target = node.target
+        if isinstance(target, js_ast.JSName):
+            self.bound_names[target.id] += 1
+        elif isinstance(target, js_ast.JSAttribute) and isinstance(target.value, js_ast.JSName):
+            self.mutated_names.add(target.value.id)
+        elif isinstance(target, js_ast.JSList):
+            for element in target.elts:
+                if isinstance(element, js_ast.JSName):
+                    self.bound_names[element.id] += 1
+        self.visit(node.value)
+
+    def visit_JSArg(self, node: js_ast.JSArg):
+        self.bound_names[node.arg] += 1
+
+    def visit_JSFunctionDef(self, node: js_ast.JSFunctionDef):
+        self.bound_names[node.name] += 1
+        self.generic_visit(node)
+
+    def visit_JSMethodDef(self, node: js_ast.JSMethodDef):
+        self.visit_JSFunctionDef(node)
+
+    def visit_JSClassDef(self, node: js_ast.JSClassDef):
+        self.bound_names[node.name] += 1
+        self.generic_visit(node)
+
+    def visit_JSImport(self, node: js_ast.JSImport):
+        for alias in node.names:
+            self.bound_names[alias.asname or alias.name] += 1
+        if not node.names:
+            self.bound_names[node.alias or node.module] += 1
+
+    def visit_JSDelete(self, node: js_ast.JSDelete):
+        if isinstance(node.target, js_ast.JSName):
+            self.bound_names[node.target.id] += 1
+        self.generic_visit(node)
+
+
+def get_constant_names(body: List[js_ast.JSStatement]) -> set[str]:
+    """
+    Имена модуля, которые связываются один раз — присваиванием на верхнем уровне модуля — и не изменяются.
+    Значения таких имён, если они окажутся константами, можно подставлять вместо обращений к ним.
+    """
+    collector = BoundNamesCollector()
+    for node in body:
+        collector.visit(node)
+
+    return {
+        node.target.id for node in body
+        if isinstance(node, js_ast.JSAssign) and isinstance(node.target, js_ast.JSName)
+        and collector.bound_names[node.target.id] == 1 and node.target.id not in collector.mutated_names
+    }
+
+
+def get_declared_names(body: List[js_ast.JSStatement]) -> set[str]:
+    """Имена, объявленные или импортированные на верхнем уровне тела модуля"""
+    names = set()
+    for node in body:
+        if isinstance(node, (js_ast.JSFunctionDef, js_ast.JSClassDef)):
+            names.add(node.name)
+        elif isinstance(node, js_ast.JSLet) and isinstance(node.assign.target, js_ast.JSName):
+            names.add(node.assign.target.id)
+        elif isinstance(node, js_ast.JSImport):
+            if node.names:
+                names.update(alias.asname or alias.name for alias in node.names)
+            else:
+                names.add(node.alias or node.module)
+    return names
+
+
 def _one_of(*args):
     for item in args:
         if item is not None:
@@ -149,11 +274,128 @@ def _or(item1, item2) -> Any:
     return item2
 
 
-class Transformer:
-    """Базовый класс для преобразования AST JavaScript"""
-    def __init__(self, context_path: List[str], root_object: ObjectInfo):
+TERMINATING_STATEMENTS = (js_ast.JSReturn, js_ast.JSThrow, js_ast.JSBreak, js_ast.JSContinue)
+
+
+def get_constant_test(node: js_ast.JSExpression) -> Optional[bool]:
+    """Значение условия, если оно известно при транспиляции"""
+    if isinstance(node, js_ast.JSConstant):
+        return bool(node.value)
+    return None
+
+
+def has_break(body: List[js_ast.JSStatement]) -> bool:
+    """В блоке есть `break`, относящийся к охватывающему циклу"""
+    for node in body:
+        if isinstance(node, js_ast.JSBreak):
+            return True
+        if isinstance(node, js_ast.JSIf) and (has_break(node.body) or has_break(node.orelse or [])):
+            return True
+        if isinstance(node, js_ast.JSTry) and any(has_break(block or [])
+                                                  for block in (node.body, node.catch, node.finalbody)):
+            return True
+    return False
+
+
+def is_terminating_statement(node: js_ast.JSStatement) -> bool:
+    """После инструкции выполнение блока не продолжается: выход из блока или бесконечный цикл без `break`"""
+    if isinstance(node, TERMINATING_STATEMENTS):
+        return True
+    return isinstance(node, js_ast.JSWhile) and get_constant_test(node.test) is True and not has_break(node.body)
+
+
+def remove_unreachable_statements(body: List[js_ast.JSStatement]) -> List[js_ast.JSStatement]:
+    for index, node in enumerate(body):
+        if is_terminating_statement(node):
+            return body[:index + 1]
+    return body
+
+
+def eliminate_dead_code(body: List[js_ast.JSStatement] | None) -> Optional[List[js_ast.JSStatement]]:
+    """
+    Удаление недостижимого кода из блока без других преобразований: ветвей с постоянным условием
+    и инструкций после выхода из блока. Возвращает None, если блок не изменился.
+    """
+    if not body:
+        return None
+
+    new_body = []
+    for node in body:
+        new_body.extend(eliminate_dead_code_in_statement(node))
+    new_body = remove_unreachable_statements(new_body)
+    if len(new_body) == len(body) and all(new_node is node for new_node, node in zip(new_body, body)):
+        return None
+    return new_body
+
+
+def eliminate_dead_code_in_statement(node: js_ast.JSStatement) -> List[js_ast.JSStatement]:
+    if isinstance(node, (js_ast.JSIf, js_ast.JSWhile)):
+        constant_test = get_constant_test(node.test)
+        if isinstance(node, js_ast.JSIf) and constant_test is not None:
+            branch = (node.body if constant_test else node.orelse) or []
+            return _or(eliminate_dead_code(branch), branch)
+        if isinstance(node, js_ast.JSWhile) and constant_test is False:
+            return _or(eliminate_dead_code(node.orelse), node.orelse or [])
+
+        new_body = eliminate_dead_code(node.body)
+        new_orelse = eliminate_dead_code(node.orelse)
+        if _one_of(new_body, new_orelse):
+            new_node = type(node)(node.test, _or(new_body, node.body), _or(new_orelse, node.orelse))
+            return [js_ast.copy_position(new_node, node)]
+    elif isinstance(node, js_ast.JSTry):
+        new_body = eliminate_dead_code(node.body)
+        new_catch = eliminate_dead_code(node.catch)
+        new_finalbody = eliminate_dead_code(node.finalbody)
+        if _one_of(new_body, new_catch, new_finalbody):
+            new_node = js_ast.JSTry(_or(new_body, node.body), _or(new_catch, node.catch),
+                                    _or(new_finalbody, node.finalbody))
+            return [js_ast.copy_position(new_node, node)]
+    return [node]
+
+
+class NameCounter(JSNodeVisitor):
+    """Подсчёт обращений к именам, включая присваивания"""
+    def __init__(self):
+        self.names: Counter[str] = Counter()
+
+    def visit_JSName(self, node: js_ast.JSName):
+        self.names[node.id.split('.')[0]] += 1
+
+
+def remove_unused_locals(body: List[js_ast.JSStatement]) -> Optional[List[js_ast.JSStatement]]:
+    """
+    Удаление из тела функции объявлений `let` без побочных эффектов, имена которых больше нигде
+    в функции не используются. Возвращает None, если тело не изменилось.
+    """
+    new_body = body
+    while True:
+        counter = NameCounter()
+        for node in new_body:
+            counter.visit(node)
+        used_body = [
+            node for node in new_body
+            if not (isinstance(node, js_ast.JSLet) and isinstance(node.assign.target, js_ast.JSName)
+                    and counter.names[node.assign.target.id] == 1 and is_pure_expression(node.assign.value))
+        ]
+        if len(used_body) == len(new_body):
+            break
+        new_body = used_body
+    return new_body if new_body is not body else None
+
+
+class Transformer(NodeDispatcher):
+    """Базовый класс для преобразования AST JavaScript.
+
+    Сложение констант вычисляется при преобразовании (`fold_bin_op`). Обращения к именам из `constants`
+    заменяются их значениями; словарь общий для модуля и вложенных функций и классов.
+    Ветви `if` и `while` с постоянным условием удаляются или переносятся в охватывающий блок.
+    Узлы, для которых нет обработчика `visit_<имя класса>`, не изменяются (`generic_visit`).
+    """
+    def __init__(self, context_path: List[str], root_object: ObjectInfo,
+                 constants: dict[str, js_ast.JSConstant] = None):
         self.context_path = context_path
         self.root_object = root_object
+        self.constants = constants if constants is not None else {}
         self.context_vars: ObjectInfo = get_object_by_path(root_object, '.'.join(context_path))
         if self.context_vars is None:
             self.context_vars = self.root_object
@@ -165,9 +407,14 @@ class Transformer:
         if isinstance(node, list):
             return self.visit_list(node)
 
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name)
-        return method(node)
+        handler = self._dispatch_table.get(node.__class__) or self.get_handler(node.__class__)
+        new_node = handler(self, node)
+        if isinstance(new_node, js_ast.JSNode) and new_node is not node:
+            js_ast.copy_position(new_node, node)
+        return new_node
+
+    def generic_visit(self, node: js_ast.JSNode) -> None:
+        return None
 
     def visit_list(self, node_list: list[js_ast.JSStatement]) -> Optional[List[js_ast.JSStatement]]:
         new_list = []
@@ -178,6 +425,9 @@ class Transformer:
                 modified = True
                 if isinstance(new_item, js_ast.JSNop):
                     continue
+                if isinstance(new_item, list):
+                    new_list.extend(new_item)
+                    continue
                 new_list.append(new_item)
             else:
                 new_list.append(item)
@@ -241,11 +491,31 @@ class Transformer:
     def visit_JSExpression(self, node: js_ast.JSExpression) -> Optional[js_ast.JSExpression]:
         return None
 
-    def visit_JSBinOp(self, node: js_ast.JSBinOp) -> Optional[js_ast.JSBinOp]:
-        pass
+    def visit_JSBinOp(self, node: js_ast.JSBinOp) -> Optional[js_ast.JSBinOp | js_ast.JSConstant]:
+        new_left = self._visit_operand(node.left)
+        new_right = self._visit_operand(node.right)
+        left = new_left or node.left
+        right = new_right or node.right
+
+        folded_node = fold_bin_op(left, node.op, right)
+        if folded_node:
+            return folded_node
+        if new_left or new_right:
+            return js_ast.JSBinOp(left, node.op, right)
+        return None
+
+    def _visit_operand(self, node: js_ast.JSExpression) -> Optional[js_ast.JSExpression]:
+        # Обходятся только выражения, которые могут стать константами; остальные остаются без изменений
+        if isinstance(node, (js_ast.JSName, js_ast.JSBinOp)):
+            return self.visit(node)
+        return None
 
     def visit_JSAttribute(self, node: js_ast.JSAttribute) -> Optional[js_ast.JSAttribute]:
-        new_value = self.visit(node.value)
+        # Основа атрибута записывается как имя, поэтому константы в неё не подставляются
+        if isinstance(node.value, js_ast.JSName):
+            new_value = self._visit_name_alias(node.value)
+        else:
+            new_value = self.visit(node.value)
         if new_value:
             return js_ast.JSAttribute(new_value or node.value, node.attr)
         return None
@@ -257,7 +527,7 @@ class Transformer:
         return None
 
     def visit_JSReturn(self, node: js_ast.JSReturn) -> Optional[js_ast.JSReturn]:
-        new_value = self.visit_JSExpression(node.value)
+        new_value = self._visit_operand(node.value)
         if new_value:
             return js_ast.JSReturn(new_value)
         return None
@@ -302,7 +572,13 @@ class Transformer:
 
         return result
 
-    def visit_JSName(self, node: js_ast.JSName) -> Optional[js_ast.JSName]:
+    def visit_JSName(self, node: js_ast.JSName) -> Optional[js_ast.JSName | js_ast.JSConstant]:
+        constant = self.constants.get(node.id)
+        if constant is not None:
+            return js_ast.JSConstant(constant.value)
+        return self._visit_name_alias(node)
+
+    def _visit_name_alias(self, node: js_ast.JSName) -> Optional[js_ast.JSName]:
         object_info = get_object_from_node(self.context_vars, node)
         if object_info and '__ty_alias__' in object_info.objects:
             target_object_name = object_info.objects['__ty_alias__'].object_value
@@ -333,18 +609,48 @@ class Transformer:
 
         new_args = self.visit(node.args) or node.args
 
-        body_transformer = BodyTransformer(node.body, function_context, self.root_object)
+        body_transformer = BodyTransformer(node.body, function_context, self.root_object, constants=self.constants)
         new_body = body_transformer.transform()
-        if new_args or new_body:
-            return js_ast.JSFunctionDef(node.name, new_args or node.args, new_body or node.body)
+        new_body = _or(remove_unused_locals(_or(new_body, node.body)), new_body)
+        if new_args or new_body is not None:
+            return js_ast.JSFunctionDef(node.name, new_args or node.args, _or(new_body, node.body))
         return None
 
     def visit_JSList(self, node: js_ast.JSList):
         return node
 
-    def visit_JSIf(self, node: js_ast.JSIf):
+    def visit_JSIf(self, node: js_ast.JSIf) -> Optional[js_ast.JSIf | list[js_ast.JSStatement] | js_ast.JSNop]:
+        new_test = self._visit_operand(node.test)
+        test = _or(new_test, node.test)
+        constant_test = get_constant_test(test)
+        if constant_test is not None:
+            return self._visit_branch(node.body if constant_test else node.orelse)
+
+        # Ветви с переменным условием не преобразуются, из них только удаляется недостижимый код
+        new_body = eliminate_dead_code(node.body)
+        new_orelse = eliminate_dead_code(node.orelse)
+        if _one_of(new_test, new_body, new_orelse):
+            return js_ast.JSIf(test, _or(new_body, node.body), _or(new_orelse, node.orelse))
+        return None
+
+    def visit_JSWhile(self, node: js_ast.JSWhile) -> Optional[js_ast.JSWhile | list[js_ast.JSStatement] | js_ast.JSNop]:
+        new_test = self._visit_operand(node.test)
+        test = _or(new_test, node.test)
+        if get_constant_test(test) is False:
+            return self._visit_branch(node.orelse)
+
+        new_body = eliminate_dead_code(node.body)
+        new_orelse = eliminate_dead_code(node.orelse)
+        if _one_of(new_test, new_body, new_orelse):
+            return js_ast.JSWhile(test, _or(new_body, node.body), _or(new_orelse, node.orelse))
         return None
 
+    def _visit_branch(self, body: List[js_ast.JSStatement] | None) -> list[js_ast.JSStatement] | js_ast.JSNop:
+        """Выполняемая ветва переносится в охватывающий блок и преобразуется вместе с ним"""
+        if not body:
+            return js_ast.JSNop()
+        return _or(self.visit_list(body), body) or js_ast.JSNop()
+
     def _check_and_transform_call_to_new(self, node: js_ast.JSCall) -> Optional[js_ast.JSNew]:
         id_info = get_object_from_node(self.context_vars, node.func)
         if isinstance(id_info, ObjectClass):
@@ -353,20 +659,31 @@ class Transformer:
 
 
 class BodyTransformer(Transformer):
-    """Класс преобразует тело модуля"""
+    """Класс преобразует тело модуля.
+
+    Значения присваиваний имён из `constant_names` (см. `get_constant_names`), которые после преобразования
+    оказались константами, запоминаются в `constants` и подставляются в следующие инструкции.
+    """
     def __init__(
             self,
             body: List[js_ast.JSStatement],
             context_path: List[str],
             root_object: ObjectInfo,
+            constants: dict[str, js_ast.JSConstant] = None,
+            constant_names: set[str] = None,
     ):
-        super().__init__(context_path, root_object)
+        super().__init__(context_path, root_object, constants)
         self.body = body
         self.body_vars = set()
+        self.constant_names = constant_names or set()
 
     def transform(self):
         new_body = self.visit(self.body)
-        if new_body:
+        body = _or(new_body, self.body)
+        reachable_body = remove_unreachable_statements(body)
+        if reachable_body is not body:
+            new_body = reachable_body
+        if new_body is not None:
             self.body = new_body
             return new_body
         return None
@@ -378,13 +695,16 @@ class BodyTransformer(Transformer):
             new_node = js_ast.JSLet(node)
             self.body_vars.add(name)
 
+        if name in self.constant_names and is_inlinable_constant(node.value):
+            self.constants[name] = node.value
+
         value_object = get_object_from_node(self.context_vars, node.value)
         self.context_vars.objects[node.target.id] = value_object
         return new_node
 
     def visit_JSClassDef(self, node: js_ast.JSClassDef) -> Optional['js_ast.JSClassDef']:
         class_context = self.context_path + [node.name]
-        class_transformer = ClassTransformer(node, class_context, self.root_object)
+        class_transformer = ClassTransformer(node, class_context, self.root_object, constants=self.constants)
         new_class_def = class_transformer.transform()
         return new_class_def
 
@@ -399,15 +719,16 @@ class BodyTransformer(Transformer):
 
         visited_node = None
         if names:
-            visited_node = js_ast.JSImport(node.module, names, node.alias)
+            visited_node = js_ast.JSImport(node.module, names, node.alias, node.path)
 
         return visited_node
 
 
 class ClassTransformer(Transformer):
     """Класс трансформирует объявления класса в объекте"""
-    def __init__(self, class_def: js_ast.JSClassDef, context_path: List[str], root_object: ObjectInfo):
-        super().__init__(context_path, root_object)
+    def __init__(self, class_def: js_ast.JSClassDef, context_path: List[str], root_object: ObjectInfo,
+                 constants: dict[str, js_ast.JSConstant] = None):
+        super().__init__(context_path, root_object, constants)
         self.class_def = class_def
 
     def transform(self) -> Optional[js_ast.JSClassDef]:
@@ -424,6 +745,7 @@ class ClassTransformer(Transformer):
         new_args = self.visit(node.args) or node.args
         method_context = self.context_path + [method_name]
 
-        body_transformer = BodyTransformer(node.body, method_context, self.root_object)
+        body_transformer = BodyTransformer(node.body, method_context, self.root_object, constants=self.constants)
         new_body = body_transformer.transform()
-        return js_ast.JSMethodDef(name=method_name, args=new_args, body=new_body or node.body)
+        new_body = _or(remove_unused_locals(_or(new_body, node.body)), new_body)
+        return js_ast.JSMethodDef(name=method_name, args=new_args, body=_or(new_body, node.body))
@@ -1,22 +1,72 @@
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Callable
 
 registry = {}
 
 
-class JSNodeMeta(type):
+def make_init(fields: tuple[str, ...], defaults: dict) -> Callable:
+    """
+    Генерация конструктора узла, который присваивает значения полей напрямую, без `**kwargs` и `setattr`.
+    Поле со значением по умолчанию `[]` при отсутствии значения получает новый пустой список.
+    """
+    parameters = ['self']
+    lines = []
+    for field_name in fields:
+        if field_name not in defaults:
+            parameters.append(field_name)
+            lines.append(f'    self.{field_name} = {field_name}')
+        elif defaults[field_name] == []:
+            parameters.append(f'{field_name}=None')
+            lines.append(f'    self.{field_name} = [] if {field_name} is None else {field_name}')
+        else:
+            parameters.append(f'{field_name}=_defaults[{field_name!r}]')
+            lines.append(f'    self.{field_name} = {field_name}')
+    lines.append('    self.lineno = None')
+    lines.append('    self.col_offset = None')
+
+    source = f'def __init__({", ".join(parameters)}):\n' + '\n'.join(lines)
+    namespace = {}
+    exec(source, {'_defaults': defaults}, namespace)
+    return namespace['__init__']
+
 
-    def __init__(self, name, *args) -> None:
+class JSNodeMeta(type):
+    """
+    Метакласс узлов: регистрирует класс узла по имени, объявляет слоты для полей из `_fields`,
+    которых нет у базовых классов, и генерирует конструктор по `_fields` и `_defaults`.
+    """
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get('_fields')
+        if fields is not None:
+            inherited_slots = {
+                slot for base in bases for cls in base.__mro__ for slot in getattr(cls, '__slots__', ())
+            }
+            namespace.setdefault('__slots__', tuple(field for field in fields if field not in inherited_slots))
+            if '__init__' not in namespace:
+                namespace['__init__'] = make_init(fields, namespace.get('_defaults', {}))
+                namespace['__init__'].__qualname__ = f'{name}.__init__'
+        else:
+            namespace.setdefault('__slots__', ())
+        return super().__new__(mcs, name, bases, namespace)
+
+    def __init__(cls, name, *args) -> None:
         super().__init__(name, *args)
-        registry[name] = self
+        registry[name] = cls
 
 
 class JSNode(metaclass=JSNodeMeta):
-    """Базовый класс для всех узлов"""
+    """Базовый класс для всех узлов.
+
+    Узлы хранят поля только в слотах, без `__dict__`. Поля перечисляются в `_fields`, значения по умолчанию —
+    в `_defaults`; конструктор с полями в порядке `_fields` генерируется метаклассом.
+
+    Позиция узла в исходном коде Python (`lineno`, `col_offset`) не входит в `_fields`
+    и не учитывается при сравнении узлов.
+    """
     _fields = ()
+    __slots__ = ('lineno', 'col_offset')
 
-    def __init__(self, **kwargs):
-        for field_name in kwargs:
-            setattr(self, field_name, kwargs.get(field_name))
+    lineno: Optional[int]
+    col_offset: Optional[int]
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
@@ -64,10 +114,7 @@ class JSName(JSExpression):
         'id',
     )
 
-    __slots__ = ('id',)
-
-    def __init__(self, id: str):
-        super().__init__(id=id)
+    id: str
 
 
 class JSConstant(JSExpression):
@@ -75,10 +122,7 @@ class JSConstant(JSExpression):
         'value',
     )
 
-    __slots__ = ('value',)
-
-    def __init__(self, value: Union[str, int]):
-        super().__init__(value=value)
+    value: Union[str, int]
 
 
 class JSKeyWord(JSNode):
@@ -87,10 +131,8 @@ class JSKeyWord(JSNode):
         'value',
     )
 
-    __slots__ = ('arg', 'value')
-
-    def __init__(self, arg: str, value: JSExpression):
-        super().__init__(arg=arg, value=value)
+    arg: str
+    value: JSExpression
 
 
 class JSCall(JSExpression):
@@ -99,11 +141,11 @@ class JSCall(JSExpression):
         'args',
         'keywords',
     )
+    _defaults = {'args': None, 'keywords': []}
 
-    __slots__ = ('func', 'args', 'keywords')
-
-    def __init__(self, func: JSExpression, args: List[JSExpression] = None, keywords: List[JSKeyWord] = None):
-        super().__init__(func=func, args=args, keywords=keywords or [])
+    func: JSExpression
+    args: List[JSExpression]
+    keywords: List[JSKeyWord]
 
 
 class JSBinOp(JSExpression):
@@ -113,14 +155,9 @@ class JSBinOp(JSExpression):
         'right',
     )
 
-    __slots__ = (
-        'left',
-        'right',
-        'op',
-    )
-
-    def __init__(self, left: JSExpression, op: JSOperator, right: JSExpression):
-        super().__init__(left=left, op=op, right=right)
+    left: JSExpression
+    op: JSOperator
+    right: JSExpression
 
 
 class JSAssign(JSStatement):
@@ -129,10 +166,8 @@ class JSAssign(JSStatement):
         'value',
     )
 
-    __slots__ = ('target', 'value')
-
-    def __init__(self, target: JSExpression, value: JSExpression):
-        super().__init__(target=target, value=value)
+    target: JSExpression
+    value: JSExpression
 
 
 class JSCodeExpression(JSStatement):
@@ -140,10 +175,7 @@ class JSCodeExpression(JSStatement):
         'value',
     )
 
-    __slots__ = ('value',)
-
-    def __init__(self, value: Union[JSStatement, JSExpression]):
-        super().__init__(value=value)
+    value: Union[JSStatement, JSExpression]
 
 
 class JSAdd(JSOperator):
@@ -155,10 +187,7 @@ class JSArg(JSNode):
         'arg',
     )
 
-    __slots__ = ('arg',)
-
-    def __init__(self, arg: str):
-        super().__init__(arg=arg)
+    arg: str
 
 
 class JSArguments(JSNode):
@@ -170,13 +199,14 @@ class JSArguments(JSNode):
         'kw_defaults',
         'kwarg',
     )
+    _defaults = {'args': None, 'defaults': None, 'vararg': None, 'kwonlyargs': None, 'kw_defaults': None, 'kwarg': None}
 
-    __slots__ = ('args', 'defaults', 'vararg', 'kwonlyargs', 'kw_defaults', 'kwarg')
-
-    def __init__(self, args: List[JSArg] = None, defaults: List[JSExpression] = None, vararg: JSArg = None,
-                 kwonlyargs: List[JSArg] = None, kw_defaults: List[JSExpression] = None, kwarg: JSArg = None):
-        super().__init__(args=args, defaults=defaults, vararg=vararg,
-                         kwonlyargs=kwonlyargs, kw_defaults=kw_defaults, kwarg=kwarg)
+    args: List[JSArg]
+    defaults: List[JSExpression]
+    vararg: JSArg
+    kwonlyargs: List[JSArg]
+    kw_defaults: List[JSExpression]
+    kwarg: JSArg
 
 
 class JSFunctionDef(JSStatement):
@@ -186,10 +216,9 @@ class JSFunctionDef(JSStatement):
         'body',
     )
 
-    __slots__ = ('name', 'args', 'body')
-
-    def __init__(self, name: str, args: JSArguments, body: List[JSStatement]):
-        super().__init__(name=name, args=args, body=body)
+    name: str
+    args: JSArguments
+    body: List[JSStatement]
 
 
 class JSReturn(JSStatement):
@@ -197,10 +226,7 @@ class JSReturn(JSStatement):
         'value',
     )
 
-    __slots__ = ('value',)
-
-    def __init__(self, value: JSExpression):
-        super().__init__(value=value)
+    value: JSExpression
 
 
 class JSList(JSExpression):
@@ -208,10 +234,7 @@ class JSList(JSExpression):
         'elts',
     )
 
-    __slots__ = ('elts',)
-
-    def __init__(self, elts: List[JSExpression]):
-        super().__init__(elts=elts)
+    elts: List[JSExpression]
 
 
 class JSDict(JSExpression):
@@ -220,10 +243,8 @@ class JSDict(JSExpression):
         'values',
     )
 
-    __slots__ = ('keys', 'values')
-
-    def __init__(self, keys: List[JSExpression], values: List[JSExpression]):
-        super().__init__(keys=keys, values=values)
+    keys: List[JSExpression]
+    values: List[JSExpression]
 
 
 class JSWhile(JSStatement):
@@ -232,11 +253,11 @@ class JSWhile(JSStatement):
         'body',
         'orelse',
     )
+    _defaults = {'orelse': None}
 
-    __slots__ = ('test', 'body', 'orelse')
-
-    def __init__(self, test: JSExpression, body: List[JSStatement], orelse: List[JSStatement] = None):
-        super().__init__(test=test, body=body, orelse=orelse)
+    test: JSExpression
+    body: List[JSStatement]
+    orelse: List[JSStatement]
 
 
 class JSEq(JSCmpOp):
@@ -250,10 +271,9 @@ class JSCompare(JSExpression):
         'right',
     )
 
-    __slots__ = ('left', 'op' , 'right')
-
-    def __init__(self, left: JSExpression, op: JSCmpOp, right: JSExpression):
-        super().__init__(left=left, op=op, right=right)
+    left: JSExpression
+    op: JSCmpOp
+    right: JSExpression
 
 
 class JSIf(JSStatement):
@@ -262,11 +282,11 @@ class JSIf(JSStatement):
         'body',
         'orelse',
     )
+    _defaults = {'orelse': None}
 
-    __slots__ = ('test', 'body', 'orelse')
-
-    def __init__(self, test: JSExpression, body: List[JSStatement], orelse: List[JSStatement] = None):
-        super().__init__(test=test, body=body, orelse=orelse)
+    test: JSExpression
+    body: List[JSStatement]
+    orelse: List[JSStatement]
 
 
 class JSThrow(JSStatement):
@@ -274,10 +294,7 @@ class JSThrow(JSStatement):
         'exc',
     )
 
-    __slots__ = ('exc', )
-
-    def __init__(self, exc: JSExpression):
-        super().__init__(exc=exc)
+    exc: JSExpression
 
 
 class JSTry(JSStatement):
@@ -286,11 +303,11 @@ class JSTry(JSStatement):
         'catch',
         'finalbody',
     )
+    _defaults = {'finalbody': None}
 
-    __slots__ = ('body', 'catch', 'finalbody')
-
-    def __init__(self, body: List[JSStatement], catch: List[JSStatement], finalbody: List[JSStatement] = None):
-        super().__init__(body=body, catch=catch, finalbody=finalbody)
+    body: List[JSStatement]
+    catch: List[JSStatement]
+    finalbody: List[JSStatement]
 
 
 class JSContinue(JSStatement):
@@ -307,10 +324,8 @@ class JSSubscript(JSExpression):
         'slice',
     )
 
-    __slots__ = ('value', 'slice')
-
-    def __init__(self, value: JSExpression, slice: JSExpression):
-        super().__init__(value=value, slice=slice)
+    value: JSExpression
+    slice: JSExpression
 
 
 class JSDelete(JSStatement):
@@ -318,10 +333,7 @@ class JSDelete(JSStatement):
         'target',
     )
 
-    __slots__ = ('target',)
-
-    def __init__(self, target: JSExpression):
-        super().__init__(target=target)
+    target: JSExpression
 
 
 class JSStatements(JSNode):
@@ -329,10 +341,7 @@ class JSStatements(JSNode):
         'statements',
     )
 
-    __slots__ = ('statements',)
-
-    def __init__(self, statements: List[JSStatement]):
-        super().__init__(statements=statements)
+    statements: List[JSStatement]
 
 
 class JSExport(JSNode):
@@ -340,10 +349,7 @@ class JSExport(JSNode):
         'ids',
     )
 
-    __slots__ = ('ids',)
-
-    def __init__(self, ids: List[str]):
-        super().__init__(ids=ids)
+    ids: List[str]
 
 
 class JSModule(JSNode):
@@ -351,11 +357,10 @@ class JSModule(JSNode):
         'body',
         'export',
     )
+    _defaults = {'export': None}
 
-    __slots__ = ('body', 'export')
-
-    def __init__(self, body: List[JSStatement], export: Optional[JSExport] = None):
-        super().__init__(body=body, export=export)
+    body: List[JSStatement]
+    export: Optional[JSExport]
 
 
 class JSLet(JSNode):
@@ -363,10 +368,7 @@ class JSLet(JSNode):
         'assign',
     )
 
-    __slots__ = ('assign',)
-
-    def __init__(self, assign: JSAssign):
-        super().__init__(assign=assign)
+    assign: JSAssign
 
 
 class JSAlias(JSNode):
@@ -374,11 +376,10 @@ class JSAlias(JSNode):
         'name',
         'asname',
     )
+    _defaults = {'asname': None}
 
-    __slots__ = ('name', 'asname')
-
-    def __init__(self, name: str, asname: str = None):
-        super().__init__(name=name, asname=asname)
+    name: str
+    asname: str
 
 
 class JSImport(JSStatement):
@@ -386,12 +387,15 @@ class JSImport(JSStatement):
         'module',
         'names',
         'alias',
+        'path',
     )
+    _defaults = {'names': None, 'alias': None, 'path': None}
 
-    __slots__ = ('module', 'names', 'alias')
-
-    def __init__(self, module: str, names: List[JSAlias] = None, alias: str = None):
-        super().__init__(module=module, names=names, alias=alias)
+    module: str
+    names: List[JSAlias]
+    alias: str
+    # Путь к js-файлу модуля относительно импортирующего модуля, по умолчанию `./{module}.js`
+    path: str
 
 
 class JSAttribute(JSExpression):
@@ -400,10 +404,8 @@ class JSAttribute(JSExpression):
         'attr',
     )
 
-    __slots__ = ('value', 'attr')
-
-    def __init__(self, value: JSName, attr: str):
-        super().__init__(value=value, attr=attr)
+    value: JSName
+    attr: str
 
 
 class JSClassDef(JSStatement):
@@ -412,10 +414,8 @@ class JSClassDef(JSStatement):
         'body',
     )
 
-    __slots__ = ('name', 'body')
-
-    def __init__(self, name: str, body: list[JSStatement]):
-        super().__init__(name=name, body=body)
+    name: str
+    body: list[JSStatement]
 
 
 class JSMethodDef(JSFunctionDef):
@@ -428,11 +428,11 @@ class JSNew(JSExpression):
         'args',
         'keywords',
     )
+    _defaults = {'args': None, 'keywords': []}
 
-    __slots__ = ('class_', 'args', 'keywords')
-
-    def __init__(self, class_: JSExpression, args: List[JSExpression] = None, keywords: List[JSKeyWord] = None):
-        super().__init__(class_=class_, args=args, keywords=keywords or [])
+    class_: JSExpression
+    args: List[JSExpression]
+    keywords: List[JSKeyWord]
 
 
 class JSNop(JSStatement):
@@ -442,3 +442,11 @@ class JSNop(JSStatement):
 def node_factory(class_name: str, fields: {}) -> JSNode:
     node_class = registry.get(class_name)
     return node_class(**fields)
+
+
+def copy_position(new_node: JSNode, old_node: JSNode) -> JSNode:
+    """Копирование позиции в исходном коде из старого узла в новый, если у нового узла позиция не задана"""
+    if new_node.lineno is None and old_node.lineno is not None:
+        new_node.lineno = old_node.lineno
+        new_node.col_offset = old_node.col_offset
+    return new_node
@@ -1,50 +1,163 @@
-from typing import Union, TypeAlias
+import sys
+from array import array
+from typing import Iterator
 
 from typhon import js_ast
 
 
-FieldValueType: TypeAlias = Union[str, int, list, dict]
+# Виды значений полей в упакованном дереве. Значение поля записывается парой чисел (вид, содержимое)
+VALUE_NONE, VALUE_FALSE, VALUE_TRUE, VALUE_INT, VALUE_STR, VALUE_CONSTANT, VALUE_NODE, VALUE_LIST = range(8)
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
 
 
-def serialize_js_node(node: js_ast.JSNode) -> dict[str, FieldValueType]:
-    """Сериализация узла в словарь"""
-    fields = {name: serialize_field(getattr(node, name)) for name in node._fields}
+class JSTreePacker:
+    """Класс `JSTreePacker` упаковывает дерево в плоский массив чисел:
+        - Узлы записываются в порядке обхода в глубину, дочерние узлы перед родительскими,
+          поэтому поле-узел хранит номер уже записанного узла
+        - Класс узла записывается номером в таблице классов, строки — номером в таблице строк
+        - Значения, не представимые числом или строкой (например, `float`), хранятся в таблице констант
+        - Узел, на который ссылаются несколько полей, записывается один раз
+    Обход выполняется без рекурсии.
+    """
+    def __init__(self):
+        self.classes: dict[type, int] = {}
+        self.strings: dict[str, int] = {}
+        self.constants: list = []
+        self.node_indices: dict[int, int] = {}
+        self.values = array('q')
 
-    result: dict[str, FieldValueType] = {
-        'id': id(node),
-        'class': node.__class__.__name__,
-    }
-    if fields:
-        result['fields'] = fields
+    def pack(self, node: js_ast.JSNode) -> dict:
+        # В стеке хранятся узлы и признак того, что их дочерние узлы уже записаны
+        stack = [(node, False)]
+        while stack:
+            current_node, children_packed = stack.pop()
+            if id(current_node) in self.node_indices:
+                continue
+            if children_packed:
+                self.pack_node(current_node)
+                continue
+            stack.append((current_node, True))
+            for child_node in reversed(list(iter_child_nodes(current_node))):
+                if id(child_node) not in self.node_indices:
+                    stack.append((child_node, False))
 
-    return result
+        return {
+            'byteorder': sys.byteorder,
+            'classes': [(node_class.__name__, len(node_class._fields)) for node_class in self.classes],
+            'strings': list(self.strings),
+            'constants': self.constants,
+            'values': self.values.tobytes(),
+        }
 
+    def pack_node(self, node: js_ast.JSNode):
+        node_class = node.__class__
+        class_index = self.classes.get(node_class)
+        if class_index is None:
+            class_index = self.classes[node_class] = len(self.classes)
+        self.values.append(class_index)
+        for field_name in node._fields:
+            value = getattr(node, field_name)
+            if isinstance(value, list):
+                self.values.extend((VALUE_LIST, len(value)))
+                for item in value:
+                    self.pack_value(item)
+            else:
+                self.pack_value(value)
+        self.node_indices[id(node)] = len(self.node_indices)
 
-def serialize_field(field_value: Union[str, int, list, js_ast.JSNode]) -> FieldValueType:
-    if isinstance(field_value, list):
-        return [serialize_field(item) for item in field_value]
-    elif isinstance(field_value, js_ast.JSNode):
-        return serialize_js_node(field_value)
-    return field_value
+    def pack_value(self, value):
+        values = self.values
+        value_type = type(value)
+        if value is None:
+            values.extend((VALUE_NONE, 0))
+        elif value_type is str:
+            string_index = self.strings.get(value)
+            if string_index is None:
+                string_index = self.strings[value] = len(self.strings)
+            values.extend((VALUE_STR, string_index))
+        elif value_type is bool:
+            values.extend((VALUE_TRUE if value else VALUE_FALSE, 0))
+        elif value_type is int and INT_MIN <= value <= INT_MAX:
+            values.extend((VALUE_INT, value))
+        elif isinstance(value, js_ast.JSNode):
+            values.extend((VALUE_NODE, self.node_indices[id(value)]))
+        elif isinstance(value, list) and not any(isinstance(item, js_ast.JSNode) for item in value):
+            values.extend((VALUE_CONSTANT, len(self.constants)))
+            self.constants.append(value)
+        elif isinstance(value, list):
+            raise TypeError('Nested lists of nodes are not supported')
+        else:
+            values.extend((VALUE_CONSTANT, len(self.constants)))
+            self.constants.append(value)
 
 
-class JSNodeDeserializer:
-    """Десериализация узла из словаря"""
-    def __init__(self, data: dict):
-        self.data = data
+def iter_child_nodes(node: js_ast.JSNode) -> Iterator[js_ast.JSNode]:
+    for field_name in node._fields:
+        value = getattr(node, field_name)
+        if isinstance(value, js_ast.JSNode):
+            yield value
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, js_ast.JSNode):
+                    yield item
 
-    def deserialize(self):
-        class_name = self.data.get('class')
-        fields_data = self.data.get('fields', {})
-        fields = {name: self.deserialize_field(value) for name, value in fields_data.items()}
-        node = js_ast.node_factory(class_name, fields)
-        return node
 
-    def deserialize_field(self, value_data: Union[str, int, list, dict]) -> Union[str, int, list, js_ast.JSNode]:
-        if isinstance(value_data, dict):
-            deserializer = JSNodeDeserializer(value_data)
-            node = deserializer.deserialize()
-            return node
-        elif isinstance(value_data, list):
-            return [self.deserialize_field(item) for item in value_data]
-        return value_data
+def pack_js_tree(node: js_ast.JSNode) -> dict:
+    """Упаковка дерева в словарь из таблиц классов, строк и констант и массива чисел (см. `JSTreePacker`)"""
+    return JSTreePacker().pack(node)
+
+
+def unpack_js_tree(data: dict) -> js_ast.JSNode:
+    """Восстановление дерева, упакованного `pack_js_tree`. Возвращает последний записанный узел — корень дерева"""
+    classes = []
+    for class_name, field_count in data['classes']:
+        node_class = js_ast.registry[class_name]
+        if len(node_class._fields) != field_count:
+            raise ValueError(f'Fields of {class_name} have changed')
+        classes.append((node_class, field_count))
+    strings = data['strings']
+    constants = data['constants']
+    values = array('q')
+    values.frombytes(data['values'])
+    if data['byteorder'] != sys.byteorder:
+        values.byteswap()
+
+    nodes = []
+    position = 0
+    values_count = len(values)
+    while position < values_count:
+        node_class, field_count = classes[values[position]]
+        position += 1
+        fields = []
+        for _ in range(field_count):
+            value_kind = values[position]
+            if value_kind == VALUE_LIST:
+                items = []
+                for item_position in range(position + 2, position + 2 + 2 * values[position + 1], 2):
+                    items.append(unpack_value(values[item_position], values[item_position + 1],
+                                              nodes, strings, constants))
+                position += 2 + 2 * values[position + 1]
+                fields.append(items)
+            else:
+                fields.append(unpack_value(value_kind, values[position + 1], nodes, strings, constants))
+                position += 2
+        nodes.append(node_class(*fields))
+    return nodes[-1]
+
+
+def unpack_value(value_kind: int, value: int, nodes: list[js_ast.JSNode], strings: list[str], constants: list):
+    if value_kind == VALUE_NODE:
+        return nodes[value]
+    elif value_kind == VALUE_STR:
+        return strings[value]
+    elif value_kind == VALUE_INT:
+        return value
+    elif value_kind == VALUE_NONE:
+        return None
+    elif value_kind == VALUE_CONSTANT:
+        return constants[value]
+    elif value_kind == VALUE_TRUE:
+        return True
+    elif value_kind == VALUE_FALSE:
+        return False
+    raise ValueError(f'Unknown value kind {value_kind}')
@@ -1,3 +1,4 @@
+from abc import ABC, abstractmethod
 from typing import Optional, List, Callable, Iterable, Tuple
 
 from typhon import js_ast
@@ -15,7 +16,31 @@ def iter_fields(node: js_ast.JSNode) -> Iterable[Tuple[str, js_ast.JSNode]]:
             pass
 
 
-class JSNodeVisitor:
+class NodeDispatcher(ABC):
+    """
+    Кэш обработчиков узлов. Для каждого подкласса строится своя таблица, которая отображает класс узла
+    на функцию `visit_<имя класса>` этого подкласса или, если её нет, на `generic_visit`. Таблица заполняется
+    при первой встрече узла каждого класса, после чего обход не формирует имена методов и не вызывает `getattr`.
+    Подклассы определяют обработчик по умолчанию `generic_visit`.
+    """
+    _dispatch_table: dict[type, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}
+
+    @classmethod
+    def get_handler(cls, node_class: type) -> Callable:
+        handler = getattr(cls, 'visit_' + node_class.__name__, None) or cls.generic_visit
+        cls._dispatch_table[node_class] = handler
+        return handler
+
+    @abstractmethod
+    def generic_visit(self, node: js_ast.JSNode):
+        ...
+
+
+class JSNodeVisitor(NodeDispatcher):
     """
     Базовый класс для обхода узлов дерева синтаксического разбора (AST).
     Этот класс последовательно посещает все узлы AST и вызывает соответствующую
@@ -29,7 +54,8 @@ class JSNodeVisitor:
     Например, для узла `JSTry` будет вызван метод `visit_JSTry`.
     Это поведение можно изменить, переопределив метод `visit`.
     Если для узла не найден подходящий метод-обработчик (возвращается `None`),
-    вместо него вызывается метод `generic_visit`.
+    вместо него вызывается метод `generic_visit`. Найденные обработчики кэшируются
+    для каждого класса посетителя (см. `NodeDispatcher`).
 
     Не используйте `JSNodeVisitor`, если вы хотите вносить изменения в узлы во время обхода.
     Для модификации дерева существует специальный класс `JSNodeTransformer`.
@@ -37,9 +63,8 @@ class JSNodeVisitor:
 
     def visit(self, node: js_ast.JSNode) -> Optional[js_ast.JSNode | List[js_ast.JSNode]]:
         """Посещение узла."""
-        method = 'visit_' + node.__class__.__name__
-        visitor: Callable[[js_ast.JSNode], None] = getattr(self, method, self.generic_visit)
-        return visitor(node)
+        handler = self._dispatch_table.get(node.__class__) or self.get_handler(node.__class__)
+        return handler(self, node)
 
     def generic_visit(self, node: js_ast.JSNode):
         """Вызывается по умолчанию, если для узла не определён специализированный метод-посетитель.
@@ -0,0 +1,107 @@
+import itertools
+import string
+from typing import Iterator
+
+from typhon import js_ast
+from typhon.js_visitor import JSNodeVisitor
+
+
+RESERVED_WORDS = {
+    'do', 'if', 'in', 'for', 'let', 'new', 'try', 'var', 'case', 'else', 'enum', 'eval', 'null', 'this', 'true',
+    'void', 'with', 'await', 'break', 'catch', 'class', 'const', 'false', 'super', 'throw', 'while', 'yield',
+    'delete', 'export', 'import', 'public', 'return', 'static', 'switch', 'typeof', 'default', 'extends',
+    'finally', 'package', 'private', 'continue', 'debugger', 'function', 'arguments', 'interface', 'protected',
+    'implements', 'instanceof', 'undefined',
+}
+
+
+class LocalNamesCollector(JSNodeVisitor):
+    """Класс `LocalNamesCollector` собирает имена, используемые в функции:
+        - Локальные переменные (аргументы и переменные, объявленные через `let`)
+        - Все остальные имена, с которыми не должны совпадать новые имена локальных переменных
+        - Признак того, что переименование небезопасно (вложенные функции, классы и импорты)
+    """
+    def __init__(self):
+        self.local_names: list[str] = []
+        self.used_names: set[str] = set()
+        self.keyword_names: set[str] = set()
+        self.is_safe = True
+
+    def collect(self, node: js_ast.JSFunctionDef):
+        if node.args:
+            self.visit(node.args)
+        for statement in node.body:
+            self.visit(statement)
+
+    def add_local_name(self, name: str):
+        if name not in self.used_names:
+            self.local_names.append(name)
+        self.used_names.add(name)
+
+    def visit_JSArg(self, node: js_ast.JSArg):
+        self.add_local_name(node.arg)
+
+    def visit_JSLet(self, node: js_ast.JSLet):
+        if isinstance(node.assign.target, js_ast.JSName):
+            self.add_local_name(node.assign.target.id)
+        self.generic_visit(node)
+
+    def visit_JSName(self, node: js_ast.JSName):
+        self.used_names.add(node.id.split('.')[0])
+
+    def visit_JSKeyWord(self, node: js_ast.JSKeyWord):
+        # Именованный аргумент генерируется как присваивание `name=value`, поэтому его имя не переименовывается
+        self.keyword_names.add(node.arg)
+        self.used_names.add(node.arg)
+        self.generic_visit(node)
+
+    def visit_JSTry(self, node: js_ast.JSTry):
+        self.used_names.add('e')
+        self.generic_visit(node)
+
+    def visit_JSFunctionDef(self, node: js_ast.JSFunctionDef):
+        self.is_safe = False
+
+    def visit_JSMethodDef(self, node: js_ast.JSMethodDef):
+        self.is_safe = False
+
+    def visit_JSClassDef(self, node: js_ast.JSClassDef):
+        self.is_safe = False
+
+    def visit_JSImport(self, node: js_ast.JSImport):
+        self.is_safe = False
+
+
+def iter_short_names() -> Iterator[str]:
+    first_chars = string.ascii_letters + '_$'
+    chars = first_chars + string.digits
+    yield from first_chars
+    for length in itertools.count(1):
+        for first_char in first_chars:
+            for rest in itertools.product(chars, repeat=length):
+                yield first_char + ''.join(rest)
+
+
+def get_short_local_names(node: js_ast.JSFunctionDef) -> dict[str, str]:
+    """
+    Короткие имена локальных переменных функции. Переименование выполняется, только если в функции
+    нет вложенных функций и классов, которые могли бы обращаться к её переменным, а новые имена
+    не совпадают ни с одним именем, используемым в функции.
+    """
+    collector = LocalNamesCollector()
+    collector.collect(node)
+    if not collector.is_safe:
+        return {}
+
+    short_names = (name for name in iter_short_names()
+                   if name not in collector.used_names and name not in RESERVED_WORDS)
+    names = {}
+    short_name = None
+    for local_name in collector.local_names:
+        if local_name in collector.keyword_names:
+            continue
+        short_name = short_name or next(short_names)
+        if len(short_name) < len(local_name):
+            names[local_name] = short_name
+            short_name = None
+    return names
@@ -1,73 +1,166 @@
 import ast
+import datetime
+import fnmatch
 import json
 import os.path
+from dataclasses import dataclass, field
 from functools import cached_property
+from typing import Optional, Callable, TextIO
 
-from typhon.module_info import ModuleInfo, serialize_module_info
+from typhon.file_writer import FileWriter
+from typhon.module_info import ModuleInfo, dump_module_info, load_module_info
 from typhon.object_collector import ObjectInfo
-from typhon.source_manager import SourceManager
+from typhon.profiler import Profiler
+from typhon.source_manager import SourceManager, CACHE_DIRECTORY_NAME
+from typhon.source_map import SourceMap
 from typhon.types import ModulePath
 
 
+AST_DUMP_FORMATS = ('text', 'compact')
+
+
+@dataclass
+class AstDumpOptions:
+    """Настройки отладочного сохранения Python AST модулей в `.ty_cache`:
+        - `format`: `text` — многострочный `ast.dump` с отступами, `compact` — `ast.dump` в одну строку
+        - `modules`: шаблоны полных имён модулей (`fnmatch`, например `pkg.*`); если не заданы, сохраняется AST
+          всех модулей
+    """
+    format: str = 'text'
+    modules: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.format not in AST_DUMP_FORMATS:
+            raise ValueError(f'Unknown AST dump format: {self.format}')
+
+    def match(self, module_path: ModulePath) -> bool:
+        if not self.modules:
+            return True
+        return any(fnmatch.fnmatchcase(module_path.full_path, pattern) for pattern in self.modules)
+
+
 class Module:
     """Класс представляет собой единицу транспиляции. Он отвечает за:
         - Управление путями к файлам (исходным, целевым JS-файлам, файлам AST)
         - Чтение исходного кода
         - Сохранение результатов транспиляции (JS-кода, AST, информации о модуле)
         - Кэширование через директорию `.ty_cache`
+
+    Директории js-файлов и кэша определяет `SourceManager`: рядом с исходным кодом или в отдельных директориях.
+
+    Файлы сохраняются через `file_writer`: файл с неизменившимся содержимым не перезаписывается.
+    Время сохранения файлов и количество записей учитываются в `profiler`.
     """
-    def __init__(self, module_path: ModulePath = None, source_manager: SourceManager = None):
+    def __init__(self, module_path: ModulePath = None, source_manager: SourceManager = None,
+                 profiler: Profiler = None, file_writer: FileWriter = None):
         self.module_path = module_path or ModulePath('__main__')
         self.module_name = self.module_path.name
         source_manager = source_manager or SourceManager()
         self.source_path = source_manager.get_package_path(self.module_path.package)
+        self.target_path = source_manager.get_target_path(self.module_path)
+        self.cache_path = source_manager.get_cache_path(self.module_path)
+        self.profiler = profiler or Profiler(enabled=False)
+        self.file_writer = file_writer or FileWriter(self.profiler)
+
+    def save_js(self, target_code: str | Callable[[TextIO], None], source_map: SourceMap = None):
+        """
+        Сохранение js-кода. Вместо готового кода можно передать функцию, которая генерирует код
+        с записью в поток, например `ModuleTranspiler.write`. Код записывается потоком во временный файл,
+        который заменяет js-файл, только если отличается от уже сохранённого (см. `FileWriter.open`).
+        Если передан заполненный при генерации `source_map`, он сохраняется в файл `.js.map` рядом с js-файлом
+        """
+        with self.profiler.phase('save_js', self.module_path):
+            self.file_writer.make_directory(self.target_path)
+            with self.file_writer.open(self.target_file_name) as f:
+                if callable(target_code):
+                    target_code(f)
+                else:
+                    f.write(target_code)
+                if source_map is not None:
+                    f.write(f'\n//# sourceMappingURL={os.path.basename(self.source_map_file_name)}\n')
 
-    def save_js(self, target_code):
-        with open(self.target_file_name, 'w') as f:
-            f.write(target_code)
+            if source_map is not None:
+                self.file_writer.write(self.source_map_file_name, json.dumps(source_map.to_dict()))
 
-    def dump_ast(self, py_tree: ast.AST):
-        if not py_tree:
+    def create_source_map(self) -> SourceMap:
+        source_file_name = os.path.relpath(self.source_file_name, self.target_path).replace(os.sep, '/')
+        return SourceMap(os.path.basename(self.target_file_name), source_file_name)
+
+    def dump_ast(self, py_tree: ast.AST, options: AstDumpOptions = None):
+        """Отладочное сохранение Python AST. Без `options` или для модуля, не подходящего под фильтр, ничего не делает"""
+        if not py_tree or options is None or not options.match(self.module_path):
             return
 
-        with open(self.ast_dump_file_name, 'w') as f:
-            f.write(ast.dump(py_tree, indent=2))
+        with self.profiler.phase('dump_ast', self.module_path):
+            self.file_writer.write(self.ast_dump_file_name,
+                                   ast.dump(py_tree, indent=2 if options.format == 'text' else None))
 
     def get_source(self):
-        filename = os.path.join(self.source_path, f'{self.module_name}.py')
-        with open(filename, 'r') as f:
+        with open(self.source_file_name, 'r') as f:
             source_code = f.read()
         return source_code
 
     @cached_property
     def cache_directory(self):
-        cache_directory = os.path.join(self.source_path, '.ty_cache')
-        if not os.path.exists(cache_directory):
-            os.mkdir(cache_directory)
-
-        gitignore_file = os.path.join(cache_directory, '.gitignore')
-        with open(gitignore_file, 'w') as f:
-            f.write('*')
-
+        """Директория кэша. Она и её `.gitignore` проверяются один раз за сборку (см. `FileWriter.make_directory`)"""
+        cache_directory = self.cache_path
+        if self.file_writer.make_directory(cache_directory):
+            self.file_writer.write(os.path.join(cache_directory, '.gitignore'), '*')
         return cache_directory
 
+    @property
+    def source_file_name(self):
+        return os.path.join(self.source_path, f'{self.module_name}.py')
+
     @property
     def target_file_name(self):
-        return os.path.join(self.source_path, f'{self.module_name}.js')
+        return os.path.join(self.target_path, f'{self.module_name}.js')
+
+    @property
+    def bundle_file_name(self):
+        return os.path.join(self.target_path, f'{self.module_name}.bundle.js')
+
+    @property
+    def source_map_file_name(self):
+        return f'{self.target_file_name}.map'
 
     @property
     def ast_dump_file_name(self):
         return os.path.join(self.cache_directory, f'{self.module_name}_ast.txt')
 
-    def save_info(self, module_info: ModuleInfo):
-        json_info_file = os.path.join(self.cache_directory, f'{self.module_name}.json')
-        module_info_data = serialize_module_info(module_info)
-        with open(json_info_file, 'w') as f:
-            json.dump(module_info_data, f, indent=4)
+    @property
+    def info_file_name(self):
+        return os.path.join(self.cache_path, f'{self.module_name}.info')
+
+    def save_info(self, module_info: ModuleInfo, objects_data: dict = None):
+        with self.profiler.phase('save_info', self.module_path):
+            module_info_data = dump_module_info(module_info, objects_data)
+            self.file_writer.write(os.path.join(self.cache_directory, f'{self.module_name}.info'), module_info_data)
+
+    def load_info(self) -> Optional[ModuleInfo]:
+        """Загрузка сохранённой информации о модуле. Если информации нет или она повреждена, возвращается None"""
+        if not os.path.exists(self.info_file_name):
+            return None
 
+        try:
+            with open(self.info_file_name, 'rb') as f:
+                module_info_data = f.read()
+            # Файл перезаписывается только при изменении информации, поэтому время его изменения — время обновления
+            updated = datetime.datetime.fromtimestamp(os.path.getmtime(self.info_file_name))
+            return load_module_info(module_info_data, updated)
+        except (ValueError, KeyError, TypeError, IndexError, EOFError, SyntaxError):
+            return None
 
-def get_module_from_file(source_file_path: str) -> Module:
+
+def get_module_from_file(source_file_path: str, profiler: Profiler = None, file_writer: FileWriter = None,
+                         source_manager: SourceManager = None) -> Module:
+    """
+    Модуль верхнего уровня для файла. Директории выходных файлов и кэша берутся из `source_manager`,
+    если он передан
+    """
     source_path, filename = os.path.split(source_file_path)
     filename, ext = os.path.splitext(filename)
-    module = Module(ModulePath(filename), SourceManager(source_path))
+    source_manager = SourceManager(source_path) if source_manager is None \
+        else source_manager.with_project_path(source_path)
+    module = Module(ModulePath(filename), source_manager, profiler=profiler, file_writer=file_writer)
     return module
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from typhon.module import Module
+from typhon.module_info import ModuleInfo, get_source_hash
+from typhon.module_store import ModuleStore
+from typhon.source_manager import SourceManager
+from typhon.types import ModulePath
+
+
+class ModuleCache:
+    """Класс `ModuleCache` предоставляет сохранённую в `.ty_cache` информацию о модулях для инкрементальной сборки:
+        - Загрузка информации о модуле не более одного раза за сборку
+        - Проверка актуальности информации по хэшу исходного кода модуля
+    """
+    def __init__(self, source_manager: SourceManager, module_store: ModuleStore):
+        self.source_manager = source_manager
+        self.module_store = module_store
+        self.module_info_list: dict[ModulePath, Optional[ModuleInfo]] = {}
+
+    def get_info(self, module_path: ModulePath) -> Optional[ModuleInfo]:
+        """Информация о модуле, если исходный код модуля не менялся с момента её сохранения"""
+        if module_path not in self.module_info_list:
+            self.module_info_list[module_path] = self.load_info(module_path)
+        return self.module_info_list[module_path]
+
+    def invalidate(self, module_path: ModulePath):
+        self.module_info_list.pop(module_path, None)
+
+    def load_info(self, module_path: ModulePath) -> Optional[ModuleInfo]:
+        module = Module(module_path, self.source_manager)
+        module_info = module.load_info()
+        if module_info is None:
+            return None
+
+        source_hash = get_source_hash(self.module_store.get_source(module_path))
+        if module_info.source_hash != source_hash:
+            return None
+        return module_info
@@ -1,9 +1,23 @@
+import ast
 import datetime
-from dataclasses import dataclass
+import hashlib
+import json
+import marshal
+from dataclasses import dataclass, field
+from typing import Optional
 
 from typhon import js_ast
-from typhon.js_node_serializer import serialize_js_node, JSNodeDeserializer
-from typhon.object_collector import ObjectInfo
+from typhon.js_node_serializer import pack_js_tree, unpack_js_tree
+from typhon.object_collector import ObjectInfo, ObjectConstant, ObjectReference, ObjectFunction, ObjectArgument, \
+    ObjectModule, ObjectClass, Undefined
+from typhon.types import ModulePath
+
+
+# Версия marshal 0 не использует ссылки на повторяющиеся объекты, поэтому одинаковая информация о модуле
+# всегда записывается одинаковыми байтами и неизменившийся файл не перезаписывается
+MODULE_INFO_MARSHAL_VERSION = 0
+# Заголовок файла информации о модуле: версия формата и версия marshal, которой записано содержимое
+MODULE_INFO_HEADER = b'TYI\x03' + bytes([MODULE_INFO_MARSHAL_VERSION])
 
 
 @dataclass
@@ -12,26 +26,167 @@ class ModuleInfo:
         - Время обновления
         - Информацию об объектах
         - AST JavaScript
+        - Хэш исходного кода и импортируемые модули
+        - Сигнатуру экспортируемых объектов модуля и его зависимостей
+        - Настройки генерации, с которыми был сохранён js-файл модуля
+
+    При загрузке из `.ty_cache` дерево js-кода остаётся упакованным (`packed_js_tree`) и распаковывается
+    только при первом обращении через `get_js_tree`: модулям, js-код которых не генерируется заново,
+    дерево не нужно.
     """
     updated: datetime.datetime = None
     objects: ObjectInfo = None
     js_tree: js_ast.JSNode = None
+    source_hash: str = ''
+    imports: list[ModulePath] = field(default_factory=list)
+    dependencies: dict[str, str] = field(default_factory=dict)
+    export_signature: str = ''
+    build_options: dict[str, bool] = field(default_factory=dict)
+    packed_js_tree: dict = field(default=None, repr=False)
+
+    def get_js_tree(self) -> js_ast.JSNode | None:
+        if self.js_tree is None and self.packed_js_tree:
+            self.js_tree = unpack_js_tree(self.packed_js_tree)
+            self.packed_js_tree = None
+        return self.js_tree
+
+
+def get_source_hash(source: str) -> str:
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def get_export_signature(objects_data: dict, dependencies: dict[str, str]) -> str:
+    """
+    Сигнатура экспортируемых объектов. Меняется при изменении объектов модуля или сигнатур его зависимостей,
+    так как объекты зависимостей доступны через импортированные в модуль объекты.
+    """
+    return hashlib.sha256(json.dumps([objects_data, dependencies]).encode()).hexdigest()
+
+
+def serialize_objects(object_info: Optional[ObjectInfo], object_paths: dict[int, str] = None,
+                      _path: str = None, _stack: set[int] = None) -> Optional[dict]:
+    """
+    Сериализация объектов модуля в словарь. Объекты, путь к которым в `object_paths` не совпадает
+    с их положением в сериализуемом дереве (например, импортированные из других модулей), сохраняются как ссылки.
+    """
+    if object_info is None:
+        return None
+
+    object_paths = object_paths or {}
+    object_path = object_paths.get(id(object_info))
+    if _path is None:
+        _path = object_path or ''
+    elif object_path is not None and object_path != _path:
+        return {'reference': object_path}
+
+    _stack = _stack or set()
+    if id(object_info) in _stack:
+        return None
+    _stack.add(id(object_info))
 
+    result = {'class': object_info.__class__.__name__}
+    if isinstance(object_info, ObjectConstant):
+        result['value'] = repr(object_info.object_value)
+    elif isinstance(object_info, ObjectModule):
+        result['module_path'] = list(object_info.module_path.module_path)
+    elif not isinstance(object_info, ObjectArgument):
+        result['type'] = object_info.object_type
+        if object_info.object_value is not Undefined:
+            result['value'] = object_info.object_value
 
-def serialize_module_info(module_info: ModuleInfo) -> dict:
-    module_object = module_info.objects or ObjectInfo([])
-    nodes = {}
+    if object_info.objects:
+        result['objects'] = {
+            name: serialize_objects(item, object_paths, f'{_path}.{name}', _stack)
+            for name, item in object_info.objects.items()
+        }
+    if isinstance(object_info, ObjectFunction):
+        result['locals'] = serialize_objects(object_info.locals, object_paths, f'{_path}.<locals>', _stack)
+
+    _stack.remove(id(object_info))
+    return result
+
+
+def deserialize_objects(data: Optional[dict]) -> Optional[ObjectInfo]:
+    """Восстановление объектов из словаря. Ссылки восстанавливаются как `ObjectReference`"""
+    if data is None:
+        return None
+
+    if 'reference' in data:
+        return ObjectReference(data['reference'])
+
+    class_name = data['class']
+    if class_name == 'ObjectConstant':
+        object_info = ObjectConstant(ast.literal_eval(data['value']))
+    elif class_name == 'ObjectModule':
+        object_info = ObjectModule(ModulePath(*data['module_path']))
+    elif class_name == 'ObjectArgument':
+        object_info = ObjectArgument()
+    elif class_name == 'ObjectFunction':
+        object_info = ObjectFunction(data['value'])
+        object_info.locals = deserialize_objects(data['locals'])
+    elif class_name == 'ObjectClass':
+        object_info = ObjectClass(data['value'])
+    elif class_name == 'ObjectReference':
+        object_info = ObjectReference(data['value'])
+    else:
+        object_info = ObjectInfo(data['type'], data.get('value', Undefined))
+
+    for name, item_data in data.get('objects', {}).items():
+        object_info.objects[name] = deserialize_objects(item_data)
+    return object_info
+
+
+def serialize_module_info(module_info: ModuleInfo, objects_data: dict = None) -> dict:
+    """
+    Сериализация информации о модуле. Если объекты модуля уже сериализованы (`objects_data`),
+    повторная сериализация не выполняется. Дерево js-кода упаковывается `pack_js_tree`.
+    """
+    nodes = module_info.packed_js_tree or {}
     if module_info.js_tree:
-        nodes = serialize_js_node(module_info.js_tree)
+        nodes = pack_js_tree(module_info.js_tree)
 
     return {
         'updated': datetime.datetime.now().isoformat(),
+        'source_hash': module_info.source_hash,
+        'imports': [list(module_path.module_path) for module_path in module_info.imports],
+        'dependencies': module_info.dependencies,
+        'export_signature': module_info.export_signature,
+        'build_options': module_info.build_options,
+        'objects': objects_data if objects_data is not None else serialize_objects(module_info.objects),
         'nodes': nodes,
     }
 
 
-def deserialize_module_info(data: dict, root_object: ObjectInfo) -> ModuleInfo:
-    nodes_info = data.get('nodes', {})
-    node_deserializer = JSNodeDeserializer(nodes_info)
-    js_tree = node_deserializer.deserialize()
-    return ModuleInfo(objects=objects, js_tree=js_tree)
+def deserialize_module_info(data: dict) -> ModuleInfo:
+    """Восстановление информации о модуле. Дерево js-кода не распаковывается (см. `ModuleInfo.get_js_tree`)"""
+    return ModuleInfo(
+        updated=datetime.datetime.fromisoformat(data['updated']) if 'updated' in data else None,
+        objects=deserialize_objects(data.get('objects')),
+        source_hash=data.get('source_hash', ''),
+        imports=[ModulePath(*module_path) for module_path in data.get('imports', [])],
+        dependencies=data.get('dependencies', {}),
+        export_signature=data.get('export_signature', ''),
+        build_options=data.get('build_options', {}),
+        packed_js_tree=data.get('nodes') or None,
+    )
+
+
+def dump_module_info(module_info: ModuleInfo, objects_data: dict = None) -> bytes:
+    """
+    Информация о модуле в двоичном виде: заголовок и сериализованный словарь в формате `marshal`.
+    Все значения словаря — встроенные типы, а дерево js-кода упаковано в плоский массив,
+    поэтому запись и чтение выполняются без обхода дерева на Python.
+    Время обновления не записывается, чтобы одинаковая информация давала одинаковые байты.
+    """
+    data = serialize_module_info(module_info, objects_data)
+    del data['updated']
+    return MODULE_INFO_HEADER + marshal.dumps(data, MODULE_INFO_MARSHAL_VERSION)
+
+
+def load_module_info(data: bytes, updated: datetime.datetime = None) -> ModuleInfo:
+    """Восстановление информации о модуле из `dump_module_info`. Файл другого формата вызывает `ValueError`"""
+    if not data.startswith(MODULE_INFO_HEADER):
+        raise ValueError('Unknown module info format')
+    module_info = deserialize_module_info(marshal.loads(data[len(MODULE_INFO_HEADER):]))
+    module_info.updated = updated
+    return module_info
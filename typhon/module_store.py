@@ -0,0 +1,67 @@
+import ast
+from dataclasses import dataclass
+
+from typhon.module import Module
+from typhon.source_manager import SourceManager
+from typhon.types import ModulePath
+
+
+@dataclass
+class ParsedModule:
+    """Исходный код модуля вместе с его Python AST"""
+    source: str
+    py_tree: ast.Module = None
+
+
+class ModuleStore:
+    """Класс `ModuleStore` хранит разобранные модули в рамках одной сборки:
+        - Чтение исходного кода каждого модуля не более одного раза
+        - Парсинг исходного кода каждого модуля не более одного раза
+        - Подсчёт количества чтений файлов и вызовов парсера
+
+    Парсинг выполняется только при первом обращении к AST модуля.
+    """
+    def __init__(self, source_manager: SourceManager):
+        self.source_manager = source_manager
+        self.modules: dict[ModulePath, ParsedModule] = {}
+        self.read_count = 0
+        self.parse_count = 0
+
+    def add_source(self, module_path: ModulePath, source: str) -> ParsedModule:
+        """Добавление модуля с уже известным исходным кодом"""
+        parsed_module = ParsedModule(source=source)
+        self.modules[module_path] = parsed_module
+        return parsed_module
+
+    def add_module(self, module: Module) -> ParsedModule:
+        """Добавление модуля с чтением исходного кода из его файла"""
+        source = module.get_source()
+        self.read_count += 1
+        return self.add_source(module.module_path, source)
+
+    def get(self, module_path: ModulePath) -> ParsedModule:
+        parsed_module = self.get_module(module_path)
+        if parsed_module.py_tree is None:
+            parsed_module.py_tree = self.parse(parsed_module.source)
+        return parsed_module
+
+    def get_source(self, module_path: ModulePath) -> str:
+        """Получение исходного кода модуля без парсинга"""
+        return self.get_module(module_path).source
+
+    def get_module(self, module_path: ModulePath) -> ParsedModule:
+        parsed_module = self.modules.get(module_path)
+        if parsed_module is None:
+            module = Module(module_path, self.source_manager)
+            parsed_module = ParsedModule(source=module.get_source())
+            self.read_count += 1
+            self.modules[module_path] = parsed_module
+        return parsed_module
+
+    def invalidate(self, module_path: ModulePath):
+        """Удаление модуля из хранилища, например, после изменения его файла"""
+        self.modules.pop(module_path, None)
+
+    def parse(self, source: str) -> ast.Module:
+        self.parse_count += 1
+        return ast.parse(source)
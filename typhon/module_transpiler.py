@@ -1,9 +1,12 @@
 import ast
+from typing import TextIO
 
 from typhon import js_ast
-from typhon.generator import generate_js_module
+from typhon.generator import generate_js_module, write_js_module, CodeWriter, SourceMapWriter
 from typhon.object_collector import ObjectModule, get_object_by_path
-from typhon.js_analyzer import BodyTransformer
+from typhon.profiler import Profiler, count_py_nodes, count_js_nodes
+from typhon.js_analyzer import BodyTransformer, get_constant_names, get_declared_names
+from typhon.source_map import SourceMap
 from typhon.transpiler import convert_ast
 from typhon.types import ModulePath
 
@@ -12,12 +15,17 @@ class ModuleTranspiler:
     """Класс отвечает за процесс транспиляции модуля:
         - Парсинг исходного кода Python в AST
         - Транспиляция AST Python в AST JavaScript
-        - Преобразование AST JavaScript через `BodyTransformer`
+        - Преобразование AST JavaScript через `BodyTransformer`, в том числе вычисление и подстановка констант
         - Генерация финального JS-кода
+
+    Время каждого этапа и количество узлов деревьев учитываются в `profiler`.
     """
-    def __init__(self, source: str, root_object: ObjectModule, module_path: ModulePath):
+    def __init__(self, source: str, root_object: ObjectModule, module_path: ModulePath, py_tree: ast.Module = None,
+                 minify: bool = False, profiler: Profiler = None):
         self.source = source
-        self.py_tree = None
+        self.minify = minify
+        self.profiler = profiler or Profiler(enabled=False)
+        self.py_tree = py_tree
         self.js_tree = None
         self.module_path = module_path
         self.name = module_path.name
@@ -33,13 +41,52 @@ class ModuleTranspiler:
             self.module_object.objects['__special__'] = special_module_info
 
     def transpile(self) -> str:
-        self.py_tree = ast.parse(self.source)
-        self.js_tree = convert_ast(self.py_tree)
+        self.convert()
         self.transform()
-        return generate_js_module(self.js_tree)
+        return self.generate()
+
+    def convert(self):
+        if self.py_tree is None:
+            with self.profiler.phase('parse', self.module_path):
+                self.py_tree = ast.parse(self.source)
+        with self.profiler.phase('convert', self.module_path):
+            self.js_tree = convert_ast(self.py_tree)
+        if self.profiler.enabled:
+            self.profiler.count('py_node_count', count_py_nodes(self.py_tree))
+
+    def generate(self, source_map: SourceMap = None) -> str:
+        with self.profiler.phase('generate', self.module_path):
+            if source_map is None and not self.minify:
+                return generate_js_module(self.js_tree)
+
+            writer = self.create_writer(None, source_map)
+            write_js_module(writer, self.js_tree)
+            return writer.getvalue()
+
+    def write(self, stream: TextIO, source_map: SourceMap = None):
+        """
+        Генерация js-кода с записью в поток без сборки всего кода в одну строку.
+        Если передан `source_map`, в него записываются соответствия позиций js-кода исходному коду
+        """
+        with self.profiler.phase('generate', self.module_path):
+            write_js_module(self.create_writer(stream, source_map), self.js_tree)
+
+    def create_writer(self, stream: TextIO | None, source_map: SourceMap = None) -> CodeWriter:
+        if source_map is None:
+            return CodeWriter(stream, minify=self.minify)
+        return SourceMapWriter(source_map, stream, minify=self.minify)
 
     def transform(self):
-        body_transformer = BodyTransformer(self.js_tree.body, [self.name], self.root_object)
-        new_body = body_transformer.transform()
-        export = js_ast.JSExport([module for module in self.module_object.objects if module != '__special__'])
-        self.js_tree = js_ast.JSModule(body=new_body or self.js_tree.body, export=export)
+        with self.profiler.phase('transform', self.module_path):
+            body_transformer = BodyTransformer(self.js_tree.body, [self.name], self.root_object,
+                                               constant_names=get_constant_names(self.js_tree.body))
+            new_body = body_transformer.transform()
+            body = self.js_tree.body if new_body is None else new_body
+            # Объявления из удалённых недостижимых веток не экспортируются
+            declared_names = get_declared_names(body)
+            export = js_ast.JSExport([
+                name for name in self.module_object.objects if name != '__special__' and name in declared_names
+            ])
+            self.js_tree = js_ast.JSModule(body=body, export=export)
+        if self.profiler.enabled:
+            self.profiler.count('js_node_count', count_js_nodes(self.js_tree))
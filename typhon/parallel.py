@@ -0,0 +1,68 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from typhon.module import Module, AstDumpOptions
+from typhon.module_info import ModuleInfo
+from typhon.module_transpiler import ModuleTranspiler
+
+
+@dataclass
+class ModuleOutput:
+    """Результаты преобразования модуля, по которым генерируются и сохраняются выходные файлы"""
+    module: Module
+    transpiler: ModuleTranspiler
+    module_info: ModuleInfo
+    objects_data: dict
+    source_maps: bool = False
+    ast_dump: AstDumpOptions | None = None
+
+    def save(self):
+        self.module.dump_ast(self.transpiler.py_tree, self.ast_dump)
+        source_map = self.module.create_source_map() if self.source_maps else None
+        self.module.save_js(lambda stream: self.transpiler.write(stream, source_map), source_map)
+        self.module.save_info(self.module_info, self.objects_data)
+
+
+# Результаты, доступные дочерним процессам после fork без передачи деревьев через pickle
+_module_outputs: list[ModuleOutput] = []
+
+
+def _save_module_output(index: int):
+    _module_outputs[index].save()
+
+
+def can_save_in_parallel(jobs: int) -> bool:
+    return jobs > 1
+
+
+def can_fork() -> bool:
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def save_module_outputs(module_outputs: list[ModuleOutput], jobs: int = 1):
+    """
+    Генерация js-кода и сохранение файлов модулей. При `jobs > 1` работа распределяется по процессам
+    `ProcessPoolExecutor`. Дочерние процессы создаются через fork и получают деревья модулей без сериализации,
+    а обратно возвращают только признак завершения, поэтому результат совпадает с последовательной сборкой.
+    Если fork недоступен, модули генерируются в потоках `ThreadPoolExecutor`.
+    """
+    global _module_outputs
+
+    if not can_save_in_parallel(jobs) or len(module_outputs) < 2:
+        for module_output in module_outputs:
+            module_output.save()
+        return
+
+    if not can_fork():
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(ModuleOutput.save, module_outputs))
+        return
+
+    _module_outputs = module_outputs
+    try:
+        mp_context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as executor:
+            list(executor.map(_save_module_output, range(len(module_outputs))))
+    finally:
+        _module_outputs = []
@@ -0,0 +1,115 @@
+import ast
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from typhon import js_ast
+from typhon.js_visitor import JSNodeVisitor
+from typhon.types import ModulePath
+
+
+@dataclass
+class ProfileEvent:
+    """Замер фазы сборки: время начала отсчитывается от создания профилировщика, время в секундах"""
+    name: str
+    module_path: ModulePath | None
+    start_time: float
+    duration: float
+
+
+class JSNodeCounter(JSNodeVisitor):
+    def __init__(self):
+        self.count = 0
+
+    def generic_visit(self, node: js_ast.JSNode):
+        self.count += 1
+        super().generic_visit(node)
+
+
+def count_py_nodes(py_tree: ast.AST) -> int:
+    return sum(1 for _ in ast.walk(py_tree))
+
+
+def count_js_nodes(js_tree: js_ast.JSNode) -> int:
+    counter = JSNodeCounter()
+    counter.visit(js_tree)
+    return counter.count
+
+
+class Profiler:
+    """Класс `Profiler` собирает данные о сборке:
+        - Время каждой фазы, общее и по модулям (`phase`)
+        - Счётчики: вызовы парсера, чтения и записи файлов, количество узлов AST (`count`)
+
+    Выключенный профилировщик (`enabled=False`) ничего не записывает, поэтому вызовы его методов можно оставлять
+    в коде сборки без проверок. Результат сохраняется как отчёт (`report`) или в формате Chrome trace events
+    (`trace_events`), который открывается в chrome://tracing и Perfetto.
+
+    Фазы, выполняемые в дочерних процессах (`jobs > 1`), отдельно не записываются: их время входит
+    в фазу, которая их запускает.
+    """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events: list[ProfileEvent] = []
+        self.counters: dict[str, int] = {}
+        self.start_time = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str, module_path: ModulePath = None) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+            self.events.append(ProfileEvent(name, module_path, start_time - self.start_time, end_time - start_time))
+
+    def count(self, name: str, value: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """Суммарное время и количество вызовов каждой фазы, время фаз по модулям и счётчики"""
+        phases = {}
+        modules = {}
+        for event in self.events:
+            phase = phases.setdefault(event.name, {'time': 0.0, 'calls': 0})
+            phase['time'] += event.duration
+            phase['calls'] += 1
+            if event.module_path is not None:
+                module_phases = modules.setdefault(event.module_path.full_path, {})
+                module_phases[event.name] = module_phases.get(event.name, 0.0) + event.duration
+        return {'phases': phases, 'modules': modules, 'counters': dict(self.counters)}
+
+    def trace_events(self) -> dict:
+        """Фазы в виде завершённых событий (`"ph": "X"`) формата Chrome trace events, время в микросекундах"""
+        pid = os.getpid()
+        events = []
+        for event in self.events:
+            trace_event = {
+                'name': event.name if event.module_path is None else f'{event.name} {event.module_path.full_path}',
+                'cat': event.name,
+                'ph': 'X',
+                'ts': round(event.start_time * 1e6, 3),
+                'dur': round(event.duration * 1e6, 3),
+                'pid': pid,
+                'tid': 0,
+            }
+            if event.module_path is not None:
+                trace_event['args'] = {'module': event.module_path.full_path}
+            events.append(trace_event)
+        # Счётчики записываются одним событием в момент окончания последней фазы
+        end_time = max((event.start_time + event.duration for event in self.events), default=0.0)
+        events.append({'name': 'counters', 'ph': 'C', 'ts': round(end_time * 1e6, 3), 'pid': pid,
+                       'args': dict(self.counters)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, file_name: str, trace: bool = False):
+        with open(file_name, 'w') as f:
+            json.dump(self.trace_events() if trace else self.report(), f, indent=2)
@@ -1,136 +1,614 @@
-import ast
 import os
+from dataclasses import dataclass, field
 
+from typhon import js_ast
+from typhon.exceptions import TyphonImportError
+from typhon.bundler import Bundler, find_module_path
+from typhon.file_writer import FileWriter
 from typhon.object_collector import ObjectModule, ObjectCollector, ObjectInfo, ObjectReference, \
     ObjectFunction, get_object_by_path
-from typhon.import_graph import ImportGraph
-from typhon.module_info import ModuleInfo
-from typhon.module import Module, get_module_from_file
+from typhon.import_graph import ImportGraph, sort_modules
+from typhon.module_info import ModuleInfo, get_source_hash, get_export_signature, serialize_objects
+from typhon.module import Module, AstDumpOptions, get_module_from_file
+from typhon.module_cache import ModuleCache
+from typhon.module_store import ModuleStore
+from typhon.parallel import ModuleOutput, save_module_outputs, can_save_in_parallel
+from typhon.profiler import Profiler
 from typhon.source_manager import SourceManager
+from typhon.tree_shaker import TreeShaker
 from typhon.types import ModulePath
 from typhon.module_transpiler import ModuleTranspiler
 
 
+@dataclass
+class EntrySummary:
+    """Результат транспиляции точки входа при пакетной сборке"""
+    module_path: ModulePath
+    target_file_name: str
+    modules: list[ModulePath] = field(default_factory=list)
+
+
 class Project:
     """Центральный компонент системы транспиляции. Он отвечает за:
         - Управление графом импортов
         - Управление кэшем и исходными файлами
         - Транспиляцию модулей и связанных с ними модулей
         - Управление информацией о модулях
+
+    В инкрементальном режиме (`incremental=True`) модули, исходный код которых не изменился и сигнатуры экспорта
+    зависимостей которых совпадают с сохранёнными в `.ty_cache`, не транспилируются повторно: их объекты
+    загружаются из кэша, а ранее сгенерированный js-файл остаётся без изменений.
+
+    При `jobs > 1` генерация и сохранение связанных модулей выполняются в нескольких процессах.
+
+    При `source_maps=True` рядом с каждым js-файлом сохраняется source map (`.js.map`).
+    При `minify=True` js-код генерируется в минифицированном виде.
+
+    При `tree_shaking=True` все модули сначала преобразуются, затем из модулей, кроме точек входа, удаляются
+    объекты, недостижимые из точек входа (`TreeShaker`), и только после этого генерируется js-код.
+    Инкрементальный режим при этом не используется: набор используемых объектов модуля зависит
+    от модулей, которые его импортируют.
+
+    `transpile_bundle` дополнительно объединяет все модули проекта в один файл сборки.
+
+    Несколько точек входа транспилируются за одну сборку (`transpile_files`): граф импортов строится
+    один раз для всех точек входа, и каждый достижимый модуль собирается и транспилируется один раз.
+
+    Выходные файлы перезаписываются, только если их содержимое изменилось (`FileWriter`), поэтому сборка
+    без изменений не меняет файлы. Созданные директории запоминаются на время одной сборки.
+
+    При `out_dir` js-файлы, source maps и файлы сборки сохраняются в отдельную директорию, при `cache_dir` —
+    кэш модулей. Структура пакетов проекта в них повторяется, а пути импортов в js-коде задаются относительно
+    импортирующего модуля, поэтому выходные файлы одинаково работают в любой из этих раскладок.
+
+    Python AST модулей сохраняется в кэше только при переданных настройках `ast_dump` (см. `AstDumpOptions`).
+
+    При `profile=True` время фаз сборки по модулям и счётчики (чтения, записи, вызовы парсера, узлы AST)
+    собираются в `profiler` и сохраняются через `save_profile_report`.
     """
-    def __init__(self, source_path: str = None):
-        self.source_manager = SourceManager(source_path)
+    def __init__(self, source_path: str = None, incremental: bool = False, jobs: int = 1, source_maps: bool = False,
+                 minify: bool = False, tree_shaking: bool = False, profile: bool = False,
+                 ast_dump: AstDumpOptions = None, out_dir: str = None, cache_dir: str = None):
+        self.source_manager = SourceManager(source_path, out_dir=out_dir, cache_dir=cache_dir)
         self.module_info_list = {}
         self.root_object = ObjectModule(ModulePath(''))
         self.modules: list[ModulePath] = []
         self.main_source = ''
+        self.module_store = ModuleStore(self.source_manager)
+        self.incremental = incremental
+        self.jobs = jobs
+        self.source_maps = source_maps
+        self.minify = minify
+        self.tree_shaking = tree_shaking
+        self.module_cache: ModuleCache | None = None
+        self.import_graph: dict[ModulePath, list[ModulePath]] = {}
+        self.object_paths: dict[int, str] = {}
+        self.registered_objects: list[ObjectInfo] = []
+        self.export_signatures: dict[ModulePath, str] = {}
+        self.js_trees: dict[ModulePath, js_ast.JSModule] = {}
+        self.reused_modules: list[ModulePath] = []
+        self.reused_module_infos: dict[ModulePath, ModuleInfo] = {}
+        self.main_module: Module | None = None
+        self.profiler = Profiler(enabled=profile)
+        self.ast_dump = ast_dump
+        self.file_writer = FileWriter(self.profiler)
 
     def transpile_source(self, source: str) -> str:
         """
         Транспиляция переданного исходного кода. В ответе возвращается js-код.
         """
-        module = Module(source_manager=self.source_manager)
-        self.main_source = source
-        return self.transpile_main_module(module, '__main__')
+        module = Module(source_manager=self.source_manager, profiler=self.profiler)
+        self.module_store = ModuleStore(self.source_manager)
+        self.main_source = self.module_store.add_source(module.module_path, source).source
+        return self.transpile_main_module(module, '__main__', return_code=True)
 
     def transpile_file(self, source_file_path: str) -> str:
         """
         Транспиляция файла с исходным кодом. В ответ возвращается путь к оттранспилированному js-файлу.
         """
         source_file_path = os.path.join(self.source_manager.project_path, source_file_path)
-        module = get_module_from_file(source_file_path)
-        self.main_source = module.get_source()
+        module = get_module_from_file(source_file_path, self.profiler, source_manager=self.source_manager)
+        self.module_store = ModuleStore(self.source_manager)
+        self.main_source = self.module_store.add_module(module).source
         self.transpile_main_module(module, module.module_name)
         return module.target_file_name
 
-    def transpile_main_module(self, module, module_name):
-        self.get_sorted_modules_from_source(self.main_source, module_name)
-        self.collect_project_objects()
-        self.transpile_related_modules()
-        return self.transpile_module(module, self.main_source)
+    def transpile_files(self, source_file_paths: list[str]) -> list[EntrySummary]:
+        """
+        Транспиляция нескольких точек входа: файлов или всех файлов указанных директорий.
+        Пути к модулям точек входа определяются относительно директории проекта.
+        Возвращает для каждой точки входа путь к js-файлу и модули, которые из неё достижимы.
+        Если исходных файлов не найдено, выбрасывается `TyphonImportError`.
+        """
+        entry_module_paths = []
+        for source_file_path in source_file_paths:
+            source_file_path = os.path.join(self.source_manager.project_path, source_file_path)
+            for file_path in self.source_manager.find_source_files(source_file_path):
+                module_path = self.source_manager.get_module_path(file_path)
+                if module_path not in entry_module_paths:
+                    entry_module_paths.append(module_path)
+        if not entry_module_paths:
+            raise TyphonImportError(f'No source files found in {", ".join(source_file_paths)}')
+
+        self.module_store = ModuleStore(self.source_manager)
+        self.main_source = ''
+        self.reset_build()
+        self.main_module = None
+        with self.profiler.phase('build'):
+            import_graph = ImportGraph(None, source_manager=self.source_manager, main_module_name=None,
+                                       module_store=self.module_store, module_cache=self.module_cache,
+                                       entry_module_paths=entry_module_paths, profiler=self.profiler)
+            self.import_graph = import_graph.get_graph()
+            self.modules = import_graph.sorted_modules
+            if self.tree_shaking:
+                self.transpile_modules_with_tree_shaking(entry_module_paths)
+            else:
+                self.transpile_modules()
+
+        entry_summaries = []
+        for module_path in entry_module_paths:
+            reachable_modules, _ = sort_modules(self.import_graph, module_path)
+            module = self.create_module(module_path)
+            entry_summaries.append(EntrySummary(module_path, module.target_file_name, reachable_modules))
+        return entry_summaries
+
+    def transpile_bundle(self, source_file_path: str) -> str:
+        """
+        Транспиляция файла в один ES-модуль, содержащий все модули проекта в порядке зависимостей.
+        В ответ возвращается путь к файлу сборки.
+        """
+        self.transpile_file(source_file_path)
+        main_module = self.main_module
+        bundler = Bundler(self.modules, self.get_js_trees(), main_module.module_path)
+        with self.profiler.phase('bundle'):
+            with self.file_writer.open(main_module.bundle_file_name) as f:
+                bundler.write(f, minify=self.minify)
+        return main_module.bundle_file_name
+
+    def transpile_main_module(self, module, module_name, return_code: bool = False):
+        self.reset_build()
+        self.main_module = module
+        module.file_writer = self.file_writer
+        with self.profiler.phase('build'):
+            self.get_sorted_modules_from_source(self.main_source, module_name)
+            if self.tree_shaking:
+                return self.transpile_modules_with_tree_shaking([module.module_path], return_code=return_code)
+            self.transpile_modules(module.module_path)
+            return self.transpile_module(module, return_code=return_code)
+
+    def reset_build(self):
+        """Сброс состояния предыдущей сборки"""
+        is_incremental = self.incremental and not self.tree_shaking
+        self.module_cache = ModuleCache(self.source_manager, self.module_store) if is_incremental else None
+        self.object_paths = {}
+        self.registered_objects = []
+        self.export_signatures = {}
+        self.js_trees = {}
+        self.reused_modules = []
+        self.reused_module_infos = {}
+        self.file_writer = FileWriter(self.profiler)
+
+    def transpile_modules(self, main_module_path: ModulePath = None):
+        """
+        Сбор объектов и транспиляция модулей графа импортов в порядке зависимостей.
+        Главный модуль, если он указан, только собирается: его транспилирует вызывающий код.
+        """
+        if self.module_cache:
+            self.transpile_related_modules_incrementally(main_module_path)
+        else:
+            self.collect_project_objects()
+            if can_save_in_parallel(self.jobs):
+                self.transpile_related_modules_in_parallel(main_module_path)
+            else:
+                self.transpile_related_modules(main_module_path)
+
+    def rebuild_modules(self, changed_module_paths: list[ModulePath]) -> list[ModulePath]:
+        """
+        Повторная транспиляция изменившихся модулей и всех модулей, которые их импортируют (напрямую или
+        через другие модули), после предыдущей сборки. Объекты остальных модулей берутся из дерева объектов
+        проекта без повторного сбора. Возвращает пересобранные модули в порядке зависимостей.
+        """
+        main_module = self.main_module
+        self.invalidate_modules(changed_module_paths)
+        if main_module.module_path in changed_module_paths:
+            self.main_source = self.module_store.add_module(main_module).source
+        rebuilt_modules, _ = self.rebuild_affected_modules(changed_module_paths)
+        return rebuilt_modules
+
+    def rebuild_source(self, source: str, changed_module_paths: list[ModulePath] = None) -> str:
+        """
+        Повторная транспиляция исходного кода после `transpile_source`. Пересобираются главный модуль,
+        переданные изменившиеся модули и модули, которые их импортируют; остальные модули не читаются
+        и не собираются заново. В ответе возвращается js-код.
+        """
+        main_module = self.main_module
+        changed_module_paths = list(changed_module_paths or []) + [main_module.module_path]
+        self.invalidate_modules(changed_module_paths)
+        self.main_source = self.module_store.add_source(main_module.module_path, source).source
+        _, target_code = self.rebuild_affected_modules(changed_module_paths, return_code=True)
+        return target_code
+
+    def invalidate_modules(self, changed_module_paths: list[ModulePath]):
+        self.file_writer = self.main_module.file_writer = FileWriter(self.profiler)
+        for module_path in changed_module_paths:
+            self.module_store.invalidate(module_path)
+            if self.module_cache:
+                self.module_cache.invalidate(module_path)
+
+    def rebuild_affected_modules(self, changed_module_paths: list[ModulePath],
+                                 return_code: bool = False) -> tuple[list[ModulePath], str | None]:
+        """
+        Пересборка изменившихся модулей и модулей, которые их импортируют. При `return_code=True`
+        дополнительно возвращается js-код главного модуля
+        """
+        main_module = self.main_module
+        if self.tree_shaking:
+            # Набор используемых объектов зависит от всех модулей, поэтому проект собирается заново
+            target_code = self.transpile_main_module(main_module, main_module.module_name, return_code=return_code)
+            return list(self.modules), target_code
+
+        previous_modules = set(self.modules)
+        self.get_sorted_modules_from_source(self.main_source, main_module.module_name)
+        new_modules = [module_path for module_path in self.modules if module_path not in previous_modules]
+        affected_modules = self.get_dependent_modules(list(changed_module_paths) + new_modules)
 
-    def transpile_related_modules(self):
+        rebuilt_modules = []
+        target_code = None
         for module_path in self.modules:
-            if module_path.package == '' and module_path.name == '__main__':
+            if module_path not in affected_modules:
                 continue
-            module = Module(module_path, self.source_manager)
+            is_main_module = module_path == main_module.module_path
+            module = main_module if is_main_module else self.create_module(module_path)
+            module_object = self.collect_objects_from_module(module)
+            self.resolve_module_references(module_object)
+            module_code = self.transpile_module(module, return_code=return_code and is_main_module)
+            if is_main_module:
+                target_code = module_code
+            rebuilt_modules.append(module_path)
+        return rebuilt_modules, target_code
+
+    def get_dependent_modules(self, module_paths: list[ModulePath]) -> set[ModulePath]:
+        """Переданные модули и все модули, которые их импортируют, по обратным рёбрам графа импортов"""
+        importers: dict[ModulePath, list[ModulePath]] = {}
+        for module_path, imports in self.import_graph.items():
+            for imported_module_path in imports:
+                importers.setdefault(imported_module_path, []).append(module_path)
+
+        dependent_modules = set()
+        queue = list(module_paths)
+        while queue:
+            module_path = queue.pop()
+            if module_path in dependent_modules:
+                continue
+            dependent_modules.add(module_path)
+            queue.extend(importers.get(module_path, []))
+        return dependent_modules
+
+    def transpile_related_modules(self, main_module_path: ModulePath = None):
+        for module_path in self.modules:
+            if module_path == main_module_path:
+                continue
+            module = self.create_module(module_path)
             self.transpile_module(module)
 
-    def get_sorted_modules_from_source(self, source: str, main_module_name: str) -> list[ModulePath]:
-        self.modules = []
+    def transpile_related_modules_in_parallel(self, main_module_path: ModulePath = None):
+        """
+        Преобразование модулей изменяет общее дерево объектов проекта, поэтому выполняется последовательно
+        в порядке зависимостей. Генерация js-кода и сохранение файлов не зависят от других модулей
+        и распределяются по процессам.
+        """
+        module_outputs = self.transform_modules(main_module_path)
+        with self.profiler.phase('save_modules'):
+            save_module_outputs(module_outputs, self.jobs)
 
-        import_graph = ImportGraph(source, source_manager=self.source_manager, main_module_name=main_module_name)
-        graph = import_graph.get_graph()
+    def transform_modules(self, skipped_module_path: ModulePath = None) -> list[ModuleOutput]:
+        """
+        Преобразование модулей графа импортов в порядке зависимостей, кроме `skipped_module_path`.
+        Js-код не генерируется: возвращаются данные для генерации и сохранения модулей
+        """
+        module_outputs = []
+        for module_path in self.modules:
+            if module_path == skipped_module_path:
+                continue
+            module = self.main_module if self.main_module and module_path == self.main_module.module_path \
+                else self.create_module(module_path)
+            transpiler = self.get_module_transpiler(module)
+            try:
+                transpiler.convert()
+                transpiler.transform()
+            except Exception:
+                module.dump_ast(transpiler.py_tree, self.ast_dump)
+                raise
+            objects_data = self.update_module_info(module, transpiler)
+            module_info = self.module_info_list[module.module_name]
+            module_outputs.append(ModuleOutput(module, transpiler, module_info, objects_data, self.source_maps,
+                                               self.ast_dump))
+        return module_outputs
 
-        def add_modules(module_path: ModulePath):
-            nonlocal graph
+    def transpile_modules_with_tree_shaking(self, entry_module_paths: list[ModulePath],
+                                            return_code: bool = False) -> str | None:
+        """
+        Преобразование всех модулей графа импортов, удаление неиспользуемых объектов и сохранение модулей.
+        При `return_code=True` возвращается js-код главного модуля.
+        """
+        self.collect_project_objects()
+        module_outputs = self.transform_modules()
+        with self.profiler.phase('tree_shaking'):
+            TreeShaker(self.modules, self.js_trees, entry_module_paths).shake()
+
+        target_code = None
+        if return_code:
+            main_output = next(module_output for module_output in module_outputs
+                               if module_output.module is self.main_module)
+            module_outputs.remove(main_output)
+            main_output.module.dump_ast(main_output.transpiler.py_tree, self.ast_dump)
+            source_map = main_output.module.create_source_map() if self.source_maps else None
+            target_code = main_output.transpiler.generate(source_map)
+            main_output.module.save_js(target_code, source_map)
+            main_output.module.save_info(main_output.module_info, main_output.objects_data)
+        with self.profiler.phase('save_modules'):
+            save_module_outputs(module_outputs, self.jobs)
+        return target_code
+
+    def transpile_related_modules_incrementally(self, main_module_path: ModulePath = None):
+        """
+        Обход модулей в порядке зависимостей: актуальные модули загружаются из кэша,
+        остальные заново собираются и транспилируются. Главный модуль только собирается.
+        """
+        for module_path in self.modules:
+            module = self.create_module(module_path)
+            module_info = self.module_cache.get_info(module_path)
+            if module_path != main_module_path and self.is_module_info_actual(module, module_info):
+                self.load_objects_from_module_info(module, module_info)
+                self.reused_modules.append(module_path)
+                continue
 
-            if module_path in self.modules:
-                return
+            module_object = self.collect_objects_from_module(module)
+            self.resolve_module_references(module_object)
+            if module_path != main_module_path:
+                self.transpile_module(module)
 
-            modules = graph.get(module_path.module_path, [])
-            for module in modules:
-                add_modules(module)
-            self.modules.append(module_path)
+    def is_module_info_actual(self, module: Module, module_info: ModuleInfo | None) -> bool:
+        """
+        Проверка, что сохранённая информация о модуле и его js-файл могут быть использованы повторно.
+        Js-файл, сохранённый с другими настройками генерации, или отсутствующий source map требуют
+        повторной транспиляции модуля
+        """
+        if module_info is None or not os.path.exists(module.target_file_name):
+            return False
+        if module_info.build_options != self.build_options:
+            return False
+        if self.source_maps and not os.path.exists(module.source_map_file_name):
+            return False
+
+        dependencies = {
+            module_path.full_path: self.export_signatures.get(module_path)
+            for module_path in module_info.imports
+        }
+        return dependencies == module_info.dependencies
 
-        add_modules(ModulePath(main_module_name))
+    def load_objects_from_module_info(self, module: Module, module_info: ModuleInfo):
+        module_object = self.add_module_object(module.module_path)
+        if module_info.objects:
+            module_object.objects.update(module_info.objects.objects)
+        self.register_module_objects(module_object)
+        self.resolve_module_references(module_object)
 
-    def transpile_module(self, module: Module, source: str = None):
-        transpiler = ModuleTranspiler(source or module.get_source(), self.root_object, module.module_path)
+        module_info.objects = module_object
+        self.export_signatures[module.module_path] = module_info.export_signature
+        self.reused_module_infos[module.module_path] = module_info
+        self.module_info_list[module.module_name] = module_info
+
+    def get_js_trees(self) -> dict[ModulePath, js_ast.JSModule]:
+        """
+        Деревья js-кода всех модулей сборки. Деревья модулей, загруженных из кэша, распаковываются
+        только здесь, при первом обращении.
+        """
+        for module_path, module_info in self.reused_module_infos.items():
+            if module_path not in self.js_trees:
+                self.js_trees[module_path] = module_info.get_js_tree()
+        return self.js_trees
+
+    def get_sorted_modules_from_source(self, source: str, main_module_name: str) -> list[ModulePath]:
+        import_graph = ImportGraph(source, source_manager=self.source_manager, main_module_name=main_module_name,
+                                   module_store=self.module_store, module_cache=self.module_cache,
+                                   profiler=self.profiler)
+        self.import_graph = import_graph.get_graph()
+        self.modules = import_graph.sorted_modules
+        return self.modules
+
+    def transpile_module(self, module: Module, source: str = None, return_code: bool = False) -> str | None:
+        """
+        Транспиляция модуля. Js-код записывается в файл по мере генерации и возвращается
+        только при `return_code=True`
+        """
+        transpiler = self.get_module_transpiler(module, source)
         try:
-            target_code = transpiler.transpile()
+            transpiler.convert()
+            transpiler.transform()
         finally:
-            module.dump_ast(transpiler.py_tree)
+            module.dump_ast(transpiler.py_tree, self.ast_dump)
+
+        objects_data = self.update_module_info(module, transpiler)
+        source_map = module.create_source_map() if self.source_maps else None
+        target_code = None
+        if return_code:
+            target_code = transpiler.generate(source_map)
+            module.save_js(target_code, source_map)
+        else:
+            module.save_js(lambda stream: transpiler.write(stream, source_map), source_map)
+        module.save_info(self.module_info_list[module.module_name], objects_data)
+        return target_code
 
-        module_info = ModuleInfo(objects=transpiler.module_object, js_tree=transpiler.js_tree)
-        module.save_js(target_code)
-        module.save_info(module_info)
+    def get_module_transpiler(self, module: Module, source: str = None) -> ModuleTranspiler:
+        if source is None:
+            parsed_module = self.module_store.get(module.module_path)
+        else:
+            parsed_module = self.module_store.add_source(module.module_path, source)
+        return ModuleTranspiler(parsed_module.source, self.root_object, module.module_path,
+                                py_tree=parsed_module.py_tree, minify=self.minify, profiler=self.profiler)
 
+    @property
+    def build_options(self) -> dict[str, bool]:
+        """
+        Настройки, от которых зависит сгенерированный js-код модулей. Модули, сохранённые после tree shaking,
+        содержат только объекты, используемые точками входа той сборки, поэтому повторно не используются
+        """
+        return {'minify': self.minify, 'source_maps': self.source_maps, 'tree_shaking': self.tree_shaking}
+
+    def create_module(self, module_path: ModulePath) -> Module:
+        return Module(module_path, self.source_manager, profiler=self.profiler, file_writer=self.file_writer)
+
+    def update_module_info(self, module: Module, transpiler: ModuleTranspiler) -> dict:
+        """Обновление информации о преобразованном модуле. Возвращает сериализованные объекты модуля"""
+        imports = self.import_graph.get(module.module_path, [])
+        self.set_import_paths(module.module_path, transpiler.js_tree, imports)
+        dependencies = {
+            module_path.full_path: self.export_signatures.get(module_path) for module_path in imports
+        }
+        objects_data = serialize_objects(transpiler.module_object, self.object_paths)
+        export_signature = get_export_signature(objects_data, dependencies)
+        module_info = ModuleInfo(
+            objects=transpiler.module_object,
+            js_tree=transpiler.js_tree,
+            source_hash=get_source_hash(transpiler.source),
+            imports=imports,
+            dependencies=dependencies,
+            export_signature=export_signature,
+            build_options=self.build_options,
+        )
+        self.export_signatures[module.module_path] = export_signature
+        self.js_trees[module.module_path] = transpiler.js_tree
         self.module_info_list[module.module_name] = module_info
-        return target_code
+        return objects_data
+
+    def set_import_paths(self, module_path: ModulePath, js_tree: js_ast.JSModule, imports: list[ModulePath]):
+        """Пути к js-файлам импортируемых модулей проекта относительно модуля `module_path`"""
+        for node in js_tree.body:
+            if not isinstance(node, js_ast.JSImport):
+                continue
+            imported_module_path = find_module_path(node.module, imports)
+            if imported_module_path is not None:
+                node.path = self.source_manager.get_import_path(module_path, imported_module_path)
 
     def collect_project_objects(self):
         """Собирает информацию по всем объектам проекта"""
 
         for module_path in self.modules:
-            module = Module(module_path, self.source_manager)
+            module = self.create_module(module_path)
             module_info = self.collect_objects_from_module(module)
             # Обход и замена ссылок на объект в модуле без учёта локальных переменных функций
-            self.replace_references_to_objects(module_info)
+            with self.profiler.phase('resolve_references', module_path):
+                self.replace_references_to_objects(module_info)
         # Обход и замена всех остальных ссылок
-        self.replace_references_to_objects(self.root_object, with_locals=True)
+        with self.profiler.phase('resolve_references'):
+            self.replace_references_to_objects(self.root_object, with_locals=True)
 
     def collect_objects_from_module(self, module: Module) -> ObjectModule:
         """Сбор объектов из модуля"""
-        module_info = ObjectModule(module.module_path)
+        py_tree = self.module_store.get(module.module_path).py_tree
+        with self.profiler.phase('collect_objects', module.module_path):
+            module_info = self.add_module_object(module.module_path)
+            collector = ObjectCollector(module_info)
+            collector.visit(py_tree)
+            self.register_module_objects(module_info)
+
+        return module_info
+
+    def resolve_module_references(self, module_object: ObjectModule):
+        """Замена ссылок на объекты в модуле, включая локальные переменные функций"""
+        with self.profiler.phase('resolve_references', module_object.module_path):
+            self.replace_references_to_objects(module_object)
+            self.replace_references_to_objects(module_object, with_locals=True)
+
+    def add_module_object(self, module_path: ModulePath) -> ObjectModule:
+        """Создание пустого объекта модуля в дереве объектов проекта"""
+        module_object = ObjectModule(module_path)
 
         # Получение объекта пакета для текущего пути модуля
         package_module_object = self.root_object
-        for package in module.module_path.packages:
+        for package in module_path.packages:
             if not package in package_module_object.objects:
-                package_module_object.objects[package] = ObjectModule(package_module_object.module_path + [package])
-            package_module_object = package_module_object[package]
+                package_object = ObjectModule(package_module_object.module_path + [package])
+                package_module_object.objects[package] = package_object
+                self.register_object_path(package_object, package_object.module_path.full_path.lstrip('.'))
+            package_module_object = package_module_object.objects[package]
 
-        package_module_object.objects[module.module_name] = module_info
-        collector = ObjectCollector(module_info)
+        previous_module_object = package_module_object.objects.get(module_path.name)
+        if isinstance(previous_module_object, ObjectModule):
+            self.unregister_module_objects(previous_module_object)
+        package_module_object.objects[module_path.name] = module_object
+        return module_object
 
-        if module.module_path.name == '__main__':
-            source = self.main_source
-        else:
-            source = module.get_source()
-        collector.visit(ast.parse(source))
+    def unregister_module_objects(self, module_object: ObjectModule):
+        """Удаление путей к объектам модуля, который заменяется при повторной сборке"""
+        module_full_path = module_object.module_path.full_path
+        if self.object_paths.get(id(module_object)) == module_full_path:
+            del self.object_paths[id(module_object)]
+        for object_name, object_item in module_object.objects.items():
+            if self.object_paths.get(id(object_item)) == f'{module_full_path}.{object_name}':
+                del self.object_paths[id(object_item)]
 
-        return module_info
+    def register_module_objects(self, module_object: ObjectModule):
+        """
+        Запоминание путей к объектам верхнего уровня модуля. При сохранении информации о других модулях
+        эти объекты записываются как ссылки, а не копируются.
+        """
+        module_full_path = module_object.module_path.full_path
+        self.register_object_path(module_object, module_full_path)
+        for object_name, object_item in module_object.objects.items():
+            if object_item is None or isinstance(object_item, ObjectReference) or id(object_item) in self.object_paths:
+                continue
+            self.register_object_path(object_item, f'{module_full_path}.{object_name}')
+
+    def register_object_path(self, object_info: ObjectInfo, object_path: str):
+        """
+        Пути хранятся по `id` объектов. Объект может быть заменён в дереве при преобразовании модуля,
+        поэтому ссылка на него сохраняется до конца сборки, чтобы его `id` не получил другой объект.
+        """
+        self.object_paths[id(object_info)] = object_path
+        self.registered_objects.append(object_info)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Количество чтений исходных файлов и вызовов парсера за последнюю сборку"""
+        return {
+            'read_count': self.module_store.read_count,
+            'parse_count': self.module_store.parse_count,
+            'reused_count': len(self.reused_modules),
+        }
+
+    def save_profile_report(self, file_name: str, trace: bool = False):
+        """
+        Сохранение собранных при `profile=True` данных в JSON: отчёта по фазам, модулям и счётчикам
+        либо, при `trace=True`, событий в формате Chrome trace events
+        """
+        self.profiler.counters.update(self.stats)
+        self.profiler.save(file_name, trace=trace)
+
+    def replace_references_to_objects(self, object_info: ObjectInfo, with_locals: bool = False,
+                                      visited: set[int] = None):
+        """
+        Замена ссылок на объекты найденными объектами. Каждый объект обходится один раз: модули,
+        импортированные несколькими модулями, достижимы по многим путям дерева объектов.
+        """
+        if visited is None:
+            visited = set()
+        if id(object_info) in visited:
+            return
+        visited.add(id(object_info))
 
-    def replace_references_to_objects(self, object_info: ObjectInfo, with_locals: bool = False):
         for object_name, object_item in object_info.objects.items():
+            if object_item is None:
+                # Значение, которое не удалось определить при сборе объектов
+                continue
             if isinstance(object_item, ObjectReference):
                 object_ref = self.find_reference(object_item)
                 object_info.objects[object_name] = object_ref
             elif with_locals and isinstance(object_item, ObjectFunction):
-                self.replace_references_to_objects(object_item.locals, with_locals=with_locals)
+                self.replace_references_to_objects(object_item.locals, with_locals=with_locals, visited=visited)
             else:
-                self.replace_references_to_objects(object_item, with_locals=with_locals)
+                self.replace_references_to_objects(object_item, with_locals=with_locals, visited=visited)
 
     def find_reference(self, object_info: ObjectReference) -> ObjectInfo:
         path_to_object = get_object_by_path(self.root_object, object_info.object_value)
@@ -0,0 +1,204 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+from typing import Optional
+
+from typhon.exceptions import TranspileServerError
+from typhon.module import AstDumpOptions
+from typhon.project import Project
+from typhon.types import ModulePath
+from typhon.watcher import Watcher
+
+
+DEFAULT_SOCKET_PATH = '.typhon.sock'
+
+
+class TranspileServer(socketserver.UnixStreamServer):
+    """Класс `TranspileServer` — долгоживущий процесс транспиляции:
+        - Хранит собранные проекты (граф импортов, дерево объектов, разобранные модули) между запросами
+        - Принимает запросы через Unix-сокет, по одному JSON-объекту на строку
+        - При повторном запросе транспилирует только изменившиеся модули и модули, которые их импортируют
+        - Для транспиляции исходного кода (`transpile_source`) хранит проект для каждой директории проекта:
+          импортируемые модули, файлы которых не изменились, повторно не читаются и не собираются
+
+    Запросы обрабатываются последовательно, так как проекты изменяются при каждой сборке.
+    """
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, project_path: str = None,
+                 incremental: bool = False, jobs: int = 1, source_maps: bool = False, minify: bool = False,
+                 tree_shaking: bool = False, ast_dump: AstDumpOptions = None, out_dir: str = None,
+                 cache_dir: str = None):
+        self.socket_path = socket_path
+        self.project_path = project_path
+        self.incremental = incremental
+        self.jobs = jobs
+        self.source_maps = source_maps
+        self.minify = minify
+        self.tree_shaking = tree_shaking
+        self.ast_dump = ast_dump
+        self.out_dir = out_dir
+        self.cache_dir = cache_dir
+        self.watchers: dict[str, Watcher] = {}
+        self.source_watchers: dict[str | None, Watcher] = {}
+        self.is_stopped = False
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, TranspileRequestHandler)
+
+    def serve(self):
+        """Обработка запросов до получения команды `shutdown`"""
+        try:
+            while not self.is_stopped:
+                self.handle_request()
+        finally:
+            self.server_close()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def handle_command(self, request: dict) -> dict:
+        command = request.get('command')
+        if command == 'ping':
+            return {}
+        if command == 'transpile':
+            return self.transpile_file(request['source'])
+        if command == 'transpile_source':
+            return {'code': self.transpile_source(request['source'], request.get('project_path'))}
+        if command == 'shutdown':
+            self.is_stopped = True
+            return {}
+        raise TranspileServerError(f'Unknown command: {command}')
+
+    def transpile_file(self, source_file_path: str) -> dict:
+        """
+        Транспиляция файла. Первый запрос для файла выполняет полную сборку, следующие пересобирают
+        только модули, затронутые изменениями исходных файлов с момента предыдущего запроса.
+        """
+        watcher = self.watchers.get(source_file_path)
+        if watcher is None:
+            watcher = Watcher(self.create_project(), source_file_path)
+            target_file_name = watcher.project.transpile_file(source_file_path)
+            watcher.update_mtimes()
+            self.watchers[source_file_path] = watcher
+            rebuilt_modules = list(watcher.project.modules)
+        else:
+            target_file_name = watcher.project.main_module.target_file_name
+            rebuilt_modules = self.rebuild_modules(watcher)
+
+        return {
+            'target_file_name': target_file_name,
+            'rebuilt_modules': [module_path.full_path for module_path in rebuilt_modules],
+        }
+
+    def transpile_source(self, source: str, project_path: str = None) -> str:
+        """
+        Транспиляция исходного кода. Проект директории `project_path` (по умолчанию — директории сервера)
+        сохраняется между запросами, и следующие запросы пересобирают только главный модуль, изменившиеся
+        с предыдущего запроса модули и модули, которые их импортируют.
+        """
+        project_path = project_path or self.project_path
+        watcher = self.source_watchers.get(project_path)
+        if watcher is None:
+            watcher = Watcher(self.create_project(project_path), None)
+            target_code = watcher.project.transpile_source(source)
+            watcher.update_mtimes()
+            self.source_watchers[project_path] = watcher
+            return target_code
+
+        try:
+            return watcher.project.rebuild_source(source, watcher.get_changed_modules())
+        except Exception:
+            del self.source_watchers[project_path]
+            raise
+        finally:
+            watcher.update_mtimes()
+
+    def rebuild_modules(self, watcher: Watcher) -> list[ModulePath]:
+        changed_module_paths = watcher.get_changed_modules()
+        if not changed_module_paths:
+            return []
+
+        try:
+            return watcher.project.rebuild_modules(changed_module_paths)
+        except Exception:
+            # Состояние проекта после неудачной пересборки не определено, следующий запрос соберёт его заново
+            del self.watchers[watcher.source_file_path]
+            raise
+        finally:
+            watcher.update_mtimes()
+
+    def create_project(self, project_path: str = None) -> Project:
+        return Project(project_path or self.project_path, incremental=self.incremental, jobs=self.jobs,
+                       source_maps=self.source_maps, minify=self.minify, tree_shaking=self.tree_shaking,
+                       ast_dump=self.ast_dump, out_dir=self.out_dir, cache_dir=self.cache_dir)
+
+
+def remove_stale_socket(socket_path: str):
+    """
+    Удаление сокета, оставшегося от остановленного сервера. Если по пути находится не сокет или сокет
+    запущенного сервера, выбрасывается `TranspileServerError`
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise TranspileServerError(f'{socket_path} is not a socket')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+    raise TranspileServerError(f'Transpile server is already running on {socket_path}')
+
+
+class TranspileRequestHandler(socketserver.StreamRequestHandler):
+    server: TranspileServer
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.handle_command(json.loads(line))
+                response['ok'] = True
+            except Exception as e:
+                response = {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+def send_request(request: dict, socket_path: str = DEFAULT_SOCKET_PATH) -> dict:
+    """
+    Отправка запроса серверу транспиляции. Если сервер не запущен, выбрасывается `ConnectionError`
+    (или `FileNotFoundError`, если сокета нет), при ошибке транспиляции на сервере — `TranspileServerError`.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        with client.makefile('rwb') as stream:
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+
+    if not line:
+        raise ConnectionError('Transpile server closed the connection')
+    response = json.loads(line)
+    if not response.pop('ok', False):
+        raise TranspileServerError(response.get('error', ''))
+    return response
+
+
+def transpile_file(source_file_path: str, socket_path: str = DEFAULT_SOCKET_PATH,
+                   project: Optional[Project] = None) -> str:
+    """
+    Транспиляция файла запущенным сервером. Если сервер недоступен, файл транспилируется в текущем процессе.
+    Возвращает путь к оттранспилированному js-файлу.
+    """
+    try:
+        response = send_request({'command': 'transpile', 'source': os.path.abspath(source_file_path)}, socket_path)
+    except (ConnectionError, FileNotFoundError):
+        project = project or Project()
+        return project.transpile_file(source_file_path)
+    return response['target_file_name']
@@ -1,21 +1,90 @@
 import os.path
+import posixpath
+from typhon.exceptions import TyphonImportError
 from typhon.types import ModulePath
 
 
+CACHE_DIRECTORY_NAME = '.ty_cache'
+IGNORED_DIRECTORY_NAMES = {CACHE_DIRECTORY_NAME, '__pycache__'}
+
+
 class SourceManager:
     """Класс `SourceManager` управляет путями к исходным файлам:
         - Определение путей к пакетам
         - Проверка, является ли модуль пакетом (наличие `__init__.py`)
+        - Поиск исходных файлов в директориях и определение путей к их модулям
+        - Определение директорий для выходных файлов и кэша модулей
+
+    По умолчанию js-файлы сохраняются рядом с исходными, а кэш — в директории `.ty_cache` каждого пакета.
+    Если заданы `out_dir` и `cache_dir`, выходные файлы и кэш сохраняются в этих директориях
+    в поддиректориях, повторяющих структуру пакетов проекта.
     """
-    def __init__(self, project_path: str = None):
+    def __init__(self, project_path: str = None, out_dir: str = None, cache_dir: str = None):
         self.project_path = project_path or '.'
+        self.out_dir = out_dir
+        self.cache_dir = cache_dir
+
+    def with_project_path(self, project_path: str) -> 'SourceManager':
+        """Менеджер с другой директорией проекта и теми же директориями выходных файлов и кэша"""
+        return SourceManager(project_path, out_dir=self.out_dir, cache_dir=self.cache_dir)
 
     def get_package_path(self, package: str):
         return os.path.join(self.project_path, package)
 
+    def get_target_path(self, module_path: ModulePath) -> str:
+        """Директория js-файла модуля"""
+        if self.out_dir is None:
+            return self.get_package_path(module_path.package)
+        return os.path.join(self.out_dir, *module_path.packages)
+
+    @staticmethod
+    def get_import_path(module_path: ModulePath, imported_module_path: ModulePath) -> str:
+        """
+        Путь к js-файлу импортируемого модуля относительно js-файла модуля `module_path`.
+        Выходные файлы повторяют структуру пакетов, поэтому путь не зависит от `out_dir`
+        """
+        module_directory = posixpath.join('/', *module_path.packages)
+        imported_file_name = posixpath.join('/', *imported_module_path.packages, f'{imported_module_path.name}.js')
+        import_path = posixpath.relpath(imported_file_name, module_directory)
+        return import_path if import_path.startswith('../') else f'./{import_path}'
+
+    def get_cache_path(self, module_path: ModulePath) -> str:
+        """Директория кэша модуля"""
+        if self.cache_dir is None:
+            return os.path.join(self.get_package_path(module_path.package), CACHE_DIRECTORY_NAME)
+        return os.path.join(self.cache_dir, *module_path.packages)
+
     def is_package(self, module: ModulePath):
         full_path = os.path.join(self.project_path, *module.module_path)
         if not os.path.isdir(full_path):
             return False
         init_file = os.path.join(full_path, '__init__.py')
         return os.path.exists(init_file)
+
+    def get_module_path(self, source_file_path: str) -> ModulePath:
+        """Путь к модулю по пути к его исходному файлу относительно директории проекта"""
+        relative_path = os.path.relpath(source_file_path, self.project_path)
+        if relative_path.startswith(os.pardir):
+            raise TyphonImportError(f'File {source_file_path} is outside of the project {self.project_path}')
+
+        relative_path, _ = os.path.splitext(relative_path)
+        return ModulePath(*relative_path.split(os.sep))
+
+    def find_source_files(self, path: str) -> list[str]:
+        """
+        Исходные файлы по указанному пути: сам файл либо все `.py`-файлы директории и её поддиректорий,
+        кроме скрытых директорий и директорий кэша
+        """
+        if not os.path.isdir(path):
+            return [path]
+
+        source_files = []
+        for directory, directory_names, file_names in os.walk(path):
+            directory_names[:] = sorted(
+                name for name in directory_names
+                if not name.startswith('.') and name not in IGNORED_DIRECTORY_NAMES
+            )
+            source_files.extend(
+                os.path.join(directory, file_name) for file_name in sorted(file_names) if file_name.endswith('.py')
+            )
+        return source_files
@@ -0,0 +1,62 @@
+BASE64_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+
+def encode_vlq(value: int) -> str:
+    """Кодирование числа в Base64 VLQ, используемое в поле `mappings` source map"""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    result = ''
+    while True:
+        digit = value & 0b11111
+        value >>= 5
+        if value:
+            digit |= 0b100000
+        result += BASE64_CHARS[digit]
+        if not value:
+            return result
+
+
+class SourceMap:
+    """Класс `SourceMap` накапливает соответствия позиций js-кода позициям исходного кода
+    и формирует source map версии 3. Строки и столбцы нумеруются с нуля.
+    """
+    def __init__(self, file: str, source: str):
+        self.file = file
+        self.source = source
+        self.mappings: list[tuple[int, int, int, int]] = []
+
+    def add_mapping(self, generated_line: int, generated_column: int, source_line: int, source_column: int):
+        self.mappings.append((generated_line, generated_column, source_line, source_column))
+
+    def encode_mappings(self) -> str:
+        lines = []
+        segments = []
+        current_line = 0
+        previous_generated_column = previous_source_line = previous_source_column = 0
+        for generated_line, generated_column, source_line, source_column in self.mappings:
+            if generated_line != current_line:
+                lines.append(','.join(segments))
+                lines.extend([''] * (generated_line - current_line - 1))
+                segments = []
+                current_line = generated_line
+                previous_generated_column = 0
+
+            segments.append(
+                encode_vlq(generated_column - previous_generated_column)
+                + encode_vlq(0)
+                + encode_vlq(source_line - previous_source_line)
+                + encode_vlq(source_column - previous_source_column)
+            )
+            previous_generated_column = generated_column
+            previous_source_line = source_line
+            previous_source_column = source_column
+        lines.append(','.join(segments))
+        return ';'.join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            'version': 3,
+            'file': self.file,
+            'sources': [self.source],
+            'names': [],
+            'mappings': self.encode_mappings(),
+        }
@@ -83,12 +83,24 @@ EXPRESSION_CONVERTER_FUNCTIONS = {
 }
 
 
+def set_position(js_node: js_ast.JSNode, node: ast.AST) -> js_ast.JSNode:
+    """Сохранение позиции узла Python в узле JavaScript"""
+    lineno = getattr(node, 'lineno', None)
+    if lineno is not None:
+        js_node.lineno = lineno
+        js_node.col_offset = node.col_offset
+    return js_node
+
+
 def convert_expression(node: ast.expr) -> js_ast.JSExpression:
     """Транспиляция выражений"""
     converter_function = EXPRESSION_CONVERTER_FUNCTIONS.get(type(node), None)
     if not converter_function:
         raise InvalidNode(node=node)
-    return converter_function(node)
+    js_node = converter_function(node)
+    if js_node is not None:
+        set_position(js_node, node)
+    return js_node
 
 
 def convert_assign(node: ast.Assign) -> js_ast.JSAssign:
@@ -208,7 +220,11 @@ def convert_statement(node: ast.stmt) -> js_ast.JSStatement:
     statement_converter = STATEMENT_CONVERTER_FUNCTIONS.get(type(node))
     if not statement_converter:
         raise InvalidNode(node=node)
-    return statement_converter(node)
+    js_node = statement_converter(node)
+    if isinstance(js_node, js_ast.JSStatements):
+        for statement in js_node.statements:
+            set_position(statement, node)
+    return set_position(js_node, node)
 
 
 def convert_arg(node: ast.arg) -> js_ast.JSArg:
@@ -0,0 +1,228 @@
+from collections import deque
+from typing import Iterable
+
+from typhon import js_ast
+from typhon.bundler import find_module_path
+from typhon.js_analyzer import is_pure_expression
+from typhon.js_visitor import JSNodeVisitor
+from typhon.types import ModulePath
+
+
+class ReferenceCollector(JSNodeVisitor):
+    """Класс `ReferenceCollector` собирает имена, на которые ссылается инструкция:
+        - Имена, используемые напрямую
+        - Обращения к атрибутам через имя (`lib.g`), по которым определяются используемые объекты модулей
+    """
+    def __init__(self):
+        self.names: set[str] = set()
+        self.attributes: set[tuple[str, str]] = set()
+
+    def visit_JSName(self, node: js_ast.JSName):
+        name, _, attr = node.id.partition('.')
+        if attr:
+            self.attributes.add((name, attr.split('.')[0]))
+        else:
+            self.names.add(name)
+
+    def visit_JSAttribute(self, node: js_ast.JSAttribute):
+        if isinstance(node.value, js_ast.JSName) and '.' not in node.value.id:
+            self.attributes.add((node.value.id, node.attr))
+        else:
+            self.generic_visit(node)
+
+
+class StatementInfo:
+    """Инструкция верхнего уровня модуля: объявляемые имена, используемые имена и признак достижимости"""
+    def __init__(self, node: js_ast.JSStatement):
+        self.node = node
+        self.declared_names: list[str] = []
+        self.is_removable = False
+        self.is_live = False
+        self.imported_module: ModulePath | None = None
+        # Импортируемые объекты: имя -> (модуль, имя объекта) и пространства имён модулей: имя -> модуль
+        self.imported_objects: dict[str, tuple[ModulePath, str]] = {}
+        self.namespaces: dict[str, ModulePath] = {}
+        collector = ReferenceCollector()
+        if not isinstance(node, js_ast.JSImport):
+            collector.visit(node)
+        self.names = collector.names
+        self.attributes = collector.attributes
+
+
+class TreeShaker:
+    """Класс `TreeShaker` удаляет из модулей проекта объекты, которые не используются:
+        - Точки входа сохраняются полностью, вместе со всем экспортом
+        - В остальных модулях сохраняются инструкции с побочными эффектами
+        - Функции, классы и присваивания без побочных эффектов сохраняются, только если они достижимы
+          из сохранённых инструкций через имена модуля и импорты других модулей
+        - Экспорт модуля сокращается до сохранённых объектов
+    Деревья модулей изменяются на месте.
+    """
+    def __init__(self, modules: list[ModulePath], js_trees: dict[ModulePath, js_ast.JSModule],
+                 entry_module_paths: Iterable[ModulePath]):
+        self.modules = modules
+        self.js_trees = js_trees
+        self.entry_module_paths = set(entry_module_paths)
+        self.statements: dict[ModulePath, list[StatementInfo]] = {}
+        self.declarations: dict[ModulePath, dict[str, list[StatementInfo]]] = {}
+        self.effectful_modules: set[ModulePath] = set()
+        self.live_names: dict[ModulePath, set[str]] = {}
+        self.queue: deque[tuple[ModulePath, str]] = deque()
+
+    def shake(self) -> dict[ModulePath, list[str]]:
+        """Удаление неиспользуемых объектов. Возвращает удалённые из экспорта имена по модулям"""
+        # Модули упорядочены по зависимостям, поэтому импортируемые модули разбираются раньше импортирующих
+        for module_path in self.modules:
+            self.collect_statements(module_path)
+
+        for module_path in self.modules:
+            is_entry = module_path in self.entry_module_paths
+            for statement in self.statements[module_path]:
+                if is_entry or not statement.is_removable:
+                    self.mark_statement_live(module_path, statement)
+            if is_entry:
+                for name in self.get_export_ids(module_path):
+                    self.queue.append((module_path, name))
+
+        self.process_queue()
+        while self.keep_effectful_imports():
+            self.process_queue()
+
+        removed_exports = {}
+        for module_path in self.modules:
+            if module_path not in self.entry_module_paths:
+                removed_names = self.remove_unused(module_path)
+                if removed_names:
+                    removed_exports[module_path] = removed_names
+        return removed_exports
+
+    def process_queue(self):
+        while self.queue:
+            module_path, name = self.queue.popleft()
+            self.mark_name_live(module_path, name)
+
+    def keep_effectful_imports(self) -> bool:
+        """
+        Импорт, сохранённый только ради побочных эффектов модуля, удаляется, если модуль импортируется другой
+        инструкцией, а иначе должен импортировать хотя бы одно имя: оставляется первое из них.
+        Возвращает признак того, что появились новые используемые имена.
+        """
+        for module_path in self.modules:
+            live_names = self.live_names[module_path]
+            unused_imports = []
+            imported_modules = set()
+            for statement in self.statements[module_path]:
+                if not statement.is_live or statement.imported_module is None:
+                    continue
+                if statement.imported_objects and not live_names.intersection(statement.imported_objects):
+                    unused_imports.append(statement)
+                else:
+                    imported_modules.add(statement.imported_module)
+
+            for statement in unused_imports:
+                if statement.imported_module in imported_modules:
+                    statement.is_live = False
+                    continue
+                imported_modules.add(statement.imported_module)
+                self.queue.append((module_path, next(iter(statement.imported_objects))))
+        return bool(self.queue)
+
+    def collect_statements(self, module_path: ModulePath):
+        statements = []
+        declarations = {}
+        for node in self.js_trees[module_path].body:
+            statement = self.get_statement_info(node)
+            statements.append(statement)
+            for name in statement.declared_names:
+                declarations.setdefault(name, []).append(statement)
+            if not statement.is_removable:
+                self.effectful_modules.add(module_path)
+        self.statements[module_path] = statements
+        self.declarations[module_path] = declarations
+        self.live_names[module_path] = set()
+
+    def get_statement_info(self, node: js_ast.JSStatement) -> StatementInfo:
+        statement = StatementInfo(node)
+        if isinstance(node, (js_ast.JSFunctionDef, js_ast.JSClassDef)):
+            statement.declared_names.append(node.name)
+            statement.is_removable = True
+        elif isinstance(node, js_ast.JSLet) and isinstance(node.assign.target, js_ast.JSName):
+            statement.declared_names.append(node.assign.target.id)
+            statement.is_removable = is_pure_expression(node.assign.value)
+        elif isinstance(node, js_ast.JSImport):
+            self.add_import_info(statement, node)
+        return statement
+
+    def add_import_info(self, statement: StatementInfo, node: js_ast.JSImport):
+        module_path = find_module_path(node.module, self.js_trees)
+        if module_path is None:
+            # Модуль вне проекта: импорт сохраняется как есть
+            return
+
+        # Импорт модуля с побочными эффектами сохраняется, чтобы они выполнялись как в Python
+        statement.imported_module = module_path
+        statement.is_removable = module_path not in self.effectful_modules
+        if node.names:
+            for alias in node.names:
+                statement.declared_names.append(alias.asname or alias.name)
+                statement.imported_objects[alias.asname or alias.name] = (module_path, alias.name)
+        else:
+            name = node.alias or node.module
+            statement.declared_names.append(name)
+            statement.namespaces[name] = module_path
+
+    def get_export_ids(self, module_path: ModulePath) -> list[str]:
+        export = self.js_trees[module_path].export
+        return export.ids if export else []
+
+    def find_namespace(self, module_path: ModulePath, name: str) -> ModulePath | None:
+        for statement in self.declarations[module_path].get(name, []):
+            if name in statement.namespaces:
+                return statement.namespaces[name]
+        return None
+
+    def mark_name_live(self, module_path: ModulePath, name: str):
+        live_names = self.live_names[module_path]
+        if name in live_names:
+            return
+        live_names.add(name)
+        for statement in self.declarations[module_path].get(name, []):
+            self.mark_statement_live(module_path, statement)
+            if name in statement.imported_objects:
+                self.queue.append(statement.imported_objects[name])
+
+    def mark_statement_live(self, module_path: ModulePath, statement: StatementInfo):
+        if statement.is_live:
+            return
+        statement.is_live = True
+
+        for name in statement.names:
+            self.queue.append((module_path, name))
+            namespace = self.find_namespace(module_path, name)
+            if namespace is not None:
+                # Модуль используется целиком, например передаётся как значение
+                self.queue.extend((namespace, export_id) for export_id in self.get_export_ids(namespace))
+        for name, attr in statement.attributes:
+            self.queue.append((module_path, name))
+            namespace = self.find_namespace(module_path, name)
+            if namespace is not None:
+                self.queue.append((namespace, attr))
+
+    def remove_unused(self, module_path: ModulePath) -> list[str]:
+        js_tree = self.js_trees[module_path]
+        live_names = self.live_names[module_path]
+        body = []
+        for statement in self.statements[module_path]:
+            if not statement.is_live:
+                continue
+            if statement.imported_objects:
+                # Из импорта удаляются неиспользуемые имена
+                statement.node.names = [alias for alias in statement.node.names
+                                        if (alias.asname or alias.name) in live_names]
+            body.append(statement.node)
+        js_tree.body[:] = body
+
+        removed_names = [name for name in self.declarations[module_path] if name not in live_names]
+        if js_tree.export and removed_names:
+            js_tree.export.ids = [name for name in js_tree.export.ids if name not in removed_names]
+        return removed_names
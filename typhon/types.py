@@ -5,30 +5,47 @@ class ModulePath:
     """Класс `ModulePath` представляет путь к модулю:
     - Хранит путь в виде кортежа
     - Предоставляет свойства для имени, пакета и компонентов пакета
+
+    Экземпляры неизменяемы и интернированы: для одного пути всегда возвращается один и тот же объект,
+    поэтому пути можно использовать как ключи словарей и элементы множеств.
     """
-    def __init__(self, *items):
-        self.module_path = tuple(items)
+    __slots__ = ('module_path', 'name', 'package', 'packages', 'full_path', '_hash')
+
+    _instances: dict[tuple, 'ModulePath'] = {}
 
-    @property
-    def name(self):
-        return self.module_path[-1]
+    def __new__(cls, *items):
+        module_path = tuple(items)
+        instance = cls._instances.get(module_path)
+        if instance is not None:
+            return instance
 
-    @property
-    def package(self):
-        return '.'.join(self.packages)
+        instance = super().__new__(cls)
+        packages = module_path[:-1]
+        object.__setattr__(instance, 'module_path', module_path)
+        object.__setattr__(instance, 'name', module_path[-1])
+        object.__setattr__(instance, 'packages', packages)
+        object.__setattr__(instance, 'package', '.'.join(packages))
+        object.__setattr__(instance, 'full_path', '.'.join(module_path))
+        object.__setattr__(instance, '_hash', hash(module_path))
+        return cls._instances.setdefault(module_path, instance)
 
-    @property
-    def packages(self):
-        if len(self.module_path) == 1:
-            return []
-        return self.module_path[:-1]
+    def __setattr__(self, key, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
 
-    @property
-    def full_path(self):
-        return '.'.join(self.module_path)
+    def __delattr__(self, key):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
 
     def __eq__(self, other):
-        return isinstance(other, ModulePath) and self.module_path == other.module_path
+        return self is other or (isinstance(other, ModulePath) and self.module_path == other.module_path)
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({", ".join(map(repr, self.module_path))})'
+
+    def __reduce__(self):
+        return self.__class__, self.module_path
 
     def __add__(self, other: list) -> 'ModulePath':
         if not isinstance(other, list):
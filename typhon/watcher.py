@@ -0,0 +1,78 @@
+import os
+import time
+from typing import Callable, Optional
+
+from typhon.module import Module
+from typhon.project import Project
+from typhon.types import ModulePath
+
+
+class Watcher:
+    """Класс `Watcher` отслеживает изменения исходных файлов проекта:
+        - Первичная транспиляция главного модуля
+        - Опрос времени изменения файлов всех модулей графа импортов
+        - Повторная транспиляция только изменившихся модулей и модулей, которые их импортируют
+
+    Если пересборка завершилась ошибкой, изменившиеся модули остаются в `pending_module_paths`
+    и пересобираются вместе со следующими изменениями.
+    """
+    def __init__(self, project: Project, source_file_path: str, interval: float = 0.5,
+                 on_rebuild: Callable[[list[ModulePath]], None] = None):
+        self.project = project
+        self.source_file_path = source_file_path
+        self.interval = interval
+        self.on_rebuild = on_rebuild
+        self.mtimes: dict[ModulePath, Optional[int]] = {}
+        self.pending_module_paths: list[ModulePath] = []
+
+    def start(self):
+        self.project.transpile_file(self.source_file_path)
+        self.update_mtimes()
+        while True:
+            time.sleep(self.interval)
+            self.check()
+
+    def check(self) -> list[ModulePath]:
+        """Проверка изменений и пересборка затронутых модулей"""
+        changed_module_paths = self.get_changed_modules()
+        if not changed_module_paths:
+            return []
+
+        changed_module_paths = self.pending_module_paths + [
+            module_path for module_path in changed_module_paths if module_path not in self.pending_module_paths
+        ]
+        try:
+            rebuilt_modules = self.project.rebuild_modules(changed_module_paths)
+            self.pending_module_paths = []
+        except Exception as e:
+            print(f'Ошибка транспиляции: {e}')
+            rebuilt_modules = []
+            self.pending_module_paths = changed_module_paths
+        finally:
+            self.update_mtimes()
+
+        if self.on_rebuild:
+            self.on_rebuild(rebuilt_modules)
+        return rebuilt_modules
+
+    def get_changed_modules(self) -> list[ModulePath]:
+        changed_module_paths = []
+        for module_path in self.project.modules:
+            if self.get_mtime(module_path) != self.mtimes.get(module_path):
+                changed_module_paths.append(module_path)
+        return changed_module_paths
+
+    def update_mtimes(self):
+        self.mtimes = {module_path: self.get_mtime(module_path) for module_path in self.project.modules}
+
+    def get_module(self, module_path: ModulePath) -> Module:
+        main_module = self.project.main_module
+        if main_module and module_path == main_module.module_path:
+            return main_module
+        return self.project.create_module(module_path)
+
+    def get_mtime(self, module_path: ModulePath) -> Optional[int]:
+        try:
+            return os.stat(self.get_module(module_path).source_file_name).st_mtime_ns
+        except FileNotFoundError:
+            return None